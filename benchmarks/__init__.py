@@ -0,0 +1 @@
+"""Self-benchmarks of the ocp_qp_benchmark harness."""
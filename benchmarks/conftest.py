@@ -0,0 +1,124 @@
+"""Synthetic problem collections and results for the harness self-benchmarks.
+
+Run with pytest-benchmark, e.g.
+
+    pytest benchmarks --bench-sizes 1000,100000 --benchmark-json results/harness_benchmark.json
+
+and compare reports across commits with `--benchmark-autosave` and
+`--benchmark-compare`.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.test_set import TestSet
+
+DEFAULT_SIZES = "1000,10000"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma-separated numbers of synthetic problems (default: {DEFAULT_SIZES})",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("bench_sizes").split(",")]
+        metafunc.parametrize("size", sizes, scope="session")
+
+
+def write_synthetic_collection(root: str, size: int, seed: int = 0) -> list[str]:
+    """Write problem folders containing only meta data and a placeholder QP.
+
+    Args:
+        root: Directory to write the problem folders to.
+        size: Number of problems.
+        seed: Seed of the random problem sizes.
+
+    Returns:
+        List of problem folder paths.
+    """
+    rng = np.random.default_rng(seed)
+    horizons = rng.integers(5, 100, size=size)
+    paths = []
+    for k in range(size):
+        name = f"synthetic_{k}"
+        folder = os.path.join(root, name)
+        os.makedirs(folder, exist_ok=True)
+        N = int(horizons[k])
+        meta_data = {
+            "name": f"{name}.json",
+            "N": N,
+            "has_masks": bool(k % 10 == 0),
+            "has_idxs_rev_not_idxs": False,
+            "n_variables": 12 * (N + 1),
+            "kkt_nnz": 150 * (N + 1),
+        }
+        with open(os.path.join(folder, f"{name}_meta.json"), "w") as f:
+            json.dump(meta_data, f)
+        with open(os.path.join(folder, f"{name}.json"), "w") as f:
+            json.dump({"N": N}, f)
+        paths.append(folder)
+    return paths
+
+
+def synthetic_results(size: int, nb_solvers: int = 4, seed: int = 0) -> pandas.DataFrame:
+    """Results table of `size` problems solved by `nb_solvers` solvers."""
+    rng = np.random.default_rng(seed)
+    nb_rows = size * nb_solvers
+    return pandas.DataFrame(
+        {
+            "problem": np.tile([f"synthetic_{k}" for k in range(size)], nb_solvers),
+            "solver": np.repeat(
+                [f"PARTIAL_CONDENSING_HPIPM_iter_max={100 * (j + 1)}" for j in range(nb_solvers)],
+                size,
+            ),
+            "cost": rng.normal(size=nb_rows),
+            "solution_error": rng.lognormal(-14, 2, size=nb_rows),
+            "iterations": rng.integers(1, 50, size=nb_rows),
+            "runtime_external": rng.lognormal(-8, 1, size=nb_rows),
+            "runtime_internal": rng.lognormal(-8, 1, size=nb_rows),
+            "runtime_fair": rng.lognormal(-8, 1, size=nb_rows),
+            "runtime_setup": rng.lognormal(-6, 1, size=nb_rows),
+            "runtime_first_solve": rng.lognormal(-8, 1, size=nb_rows),
+            "runtime_teardown": rng.lognormal(-10, 1, size=nb_rows),
+            "n_samples": rng.integers(5, 100, size=nb_rows),
+            "rel_ci": rng.uniform(0.005, 0.02, size=nb_rows),
+            "runtime_warm_fair": rng.lognormal(-8, 1, size=nb_rows),
+            "runtime_cold_fair": rng.lognormal(-7.5, 1, size=nb_rows),
+            "perf_cycles": rng.lognormal(12, 1, size=nb_rows),
+            "perf_instructions": rng.lognormal(12.5, 1, size=nb_rows),
+            "perf_cache_misses": rng.lognormal(6, 1, size=nb_rows),
+            "perf_branch_misses": rng.lognormal(5, 1, size=nb_rows),
+            "ipc": rng.uniform(0.5, 3.0, size=nb_rows),
+            "cache_misses_per_iter": rng.lognormal(3, 1, size=nb_rows),
+            "branch_misses_per_iter": rng.lognormal(2, 1, size=nb_rows),
+            "status": rng.choice([0, 0, 0, 2], size=nb_rows),
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def collection(tmp_path_factory, size):
+    """Paths of a synthetic collection of `size` problems."""
+    root = tmp_path_factory.mktemp(f"collection_{size}")
+    return write_synthetic_collection(str(root), size)
+
+
+@pytest.fixture(scope="session")
+def test_set(collection):
+    """Test set of a synthetic collection."""
+    return TestSet(qp_folder_paths=collection, verbose=False)
+
+
+@pytest.fixture(scope="session")
+def results_df(size):
+    """Synthetic results table."""
+    return synthetic_results(size)
@@ -0,0 +1,154 @@
+"""Throughput of the harness on synthetic collections, with a stub solver.
+
+Each benchmark records the number of items it processes in `extra_info`,
+such that items per second can be derived from the JSON report.
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest
+
+from ocp_qp_benchmark.core import runner
+from ocp_qp_benchmark.core.external_solvers import ExternalSolverOptions
+from ocp_qp_benchmark.core.results import Results
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.core.test_set import TestSet
+from ocp_qp_benchmark.visualization.plotting import plot_metric
+
+# Results.update is linear in the number of rows, upserts and full runs are
+# only benchmarked up to this size
+MAX_UPSERT_SIZE = 10_000
+NB_UPSERTS = 100
+
+STUB_CONTEXT = {
+    "status": 0,
+    "iterations": 10,
+    "runtime_external": 1e-4,
+    "runtime_internal": 1e-4,
+    "runtime_fair": 1e-4,
+    "runtime_setup": 1e-3,
+    "runtime_first_solve": 1e-4,
+    "runtime_teardown": 1e-5,
+    "n_samples": 1,
+    "cost": 0.0,
+}
+
+
+def _stub_solve_job(
+    opts,
+    qp_data_path,
+    print_level=0,
+    collect_trace=False,
+    profiler=None,
+    sampling=None,
+    cache_timing=None,
+    count_events=False,
+):
+    """Solver returning a fixed result, such that only harness costs remain."""
+    return dict(STUB_CONTEXT)
+
+
+def test_test_set_iteration(benchmark, test_set, size):
+    benchmark.extra_info["items"] = size
+    nb_problems = benchmark(lambda: sum(1 for _ in test_set))
+    assert nb_problems == size
+
+
+def test_test_set_filter(benchmark, collection, size):
+    benchmark.extra_info["items"] = size
+
+    def setup():
+        return (TestSet(qp_folder_paths=list(collection), verbose=False),), {}
+
+    def filter_problems(test_set):
+        test_set.filter_problems({"has_masks": False})
+
+    benchmark.pedantic(filter_problems, setup=setup, rounds=3)
+
+
+def test_results_load(benchmark, test_set, size):
+    benchmark.extra_info["items"] = size
+    results = benchmark.pedantic(Results, args=(None, test_set), rounds=3)
+    assert len(results.df) == 0
+
+
+def test_results_upsert(benchmark, test_set, results_df, size):
+    if size > MAX_UPSERT_SIZE:
+        pytest.skip(f"upserts are only benchmarked up to {MAX_UPSERT_SIZE} problems")
+    benchmark.extra_info["items"] = NB_UPSERTS
+    results = Results(None, test_set)
+    results.df = results_df.copy()
+    meta_paths = [path_dict["meta_data_path"] for path_dict in test_set][:NB_UPSERTS]
+    solver_id = results_df["solver"].iloc[0]
+
+    def upsert():
+        for meta_path in meta_paths:
+            results.update(meta_path, solver_id, STUB_CONTEXT)
+
+    benchmark.pedantic(upsert, rounds=3)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_results_write_read(benchmark, tmp_path, results_df, suffix):
+    benchmark.extra_info["items"] = len(results_df)
+    path = tmp_path / f"results{suffix}"
+
+    def write_read():
+        if suffix == ".csv":
+            results_df.to_csv(path, index=False)
+        else:
+            results_df.to_parquet(path, index=False)
+        return Results.read_from_file(path)
+
+    df = benchmark.pedantic(write_read, rounds=3)
+    assert len(df) == len(results_df)
+
+
+def test_solver_id_creation(benchmark, size):
+    nb_options = min(size, 10_000)
+    benchmark.extra_info["items"] = nb_options
+    options = [
+        ExternalSolverOptions("EXTERNAL_OSQP", {"max_iter": k, "eps_abs": 1e-6})
+        for k in range(nb_options)
+    ]
+    # Solver ID creation does not depend on the configurations of the set
+    solver_set = object.__new__(SolverSet)
+    solver_ids = benchmark(lambda: [solver_set._create_solver_id(opts) for opts in options])
+    assert len(set(solver_ids)) == nb_options
+
+
+def test_plot_metric(benchmark, tmp_path, test_set, results_df, size):
+    benchmark.extra_info["items"] = len(results_df)
+    savefig = str(tmp_path / "runtime.png")
+    benchmark.pedantic(
+        plot_metric,
+        kwargs={
+            "metric": "runtime_fair",
+            "df": results_df,
+            "test_set": test_set,
+            "savefig": savefig,
+            "latexify": False,
+        },
+        rounds=1,
+    )
+
+
+def test_run_stub_solver(benchmark, monkeypatch, test_set, size):
+    if size > MAX_UPSERT_SIZE:
+        pytest.skip(f"full runs are only benchmarked up to {MAX_UPSERT_SIZE} problems")
+    benchmark.extra_info["items"] = size
+    monkeypatch.setattr(runner, "solve_job", _stub_solve_job)
+    solver_set = object.__new__(SolverSet)
+    solver_set.solvers = [ExternalSolverOptions("EXTERNAL_OSQP", {})]
+    solver_set.solver_ids = ["EXTERNAL_OSQP"]
+
+    def run_all():
+        results = Results(None, test_set)
+        results.write = lambda path=None: None
+        runner.run(test_set, solver_set, results, print_level=0)
+        return results
+
+    results = benchmark.pedantic(run_all, rounds=1)
+    assert len(results.df) == size
@@ -0,0 +1,47 @@
+"""CLI for adding structural statistics to existing problem meta data."""
+
+import argparse
+
+from ocp_qp_benchmark.dataset import BenchSetManager
+
+
+def main():
+    """
+    Main entry point for backfilling meta data.
+
+    typically, the user will run this script as follows:
+    backfill-meta --names random_qp my_problems
+
+    For each problem of the given problem sets, the structural statistics
+    (per-stage dims, sizes, KKT nonzeros, conditioning estimates) are
+    computed and written into {problem_name}_meta.json.
+
+    Args:
+        collection: Path to the dataset collection (default: ocp_qp_dataset_collection).
+        names: Names of the problem sets to update (default: all).
+    """
+    parser = argparse.ArgumentParser(
+        description="Add structural statistics to problem meta data"
+    )
+    parser.add_argument(
+        "--collection",
+        "-c",
+        default="ocp_qp_dataset_collection",
+        help="Path to the dataset collection (default: ocp_qp_dataset_collection)",
+    )
+    parser.add_argument(
+        "--names",
+        "-n",
+        nargs="*",
+        default=None,
+        help="Names of the problem sets to update (default: all)",
+    )
+
+    args = parser.parse_args()
+
+    manager = BenchSetManager(args.collection)
+    manager.backfill_meta_data(args.names)
+
+
+if __name__ == "__main__":
+    main()
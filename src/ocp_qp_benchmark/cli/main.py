@@ -1,19 +1,32 @@
-"""Main entry point for the OCP QP benchmark."""
+"""Main entry point for the OCP QP benchmark.
+
+Heavy dependencies (acados_template, pandas, matplotlib, tqdm) are only
+imported by the subcommand that needs them, so that `ocp-benchmark --help`
+and light subcommands start fast.
+"""
 
 import argparse
 import os
+import sys
+from typing import Optional
+
+RESULT_PATH = "results/qpbenchmark_results.csv"
+HISTORY_PATH = "results/history.sqlite"
 
-from acados_template import AcadosOcpQpOptions
 
-from ocp_qp_benchmark.core import TestSet, SolverSet, Results, run
-from ocp_qp_benchmark.core.supported_solvers import (
-    ACADOS_OCP_QP_SOLVERS,
-    ACADOS_CASADI_SOLVERS,
-    EXTERNAL_SOLVERS,
-)
-from ocp_qp_benchmark.visualization import plot_metric
+def results_sidecar_path(results_path: str, suffix: str) -> str:
+    """File stored next to the results, e.g. results.csv -> results_solvers.json.
+
+    Args:
+        results_path: Path to the results file or dataset directory.
+        suffix: Suffix and extension of the sidecar file, e.g. "solvers.json".
+
+    Returns:
+        Path of the sidecar file.
+    """
+    stem, _ = os.path.splitext(os.path.normpath(results_path))
+    return f"{stem}_{suffix}"
 
-RESULT_PATH = "results/qpbenchmark_results.csv"
 
 def get_all_problems() -> list[str]:
     """Get all problems from the dataset collection.
@@ -43,18 +56,35 @@ def get_all_problems() -> list[str]:
             )
     return designated_problems
 
-def main():
-    """
-    OCP QP Benchmark main file
-    Also a example for setting up benchmark
+def create_test_set(folder_path: Optional[str] = None):
+    """Create the test set of problems without masks and idxs_rev.
 
-    Users can run this script with default solver setting as follows:
-    ocp-benchmark -f ocp_qp_dataset_collection/random_qp -s PARTIAL_CONDENSING_OSQP,PARTIAL_CONDENSING_HPIPM
+    Args:
+        folder_path: Folder of problem folders (default: None, which will use
+            all problems in ocp_qp_dataset_collection).
+
+    Returns:
+        Filtered test set.
     """
+    from ocp_qp_benchmark.core import TestSet
 
-    parser = argparse.ArgumentParser(
-        description="run OCP QP benchmark"
+    # get problems and create test set
+    example_qp_folders = get_all_problems() if folder_path is None else [os.path.join(folder_path, f) for f in os.listdir(folder_path)]
+    test_set = TestSet(qp_folder_paths=example_qp_folders)
+    # filter problems
+    test_set.filter_problems(
+        {
+            "has_masks": False, 
+            "has_idxs_rev_not_idxs": False
+        }
     )
+    # define description for test set
+    test_set.description = "Problems without masks and idxs_rev"
+    return test_set
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the run subcommand to a parser."""
     parser.add_argument(
         "--folder_path",
         "-f", 
@@ -68,21 +98,201 @@ def main():
         help="Name of the OCP QP solvers with default setting (default: None, which will use all AcadosOcpQpsolver with default setting)",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--results",
+        "-r",
+        default=RESULT_PATH,
+        help=f"Path to the results file (.csv or .parquet), or to a directory for a partitioned Parquet dataset (default: {RESULT_PATH})",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Path to a result cache database, jobs with a valid cached result are skipped (default: None, no cache)",
+    )
 
-    ## Create test_set ##
-    # get problems and create test set
-    example_qp_folders = get_all_problems() if args.folder_path is None else [os.path.join(args.folder_path, f) for f in os.listdir(args.folder_path)]
-    test_set = TestSet(qp_folder_paths=example_qp_folders)
-    # filter problems
-    test_set.filter_problems(
-        {
-            "has_masks": False, 
-            "has_idxs_rev_not_idxs": False
-        }
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Collect per-iteration residuals of acados solvers into a sidecar file next to the results",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes solving jobs in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["longest_first"],
+        default=None,
+        help="Job order, longest_first dispatches jobs by decreasing predicted solve time (default: solver by solver)",
+    )
+
+    parser.add_argument(
+        "--quick",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Only run K representative problems, stratified by family, size and difficulty, and chosen to reproduce the solver rankings of previous results in the results file (default: None, all problems)",
     )
-    # define description for test set
-    test_set.description = "Problems without masks and idxs_rev"
+
+    parser.add_argument(
+        "--builds",
+        default=None,
+        help="A/B mode: comma-separated NAME=PATH acados builds, each job is solved on every build in isolated worker processes (default: None)",
+    )
+    parser.add_argument(
+        "--threads",
+        default=None,
+        help="Thread scaling mode: comma-separated thread counts, each job is solved with OpenMP/BLAS limited to each count in isolated worker processes (default: None)",
+    )
+    parser.add_argument(
+        "--tolerances",
+        nargs="?",
+        const="1e-2,1e-4,1e-6,1e-8",
+        default=None,
+        metavar="LADDER",
+        help="Tolerance sweep mode: run each solver with all termination tolerances set to each value of a comma-separated ladder, and report runtime vs accuracy against the reference solutions (default: None, ladder if set without value: 1e-2,1e-4,1e-6,1e-8)",
+    )
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=None,
+        help="Repeat each solve until the relative width of the 95%% confidence interval of its mean solve time is below this target, e.g. 0.02 (default: None, single solve)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=1.0,
+        help="Maximum time spent repeating solves per job with --target-ci, in seconds (default: 1.0)",
+    )
+    parser.add_argument(
+        "--cold-cache",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Also time N solves per job with CPU caches evicted before each solve and N with warm caches, and report the cold/warm ratio per solver (default: None)",
+    )
+    parser.add_argument(
+        "--perf-counters",
+        action="store_true",
+        help="Count cycles, instructions, cache misses and branch misses of each acados solve with Linux perf_event, and store them with IPC and misses per iteration (NaN where counters are unavailable)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=None,
+        help="Path to a JSON-lines file to stream progress, throughput, failures and ETA to (default: None)",
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=None,
+        help="Serve the live run status as JSON on this localhost port (default: None)",
+    )
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const=HISTORY_PATH,
+        default=None,
+        help=f"Store the results of the run in a history database, see the history subcommand (default: None, path if set without value: {HISTORY_PATH})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print and save the wall time spent per phase of the run (loading, setup, solving, bookkeeping) next to the results file as <stem>_profile.csv",
+    )
+    parser.add_argument(
+        "--setup-cost",
+        action="store_true",
+        help="Plot the setup cost of each solver and print the break-even number of solves between solvers, best combined with --target-ci to separate the first solve from later ones",
+    )
+    parser.add_argument(
+        "--cprofile",
+        default=None,
+        help="Path to dump cProfile statistics of the run to, only covers the main process (default: None)",
+    )
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    """
+    OCP QP Benchmark main file
+    Also a example for setting up benchmark
+
+    Users can run this script with default solver setting as follows:
+    ocp-benchmark run -f ocp_qp_dataset_collection/random_qp -s PARTIAL_CONDENSING_OSQP,PARTIAL_CONDENSING_HPIPM
+    """
+    import cProfile
+
+    from ocp_qp_benchmark.core import (
+        SolverSet,
+        Results,
+        ResultCache,
+        PhaseProfiler,
+        RunTelemetry,
+        SamplingOptions,
+        TraceStore,
+        run,
+        trace_path_for_results,
+    )
+    from ocp_qp_benchmark.core.supported_solvers import (
+        ACADOS_OCP_QP_SOLVERS,
+        ACADOS_CASADI_SOLVERS,
+        EXTERNAL_SOLVERS,
+    )
+    from ocp_qp_benchmark.visualization import plot_metric
+
+    ## Create test_set ##
+    test_set = create_test_set(args.folder_path)
+    if args.quick is not None:
+        from ocp_qp_benchmark.core.results import is_dataset_path
+        from ocp_qp_benchmark.core.results_store import PartitionedResultsStore
+        from ocp_qp_benchmark.core.subset import ranking_agreement, split_latest_run
+        from ocp_qp_benchmark.utils.io import load_meta_data
+
+        history = None
+        held_out = None
+        if os.path.exists(args.results):
+            problems = [
+                load_meta_data(path)["name"].split(".")[0]
+                for path in test_set.qp_folder_paths
+            ]
+            if is_dataset_path(args.results):
+                # All runs, to select on earlier runs and score on the latest
+                history = PartitionedResultsStore(args.results).read(
+                    problems=problems, latest_only=False
+                )
+                history, held_out = split_latest_run(history)
+            else:
+                history = Results.read_from_file(args.results)
+                history = history[history["problem"].isin(problems)]
+        test_set = test_set.representative(args.quick, history, verbose=True)
+        subset = [
+            load_meta_data(path)["name"].split(".")[0]
+            for path in test_set.qp_folder_paths
+        ]
+        # The latest run only scores the subset if it covers more problems
+        if (
+            held_out is not None
+            and held_out["solver"].nunique() >= 2
+            and held_out["problem"].nunique() > len(subset)
+        ):
+            agreement = ranking_agreement(held_out, subset)
+            sample = "held out on the latest run"
+        elif history is not None and history["solver"].nunique() >= 2:
+            agreement = ranking_agreement(history, subset)
+            sample = "in-sample, on the results the subset was selected on"
+        else:
+            agreement = None
+            print("No previous results of several solvers, ranking agreement unknown")
+        if agreement is not None:
+            print(
+                f"Ranking agreement of the {len(subset)} problems with the full set "
+                f"({sample}): "
+                f"Kendall tau {agreement['kendall_tau']:.3f}, "
+                f"Spearman {agreement['spearman']:.3f}, "
+                f"same best solver: {agreement['same_best']}"
+            )
 
     ## Create solver set ##
     # sepcify sovlers and corresponding options to be evaluated
@@ -100,35 +310,212 @@ def main():
         designated_solver_list = []
         for solver_name in args.solvers.split(","):
             solver_name = solver_name.strip()
-            if solver_name in ACADOS_OCP_QP_SOLVERS:
+            if (
+                solver_name in ACADOS_OCP_QP_SOLVERS
+                or solver_name in ACADOS_CASADI_SOLVERS
+                or solver_name in EXTERNAL_SOLVERS
+            ):
                 designated_solver_list.append((solver_name, {}))
-            elif solver_name in ACADOS_CASADI_SOLVERS or solver_name in EXTERNAL_SOLVERS:
-                raise NotImplementedError(f"Casadi and external solvers not implemented yet, cannot add {solver_name}")
             else:
                 raise ValueError(f"Unknown solver name: {solver_name}")
     # Generate labels based on differing options
-    solver_set = SolverSet(solver_list = designated_solver_list)
+    if args.tolerances is not None:
+        from ocp_qp_benchmark.core.tolerance import tolerance_solver_set
+
+        if args.builds is not None or args.threads is not None:
+            raise ValueError("--tolerances cannot be combined with --builds or --threads")
+        tolerances = [float(tol) for tol in args.tolerances.split(",")]
+        solver_set = tolerance_solver_set(
+            [name for name, _ in designated_solver_list], tolerances
+        )
+    else:
+        solver_set = SolverSet(solver_list = designated_solver_list)
+
+    if args.builds is not None or args.threads is not None:
+        # Jobs are solved one by one in isolated worker processes
+        unsupported = {
+            "--cache": args.cache is not None,
+            "--workers": args.workers > 1,
+            "--schedule": args.schedule is not None,
+            "--trace": args.trace,
+            "--profile": args.profile,
+            "--telemetry": args.telemetry is not None,
+            "--status-port": args.status_port is not None,
+        }
+        for flag, is_set in unsupported.items():
+            if is_set:
+                raise ValueError(f"{flag} cannot be combined with --builds or --threads")
 
     ## Create Results logger ##
-    results = Results(file_path=RESULT_PATH, test_set=test_set)
+    results = Results(file_path=args.results, test_set=test_set)
+    solver_set.dump_configs_to_json(results_sidecar_path(args.results, "solvers.json"))
+    cache = ResultCache(args.cache) if args.cache is not None else None
+    traces = TraceStore(trace_path_for_results(args.results)) if args.trace else None
+    profiler = PhaseProfiler() if args.profile else None
+    sampling = None
+    if args.target_ci is not None:
+        sampling = SamplingOptions(target_rel_ci=args.target_ci, time_budget=args.time_budget)
+    cache_timing = None
+    if args.cold_cache is not None:
+        from ocp_qp_benchmark.core.cpu_cache import CacheTiming
+
+        if args.builds is not None or args.threads is not None:
+            raise ValueError("--cold-cache cannot be combined with --builds or --threads")
+        if args.workers > 1:
+            print("Warning: parallel workers share the last-level cache, cold timings are disturbed")
+        cache_timing = CacheTiming(nb_solves=args.cold_cache)
+    if args.perf_counters:
+        from ocp_qp_benchmark.core.perf_counters import process_counters
+
+        if args.builds is not None or args.threads is not None:
+            raise ValueError("--perf-counters cannot be combined with --builds or --threads")
+        if not process_counters().available:
+            print(
+                "Warning: hardware performance counters are unavailable "
+                f"({process_counters().error}), counts will be NaN"
+            )
+    telemetry = None
+    if args.telemetry is not None or args.status_port is not None:
+        telemetry = RunTelemetry(args.telemetry, port=args.status_port)
+        if telemetry.port is not None:
+            print(f"Serving run status on http://127.0.0.1:{telemetry.port}/")
 
     ## Run benchmark ##
-    run(
-        test_set,
-        solver_set,
-        results,
-        print_level=2,
-    )
+    cprofile = cProfile.Profile() if args.cprofile is not None else None
+    if cprofile is not None:
+        cprofile.enable()
+    plot_solver_ids = solver_set.solver_ids
+    if args.builds is not None and args.threads is not None:
+        raise ValueError("--builds and --threads cannot be combined")
+    if args.threads is not None:
+        from ocp_qp_benchmark.core.builds import build_solver_id
+        from ocp_qp_benchmark.core.threads import run_thread_scaling, threads_tag
+
+        thread_counts = [int(n) for n in args.threads.split(",")]
+        run_thread_scaling(
+            test_set, solver_set, results, thread_counts, print_level=2, sampling=sampling
+        )
+        plot_solver_ids = [
+            build_solver_id(solver_id, threads_tag(n))
+            for solver_id in solver_set.solver_ids
+            for n in thread_counts
+        ]
+    elif args.builds is not None:
+        from ocp_qp_benchmark.core.builds import build_solver_id, parse_builds, run_builds
+
+        builds = parse_builds(args.builds)
+        run_builds(test_set, solver_set, results, builds, print_level=2, sampling=sampling)
+        plot_solver_ids = [
+            build_solver_id(solver_id, name)
+            for solver_id in solver_set.solver_ids
+            for name in builds
+        ]
+    else:
+        run(
+            test_set,
+            solver_set,
+            results,
+            print_level=2,
+            cache=cache,
+            nb_workers=args.workers,
+            schedule=args.schedule,
+            traces=traces,
+            profiler=profiler,
+            telemetry=telemetry,
+            sampling=sampling,
+            cache_timing=cache_timing,
+            count_events=args.perf_counters,
+        )
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(args.cprofile)
+        print(f"Saved cProfile statistics to {args.cprofile}")
+    if cache is not None:
+        cache.close()
+    if telemetry is not None:
+        telemetry.close()
+    if profiler is not None:
+        profiler.print_summary()
+        profile_path = results_sidecar_path(args.results, "profile.csv")
+        os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+        profiler.summary().to_csv(profile_path, index=False)
+
+    if args.history is not None:
+        ingest_history(args.history, results.df, test_set)
 
     ## Plotting ##
     plot_metric(
         metric="runtime_fair",
         df=results.df,
-        solver_ids=solver_set.solver_ids,
+        solver_ids=plot_solver_ids,
         test_set=test_set,
         linewidth=2.0,
         savefig="figures/qpbenchmark_runtime_filtered.pdf",
     )
+    if args.setup_cost:
+        from ocp_qp_benchmark.visualization import plot_setup_cost
+
+        if sampling is None:
+            print(
+                "Warning: without --target-ci every job is solved once, "
+                "the first-solve latency is not separated from the per-solve cost"
+            )
+        break_even = plot_setup_cost(
+            df=results.df,
+            solver_ids=plot_solver_ids,
+            savefig="figures/qpbenchmark_setup_cost.pdf",
+        )
+        print("Break-even number of solves (row solver catches up with column solver):")
+        print(break_even.to_string())
+    if cache_timing is not None:
+        from ocp_qp_benchmark.core.results import cache_sensitivity_summary
+
+        print("Cold/warm cache fair runtime ratio per solver:")
+        print(cache_sensitivity_summary(results.df, plot_solver_ids).to_string())
+    if args.perf_counters:
+        solved = results.df[results.df["status"] == 0]
+        print("Median hardware event metrics per solver:")
+        print(
+            solved.groupby("solver", observed=True)[
+                ["ipc", "cache_misses_per_iter", "branch_misses_per_iter"]
+            ]
+            .median()
+            .to_string()
+        )
+    if args.tolerances is not None:
+        from ocp_qp_benchmark.core.tolerance import (
+            fastest_at_accuracy,
+            tolerance_ladder,
+            tolerance_sweep_summary,
+        )
+        from ocp_qp_benchmark.visualization import plot_tolerance_pareto
+
+        summary = tolerance_sweep_summary(results.df, tolerance_ladder(solver_set))
+        print("Runtime and 90% quantile of the solution error per tolerance:")
+        print(summary.drop(columns="solver_id").to_string(index=False))
+        print("Fastest solver reaching each target accuracy (runtime per solver):")
+        fastest = fastest_at_accuracy(summary, tolerances)
+        print(fastest.to_string())
+        if not fastest["resolved"].all():
+            print(
+                "Warning: reference solutions are not accurate enough to resolve targets "
+                f"{', '.join(f'{t:g}' for t in fastest.index[~fastest['resolved']])}"
+            )
+        plot_tolerance_pareto(summary, savefig="figures/qpbenchmark_tolerance_pareto.pdf")
+    if args.threads is not None:
+        from ocp_qp_benchmark.core.scheduler import problem_size
+        from ocp_qp_benchmark.core.threads import thread_scaling_summary
+        from ocp_qp_benchmark.utils.io import load_meta_data
+        from ocp_qp_benchmark.visualization import plot_thread_scaling
+
+        problem_sizes = {}
+        for qp_folder_path in test_set.qp_folder_paths:
+            meta_data = load_meta_data(qp_folder_path)
+            problem_sizes[meta_data["name"].split(".")[0]] = problem_size(meta_data)
+        plot_thread_scaling(
+            thread_scaling_summary(results.df, problem_sizes),
+            savefig="figures/qpbenchmark_thread_scaling.pdf",
+        )
 
     ## Evaluate ##
     # specify solvers to be evaluated
@@ -142,8 +529,20 @@ def main():
 
     # filter solver_ids based on specified eval_solver_name
     eval_solver_ids = solver_set.get_solver_ids_by_names(eval_solver_names)
+    if args.builds is not None:
+        eval_solver_ids = [
+            build_solver_id(solver_id, name)
+            for solver_id in eval_solver_ids
+            for name in builds
+        ]
+    elif args.threads is not None:
+        eval_solver_ids = [
+            build_solver_id(solver_id, threads_tag(n))
+            for solver_id in eval_solver_ids
+            for n in thread_counts
+        ]
 
-    results = Results(file_path=RESULT_PATH, test_set=test_set)
+    results = Results(file_path=args.results, test_set=test_set, solvers=eval_solver_ids)
     plot_metric(
         metric="runtime_fair",
         df=results.df,
@@ -153,5 +552,329 @@ def main():
         savefig="figures/qpbenchmark_runtime.pdf",
     )
 
+
+def plot_results(args: argparse.Namespace) -> None:
+    """Plot a metric of stored results, without running the benchmark."""
+    from ocp_qp_benchmark.core import Results
+    from ocp_qp_benchmark.visualization import plot_metric
+
+    test_set = create_test_set(args.folder_path)
+    solver_ids = args.solvers.split(",") if args.solvers is not None else None
+    results = Results(file_path=args.results, test_set=test_set, solvers=solver_ids)
+    plot_metric(
+        metric=args.metric,
+        df=results.df,
+        solver_ids=solver_ids,
+        test_set=test_set,
+        linewidth=2.0,
+        savefig=args.savefig,
+    )
+
+
+def compare_results_files(args: argparse.Namespace) -> None:
+    """Print a solver by solver comparison of two results files."""
+    from ocp_qp_benchmark.core.results import Results, compare_results
+
+    dfs = []
+    for path in (args.baseline, args.candidate):
+        df = Results.read_from_file(path)
+        if df is None:
+            raise FileNotFoundError(f"Results {path} not found")
+        dfs.append(df)
+    comparison = compare_results(dfs[0], dfs[1], metric=args.metric)
+    print(comparison.to_string(index=False))
+    if args.output is not None:
+        comparison.to_csv(args.output, index=False)
+        print(f"Saved comparison to {args.output}")
+
+
+def ingest_problems(args: argparse.Namespace) -> None:
+    """Add a folder of QP JSON files to the dataset collection."""
+    from pathlib import Path
+
+    from ocp_qp_benchmark.dataset.manager import BenchSetManager
+
+    manager = BenchSetManager()
+    manager.add_problems_from_json_folder(Path(args.folder_path), args.name)
+
+
+def ingest_history(
+    history_path: str, df, test_set, label: str = "", git_commit: Optional[str] = None
+) -> int:
+    """Store results in the history database with the current acados build.
+
+    Returns:
+        ID of the run in the history.
+    """
+    from ocp_qp_benchmark.core.history import HistoryStore, problem_families
+    from ocp_qp_benchmark.utils.hashing import acados_build_fingerprint, acados_commit
+
+    history = HistoryStore(history_path)
+    run_id = history.ingest(
+        df,
+        families=problem_families(test_set),
+        fingerprint=acados_build_fingerprint(),
+        git_commit=acados_commit() if git_commit is None else git_commit,
+        label=label,
+    )
+    history.close()
+    print(f"Stored run {run_id} in history {history_path}")
+    return run_id
+
+
+def history_command(args: argparse.Namespace) -> None:
+    """Ingest results into the history database or plot solver trends."""
+    if args.action == "ingest":
+        from ocp_qp_benchmark.core.results import Results
+
+        df = Results.read_from_file(args.results)
+        if df is None:
+            raise FileNotFoundError(f"Results {args.results} not found")
+        test_set = create_test_set(args.folder_path)
+        ingest_history(args.db, df, test_set, args.label, args.commit)
+        return
+
+    from ocp_qp_benchmark.core.history import HistoryStore
+    from ocp_qp_benchmark.visualization import plot_history
+
+    history = HistoryStore(args.db)
+    solver_ids = args.solvers.split(",") if args.solvers is not None else history.solvers()
+    trends = {}
+    for solver_id in solver_ids:
+        trend = history.trend(solver_id, family=args.family, metric=args.metric)
+        trends[solver_id] = trend
+        for _, run in trend[trend["change_point"]].iterrows():
+            previous = trend.loc[: run.name - 1, "value"].dropna().iloc[-1]
+            print(
+                f"{solver_id}: change at run {run['run_id']} ({run['label'] or run['git_commit'][:10]}), "
+                f"{args.metric} {previous:.3e} -> {run['value']:.3e} ({run['value'] / previous - 1:+.1%})"
+            )
+    history.close()
+    plot_history(trends, metric=args.metric, savefig=args.savefig)
+
+
+def recommend_solver(args: argparse.Namespace) -> None:
+    """Print the recommended solver configuration for a QP JSON file."""
+    from acados_template import AcadosOcpQp
+
+    from ocp_qp_benchmark.core.recommender import (
+        SolverRecommender,
+        collection_features,
+        cross_validate,
+        qp_features,
+    )
+    from ocp_qp_benchmark.core.results import Results
+    from ocp_qp_benchmark.utils.qp_data import load_qp_dict
+
+    df = Results.read_from_file(args.results)
+    if df is None:
+        raise FileNotFoundError(f"Results {args.results} not found")
+    features = collection_features(create_test_set(args.folder_path))
+    options = {"k": args.neighbors, "min_success": args.min_success, "metric": args.metric}
+    if args.cv > 1:
+        scores = cross_validate(features, df, nb_folds=args.cv, **options)
+        print(
+            f"{args.cv}-fold cross-validation on {scores['nb_problems']} problems: "
+            f"fastest solver picked on {scores['accuracy']:.1%}, "
+            f"failures {scores['failure_rate']:.1%}, "
+            f"slowdown over fastest {scores['regret']:.2f}x, "
+            f"speedup over single best solver {scores['speedup']:.2f}x"
+        )
+
+    recommender = SolverRecommender(**options).fit(features, df)
+    qp = AcadosOcpQp.from_json(args.qp)
+    qp_dict = load_qp_dict(args.qp)
+    problem_features = qp_features(qp, qp_dict)
+    recommendation = recommender.recommend(problem_features)
+    print(recommender.predict(problem_features).head(args.top).to_string())
+    print(
+        f"Recommended: {recommendation['solver']} "
+        f"(expected {args.metric} {recommendation['runtime']:.3e}s, "
+        f"{recommendation['speedup']:.2f}x speedup over {recommendation['baseline']}, "
+        f"solved {recommendation['success_rate']:.0%} of similar problems)"
+    )
+
+
+# Subcommands, arguments without one are passed to run
+COMMANDS = ("run", "plot", "compare", "ingest", "history", "recommend")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of all subcommands."""
+    parser = argparse.ArgumentParser(
+        description="run OCP QP benchmark"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark (default)")
+    add_run_arguments(run_parser)
+    run_parser.set_defaults(handler=run_benchmark)
+
+    plot_parser = subparsers.add_parser("plot", help="Plot stored results")
+    plot_parser.add_argument(
+        "--folder_path",
+        "-f",
+        default=None,
+        help="Path to folder containing JSON folders of QPs for the problems (default: all problems in ocp_qp_dataset_collection)",
+    )
+    plot_parser.add_argument(
+        "--results",
+        "-r",
+        default=RESULT_PATH,
+        help=f"Path to the results file or dataset (default: {RESULT_PATH})",
+    )
+    plot_parser.add_argument(
+        "--solvers",
+        "-s",
+        default=None,
+        help="Comma-separated solver IDs to plot (default: all)",
+    )
+    plot_parser.add_argument(
+        "--metric",
+        "-m",
+        default="runtime_fair",
+        help="Metric to plot (default: runtime_fair)",
+    )
+    plot_parser.add_argument(
+        "--savefig",
+        default=None,
+        help="Path to save the plot to (default: None, which shows the plot)",
+    )
+    plot_parser.set_defaults(handler=plot_results)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two results files solver by solver"
+    )
+    compare_parser.add_argument("baseline", help="Path to the baseline results")
+    compare_parser.add_argument("candidate", help="Path to the results to compare")
+    compare_parser.add_argument(
+        "--metric",
+        "-m",
+        default="runtime_fair",
+        help="Metric to compare (default: runtime_fair)",
+    )
+    compare_parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="Path to save the comparison as CSV (default: None)",
+    )
+    compare_parser.set_defaults(handler=compare_results_files)
+
+    ingest_parser = subparsers.add_parser(
+        "ingest", help="Add a folder of QP JSON files to the dataset collection"
+    )
+    ingest_parser.add_argument(
+        "folder_path", help="Path to folder containing JSON files"
+    )
+    ingest_parser.add_argument(
+        "--name",
+        "-n",
+        default="qps",
+        help="Name of the problem set to be added (default: qps)",
+    )
+    ingest_parser.set_defaults(handler=ingest_problems)
+
+    history_parser = subparsers.add_parser(
+        "history", help="Track results over runs, e.g. across acados releases"
+    )
+    history_actions = history_parser.add_subparsers(dest="action", required=True)
+    history_ingest_parser = history_actions.add_parser(
+        "ingest", help="Store a results file with the current acados build"
+    )
+    history_ingest_parser.add_argument(
+        "results", nargs="?", default=RESULT_PATH, help=f"Path to the results (default: {RESULT_PATH})"
+    )
+    history_ingest_parser.add_argument(
+        "--folder_path",
+        "-f",
+        default=None,
+        help="Path to folder containing JSON folders of QPs, to look up problem families (default: all problems in ocp_qp_dataset_collection)",
+    )
+    history_ingest_parser.add_argument(
+        "--label", default="", help="Label of the run, e.g. the acados release (default: none)"
+    )
+    history_ingest_parser.add_argument(
+        "--commit",
+        default=None,
+        help="Git commit of the acados build (default: detected from the acados library folder)",
+    )
+    history_trend_parser = history_actions.add_parser(
+        "trend", help="Plot solver trends and report change points"
+    )
+    history_trend_parser.add_argument(
+        "--solvers", "-s", default=None, help="Comma-separated solver IDs (default: all)"
+    )
+    history_trend_parser.add_argument(
+        "--family", default=None, help="Problem family (default: all families)"
+    )
+    history_trend_parser.add_argument(
+        "--metric", "-m", default="runtime_fair", help="Metric to track (default: runtime_fair)"
+    )
+    history_trend_parser.add_argument(
+        "--savefig", default=None, help="Path to save the plot to (default: None, which shows the plot)"
+    )
+    for action_parser in (history_ingest_parser, history_trend_parser):
+        action_parser.add_argument(
+            "--db", default=HISTORY_PATH, help=f"Path to the history database (default: {HISTORY_PATH})"
+        )
+    history_parser.set_defaults(handler=history_command)
+
+    recommend_parser = subparsers.add_parser(
+        "recommend", help="Recommend a solver configuration for a QP from stored results"
+    )
+    recommend_parser.add_argument("qp", help="Path to the QP JSON file")
+    recommend_parser.add_argument(
+        "--results",
+        "-r",
+        default=RESULT_PATH,
+        help=f"Path to the results to learn from (default: {RESULT_PATH})",
+    )
+    recommend_parser.add_argument(
+        "--folder_path",
+        "-f",
+        default=None,
+        help="Path to folder containing JSON folders of the QPs of the results (default: all problems in ocp_qp_dataset_collection)",
+    )
+    recommend_parser.add_argument(
+        "--metric", "-m", default="runtime_fair", help="Runtime metric to minimize (default: runtime_fair)"
+    )
+    recommend_parser.add_argument(
+        "--neighbors", "-k", type=int, default=5, help="Number of similar problems compared (default: 5)"
+    )
+    recommend_parser.add_argument(
+        "--min-success",
+        type=float,
+        default=0.9,
+        help="Minimum fraction of similar problems a recommended solver solved (default: 0.9)",
+    )
+    recommend_parser.add_argument(
+        "--cv",
+        type=int,
+        default=5,
+        help="Number of cross-validation folds on the collection, 0 to skip (default: 5)",
+    )
+    recommend_parser.add_argument(
+        "--top", type=int, default=5, help="Number of solvers to list (default: 5)"
+    )
+    recommend_parser.set_defaults(handler=recommend_solver)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Dispatch to the subcommands run, plot, compare, ingest, history and
+    recommend.
+
+    Without subcommand, the arguments are passed to run, such that
+    `ocp-benchmark -f ... -s ...` keeps working.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) == 0 or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run", *argv]
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
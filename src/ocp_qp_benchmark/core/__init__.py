@@ -1,13 +1,65 @@
-"""Core benchmark components."""
-
-from .runner import run, solve_problem
-from .results import Results
-from .test_set import TestSet
-from .solver_set import (
-    SolverSet,
-)
-from .supported_solvers import (
-    ACADOS_OCP_QP_SOLVERS,
-    ACADOS_CASADI_SOLVERS,
-    EXTERNAL_SOLVERS
-)
+"""Core benchmark components.
+
+Components are imported on first access, such that importing a light
+submodule (e.g. results) does not import acados_template and the solvers.
+"""
+
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "run": "runner",
+    "solve_problem": "runner",
+    "run_closed_loop": "closed_loop",
+    "latency_statistics": "closed_loop",
+    "tune_solver_options": "tuner",
+    "successive_halving": "tuner",
+    "run_throughput": "throughput",
+    "run_builds": "builds",
+    "run_thread_scaling": "threads",
+    "thread_scaling_summary": "threads",
+    "run_tolerance_sweep": "tolerance",
+    "tolerance_sweep_summary": "tolerance",
+    "fastest_at_accuracy": "tolerance",
+    "IsolatedWorker": "isolation",
+    "Results": "results",
+    "compare_results": "results",
+    "setup_cost_summary": "results",
+    "break_even_solves": "results",
+    "cache_sensitivity_summary": "results",
+    "PartitionedResultsStore": "results_store",
+    "ranking_agreement": "subset",
+    "SolverRecommender": "recommender",
+    "HistoryStore": "history",
+    "detect_change_points": "history",
+    "TraceStore": "traces",
+    "trace_path_for_results": "traces",
+    "PhaseProfiler": "profiler",
+    "SamplingOptions": "sampling",
+    "CacheTiming": "cpu_cache",
+    "RunTelemetry": "telemetry",
+    "ResultCache": "cache",
+    "TestSet": "test_set",
+    "SolverSet": "solver_set",
+    "CasadiSolverOptions": "casadi_solvers",
+    "ExternalSolver": "external_solvers",
+    "ExternalSolverOptions": "external_solvers",
+    "register_external_solver": "external_solvers",
+    "ACADOS_OCP_QP_SOLVERS": "supported_solvers",
+    "ACADOS_CASADI_SOLVERS": "supported_solvers",
+    "EXTERNAL_SOLVERS": "supported_solvers",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
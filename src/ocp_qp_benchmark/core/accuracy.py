@@ -0,0 +1,79 @@
+"""Accuracy of solutions measured against the reference solutions."""
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+# Accuracy of the reference solutions, computed with the default tolerances
+# of PARTIAL_CONDENSING_HPIPM. Smaller solution errors are not resolved.
+REFERENCE_ACCURACY = 1e-6
+
+
+def reference_solution_path(qp_data_path: str) -> str:
+    """Path of the reference solution next to a QP JSON file.
+
+    E.g. "random_qp/qp_1/qp_1_ref_sol.json" for "random_qp/qp_1/qp_1.json".
+    """
+    return f"{os.path.splitext(qp_data_path)[0]}_ref_sol.json"
+
+
+def load_reference_solution(qp_data_path: str) -> Optional[dict]:
+    """Load the reference solution of a QP.
+
+    Reference solutions are written when problems are added to the
+    collection, see `BenchSetManager.generate_reference_solution`.
+
+    Args:
+        qp_data_path: Path to the QP JSON file.
+
+    Returns:
+        Dictionary with the lists "x_traj" and "u_traj" of per-stage arrays,
+        or None if the problem has no readable reference solution.
+    """
+    try:
+        with open(reference_solution_path(qp_data_path), "r") as f:
+            iterate = json.load(f)
+        return {
+            "x_traj": [np.asarray(x, dtype=float).ravel() for x in iterate["x_traj"]],
+            "u_traj": [np.asarray(u, dtype=float).ravel() for u in iterate["u_traj"]],
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def solution_error(x_traj: list, u_traj: list, reference: Optional[dict]) -> float:
+    """Relative error of a primal solution with respect to the reference.
+
+    The error is the largest deviation of any state or control from the
+    reference, relative to the largest reference value and at least
+    absolute for reference values below one:
+
+        ||w - w_ref||_inf / max(1, ||w_ref||_inf),  w = (x_0, u_0, ..., x_N).
+
+    The reference solutions are computed with the default tolerances of
+    PARTIAL_CONDENSING_HPIPM, errors below `REFERENCE_ACCURACY` are not
+    resolved.
+
+    Args:
+        x_traj: States of each stage.
+        u_traj: Controls of each stage.
+        reference: Reference solution, see `load_reference_solution`.
+
+    Returns:
+        Relative error, NaN without reference or if dimensions differ.
+    """
+    if reference is None or x_traj is None or u_traj is None:
+        return np.nan
+    solution = [np.asarray(v, dtype=float).ravel() for v in (*x_traj, *u_traj)]
+    expected = [*reference["x_traj"], *reference["u_traj"]]
+    if len(solution) != len(expected) or any(
+        a.shape != b.shape for a, b in zip(solution, expected)
+    ):
+        return np.nan
+    if sum(v.size for v in expected) == 0:
+        return 0.0
+    w = np.concatenate(solution)
+    w_ref = np.concatenate(expected)
+    return float(np.max(np.abs(w - w_ref)) / max(1.0, np.max(np.abs(w_ref))))
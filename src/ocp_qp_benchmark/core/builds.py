@@ -0,0 +1,184 @@
+"""A/B benchmarking of several acados builds in one run."""
+
+import os
+from typing import Optional
+
+from tqdm import tqdm
+
+from ocp_qp_benchmark.core.isolation import IsolatedWorker
+from ocp_qp_benchmark.core.results import Results, failure_context
+from ocp_qp_benchmark.core.runner import _timed_solve_job
+from ocp_qp_benchmark.core.sampling import SamplingOptions
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.core.test_set import TestSet
+
+
+def acados_build_env(acados_dir: str) -> dict:
+    """Environment variables making a process load an acados build.
+
+    Args:
+        acados_dir: Root directory of the acados build, containing lib/.
+
+    Returns:
+        Environment variables pointing acados_template and the dynamic
+        loader to the build.
+    """
+    acados_dir = os.path.abspath(acados_dir)
+    lib_path = os.path.join(acados_dir, "lib")
+    library_paths = [lib_path, os.environ.get("LD_LIBRARY_PATH", "")]
+    return {
+        "ACADOS_SOURCE_DIR": acados_dir,
+        "LD_LIBRARY_PATH": os.pathsep.join(path for path in library_paths if path),
+        "DYLD_LIBRARY_PATH": lib_path,
+    }
+
+
+def build_solver_id(solver_id: str, build: str) -> str:
+    """Solver ID of a solver measured in a given build or environment, e.g. "PARTIAL_CONDENSING_HPIPM@GENERIC"."""
+    return f"{solver_id}@{build}"
+
+
+def parse_builds(builds: str) -> dict:
+    """Parse builds given as "NAME=PATH,NAME=PATH"."""
+    parsed = {}
+    for build in builds.split(","):
+        name, separator, path = build.partition("=")
+        if not separator or not name.strip() or not path.strip():
+            raise ValueError(f"Invalid build {build!r}, expected NAME=PATH")
+        parsed[name.strip()] = path.strip()
+    return parsed
+
+
+def run_in_environments(
+    test_set: TestSet,
+    solver_set: SolverSet,
+    results: Results,
+    environments: dict,
+    tags: Optional[dict] = None,
+    print_level: int = 1,
+    sampling: Optional[SamplingOptions] = None,
+) -> None:
+    """Run the test set with every solver in several worker environments.
+
+    Each environment has its own isolated worker process. The same job is
+    solved in all environments in a row, with the order of environments
+    rotated from job to job, such that machine drift (thermal state,
+    background load) affects all environments alike.
+
+    Results are stored with the solver ID tagged by the environment name,
+    see `build_solver_id`. A job failing in a worker, e.g. by crashing it,
+    is stored with status -1, and a crashed worker is restarted.
+
+    Args:
+        test_set: The test set containing problems to benchmark.
+        solver_set: The set of solvers to benchmark.
+        results: Results object to store benchmark results.
+        environments: Dictionary mapping environment names to environment
+            variables of their worker process.
+        tags: Optional dictionary mapping environment names to values of
+            tag columns of their results, e.g. {"GENERIC": {"build": "GENERIC"}}.
+        print_level: Verbosity level.
+        sampling: If set, solve times are sampled adaptively, see
+            `runner.solve_problem`.
+    """
+    tags = tags if tags is not None else {}
+    names = list(environments)
+    workers = {
+        name: IsolatedWorker(env, name=name) for name, env in environments.items()
+    }
+
+    jobs = [
+        (i, json_path_dict)
+        for json_path_dict in test_set
+        for i in range(len(solver_set))
+    ]
+    progress_bar = None
+    if print_level > 0:
+        progress_bar = tqdm(total=len(jobs) * len(names), initial=0)
+
+    try:
+        for k, (i, json_path_dict) in enumerate(jobs):
+            shift = k % len(names)
+            for name in names[shift:] + names[:shift]:
+                try:
+                    ctx, _ = workers[name].call(
+                        _timed_solve_job,
+                        solver_set.solvers[i],
+                        json_path_dict["qp_data_path"],
+                        print_level - 1,
+                        sampling=sampling,
+                    )
+                except (RuntimeError, OSError) as e:
+                    print(
+                        f"Warning: {solver_set.solver_ids[i]} failed on "
+                        f"{json_path_dict['qp_data_path']} in {name}: {e}"
+                    )
+                    ctx = failure_context()
+                    if not workers[name].is_alive():
+                        workers[name].close()
+                        workers[name] = IsolatedWorker(environments[name], name=name)
+                ctx.update(tags.get(name, {}))
+                results.update(
+                    json_path_dict["meta_data_path"],
+                    build_solver_id(solver_set.solver_ids[i], name),
+                    ctx,
+                )
+                if progress_bar is not None:
+                    progress_bar.set_description(
+                        f"Solver: {solver_set.solver_ids[i]} ({name})"
+                    )
+                    progress_bar.update(1)
+            if (k + 1) % max(test_set.count_problems(), 1) == 0:
+                results.write()
+    finally:
+        for worker in workers.values():
+            worker.close()
+        if progress_bar is not None:
+            progress_bar.close()
+        # Also keep the results of the jobs done before an interruption
+        results.write()
+
+
+def run_builds(
+    test_set: TestSet,
+    solver_set: SolverSet,
+    results: Results,
+    builds: dict,
+    print_level: int = 1,
+    envs: Optional[dict] = None,
+    sampling: Optional[SamplingOptions] = None,
+) -> None:
+    """Run the test set with every solver on several acados builds.
+
+    Each build has its own worker process, started with the environment of
+    the build, see `acados_build_env`, and jobs are interleaved across
+    builds, see `run_in_environments`.
+
+    Results are stored with the solver ID tagged by the build, see
+    `build_solver_id`, and the build name in the build column. Solver
+    availability is checked against the acados build of the calling
+    process, a solver missing in a build fails with status -1.
+
+    Args:
+        test_set: The test set containing problems to benchmark.
+        solver_set: The set of solvers to benchmark.
+        results: Results object to store benchmark results.
+        builds: Dictionary mapping build names to acados root directories.
+        print_level: Verbosity level.
+        envs: Optional extra environment variables per build name.
+        sampling: If set, solve times are sampled adaptively, see
+            `runner.solve_problem`.
+    """
+    envs = envs if envs is not None else {}
+    run_in_environments(
+        test_set,
+        solver_set,
+        results,
+        environments={
+            name: {**acados_build_env(path), **envs.get(name, {})}
+            for name, path in builds.items()
+        },
+        tags={name: {"build": name} for name in builds},
+        print_level=print_level,
+        sampling=sampling,
+    )
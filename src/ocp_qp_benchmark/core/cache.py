@@ -0,0 +1,150 @@
+"""Persistent content-addressed cache of solve results."""
+
+import json
+import math
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+from ocp_qp_benchmark.core.results import CONTEXT_COLUMNS, RESULT_COLUMNS
+from ocp_qp_benchmark.core.solver_set import get_options_dict
+from ocp_qp_benchmark.utils.hashing import (
+    acados_build_fingerprint,
+    hash_config,
+    hash_file,
+)
+
+
+class ResultCache:
+    """
+    Cache of solution contexts keyed by (QP content hash, solver
+    configuration hash, acados build fingerprint).
+
+    Attributes:
+        file_path: Path to the SQLite database file.
+        build_fingerprint: Fingerprint of the acados build in use.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path] = "results/cache.sqlite",
+        build_fingerprint: Optional[str] = None,
+    ):
+        """Open or create the cache.
+
+        Args:
+            file_path: Path to the SQLite database file.
+            build_fingerprint: Fingerprint of the acados build (default:
+                fingerprint of the build used by acados_template).
+        """
+        self.file_path = Path(file_path)
+        os.makedirs(self.file_path.parent, exist_ok=True)
+        self.build_fingerprint = (
+            build_fingerprint
+            if build_fingerprint is not None
+            else acados_build_fingerprint()
+        )
+        self._connection = sqlite3.connect(self.file_path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " qp_hash TEXT NOT NULL,"
+            " config_hash TEXT NOT NULL,"
+            " build TEXT NOT NULL,"
+            " context TEXT NOT NULL,"
+            " PRIMARY KEY (qp_hash, config_hash, build))"
+        )
+        self._connection.commit()
+        self._qp_hashes = {}
+
+    def qp_hash(self, qp_data_path: str) -> str:
+        """Content hash of a QP file, computed once per path."""
+        if qp_data_path not in self._qp_hashes:
+            self._qp_hashes[qp_data_path] = hash_file(qp_data_path)
+        return self._qp_hashes[qp_data_path]
+
+    @staticmethod
+    def config_hash(opts, measurement: Optional[dict] = None) -> str:
+        """Hash of all options of a solver configuration (acados or external).
+
+        Args:
+            opts: Solver options.
+            measurement: Settings of the measurement modes of the run that
+                change the context, e.g. sampling. Contexts measured in
+                other modes are not reused.
+
+        Returns:
+            Hex digest of the configuration.
+        """
+        options = get_options_dict(opts)
+        if not measurement:
+            return hash_config(options)
+        return hash_config({"options": options, "measurement": measurement})
+
+    @staticmethod
+    def is_valid(context: dict) -> bool:
+        """Whether a cached context has all result columns and is usable."""
+        if any(column not in context for column in CONTEXT_COLUMNS):
+            return False
+        # Solver initialization failures are not cached results
+        return context["status"] != -1
+
+    def get(self, qp_data_path: str, config_hash: str) -> Optional[dict]:
+        """Look up the cached context of a job.
+
+        Args:
+            qp_data_path: Path to the QP JSON file.
+            config_hash: Hash of the solver configuration.
+
+        Returns:
+            Cached solution context, or None if there is no valid entry.
+        """
+        row = self._connection.execute(
+            "SELECT context FROM results"
+            " WHERE qp_hash = ? AND config_hash = ? AND build = ?",
+            (self.qp_hash(qp_data_path), config_hash, self.build_fingerprint),
+        ).fetchone()
+        if row is None:
+            return None
+        context = json.loads(row[0])
+        for column in CONTEXT_COLUMNS:
+            if RESULT_COLUMNS[column] is float and context.get(column, 0) is None:
+                context[column] = math.nan
+        return context if self.is_valid(context) else None
+
+    def put(self, qp_data_path: str, config_hash: str, context: dict) -> None:
+        """Store the context of a job, replacing any previous entry.
+
+        Args:
+            qp_data_path: Path to the QP JSON file.
+            config_hash: Hash of the solver configuration.
+            context: Solution context returned by `solve_problem`.
+        """
+        if not self.is_valid(context):
+            return
+        serializable = {}
+        for key, value in context.items():
+            if hasattr(value, "item"):
+                value = value.item()  # numpy scalars
+            if isinstance(value, float) and math.isnan(value):
+                value = None
+            if value is None or isinstance(value, (int, float, str, bool)):
+                serializable[key] = value
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (
+                self.qp_hash(qp_data_path),
+                config_hash,
+                self.build_fingerprint,
+                json.dumps(serializable),
+            ),
+        )
+
+    def commit(self) -> None:
+        """Persist pending entries."""
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Persist pending entries and close the database."""
+        self._connection.commit()
+        self._connection.close()
@@ -0,0 +1,170 @@
+"""General-purpose NLP solvers through CasADi, as baseline for structured QP solvers."""
+
+import json
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+
+from ocp_qp_benchmark.core.accuracy import solution_error
+from ocp_qp_benchmark.core.external_solvers import (
+    ACADOS_MAXITER,
+    ACADOS_QP_FAILURE,
+    ACADOS_SUCCESS,
+)
+from ocp_qp_benchmark.core.results import failure_context
+from ocp_qp_benchmark.dataset.standard_form import load_standard_form
+
+ACADOS_NAN_DETECTED = 1
+
+# IPOPT options exploiting that the problem is a QP
+DEFAULT_IPOPT_OPTIONS = {
+    "ipopt.print_level": 0,
+    "ipopt.hessian_constant": "yes",
+    "ipopt.jac_c_constant": "yes",
+    "ipopt.jac_d_constant": "yes",
+    "ipopt.max_iter": 1000,
+    "print_time": False,
+}
+
+
+class CasadiSolverOptions:
+    """Options of a CasADi NLP solver, mirroring `AcadosOcpQpOptions.qp_solver`."""
+
+    def __init__(self, qp_solver: str, settings: Optional[dict] = None):
+        """Initialize CasADi solver options.
+
+        Args:
+            qp_solver: Name of the solver, e.g. "IPOPT".
+            settings: Solver options passed to `casadi.nlpsol`, e.g.
+                {"ipopt.tol": 1e-10}. Override `DEFAULT_IPOPT_OPTIONS`.
+        """
+        self.qp_solver = qp_solver
+        self.settings = dict(settings) if settings is not None else {}
+        self.print_level = 0
+
+
+def is_casadi_available() -> bool:
+    """Whether casadi can be imported."""
+    try:
+        import casadi  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _build_nlp_solver(qp_data_path: str, qp_solver: str, settings_json: str):
+    """Build the CasADi solver of a QP, cached per problem and options.
+
+    The cache is not bounded, so that solvers are not evicted when the
+    problems are solved solver by solver, and is cleared at the end of a
+    run, see `clear_nlp_solver_cache`.
+
+    Returns:
+        Tuple of the CasADi solver function and the standard form QP.
+    """
+    import casadi
+
+    qp = load_standard_form(qp_data_path)
+    z = casadi.SX.sym("z", qp.n)
+    P = casadi.DM(qp.P)
+    A = casadi.DM(qp.A)
+    nlp = {
+        "x": z,
+        "f": 0.5 * casadi.dot(z, casadi.mtimes(P, z)) + casadi.dot(casadi.DM(qp.q), z),
+        "g": casadi.mtimes(A, z),
+    }
+    solver = casadi.nlpsol(
+        "qp_solver", qp_solver.lower(), nlp, json.loads(settings_json)
+    )
+    return solver, qp
+
+
+def clear_nlp_solver_cache() -> None:
+    """Release the CasADi solvers built during a run."""
+    _build_nlp_solver.cache_clear()
+
+
+def _map_ipopt_status(stats: dict) -> int:
+    """Map IPOPT return status onto acados status codes."""
+    if stats.get("success", False):
+        return ACADOS_SUCCESS
+    return_status = stats.get("return_status", "")
+    if return_status == "Maximum_Iterations_Exceeded":
+        return ACADOS_MAXITER
+    if return_status == "Invalid_Number_Detected":
+        return ACADOS_NAN_DETECTED
+    return ACADOS_QP_FAILURE
+
+
+def solve_casadi_problem(
+    qp_data_path: str,
+    opts: CasadiSolverOptions,
+    print_level: int = 0,
+    reference: Optional[dict] = None,
+) -> dict:
+    """Solve a single QP problem with a CasADi NLP solver.
+
+    Building the CasADi problem and solver is cached per problem and not
+    timed. Iterations and internal time are taken from the solver stats.
+
+    Args:
+        qp_data_path: Path to the QP JSON file.
+        opts: CasADi solver options.
+        print_level: Verbosity level.
+        reference: Reference solution to measure the accuracy against, see
+            `accuracy.load_reference_solution`.
+
+    Returns:
+        Dictionary containing solve results (status, iterations, runtimes,
+        cost, solution error).
+    """
+    ctx = {}
+    settings = {**DEFAULT_IPOPT_OPTIONS, **opts.settings}
+    if print_level > 1:
+        settings["ipopt.print_level"] = 5
+    try:
+        solver, qp = _build_nlp_solver(
+            qp_data_path, opts.qp_solver, json.dumps(settings, sort_keys=True)
+        )
+    except Exception as e:
+        if print_level > 0:
+            print(
+                f"Error initializing solver {opts.qp_solver} "
+                f"got error:\n {e}"
+            )
+        return failure_context()
+
+    try:
+        start_time = perf_counter()
+        solution = solver(x0=np.zeros(qp.n), lbg=qp.l, ubg=qp.u)
+        runtime_external = perf_counter() - start_time
+        stats = solver.stats()
+    except Exception as e:
+        if print_level > 0:
+            print(f"Error solving with solver {opts.qp_solver} got error:\n {e}")
+        return failure_context()
+
+    status = _map_ipopt_status(stats)
+    if print_level > 0 and status != ACADOS_SUCCESS:
+        print(f"Solver {opts.qp_solver} failed with status {stats.get('return_status')}")
+    runtime_internal = stats.get("t_wall_total", runtime_external)
+
+    ctx["status"] = status
+    ctx["iterations"] = stats.get("iter_count", -1)
+    ctx["runtime_external"] = runtime_external
+    ctx["runtime_internal"] = runtime_internal
+    # No condensing, the solver time is the fair comparison
+    ctx["runtime_fair"] = runtime_internal
+    # Building the CasADi solver is cached across jobs and not timed
+    ctx["runtime_setup"] = np.nan
+    ctx["runtime_first_solve"] = runtime_external
+    ctx["runtime_teardown"] = np.nan
+    ctx["n_samples"] = 1
+    ctx["cost"] = float(solution["f"])
+    ctx["solution_error"] = solution_error(
+        *qp.trajectories(np.asarray(solution["x"]).ravel()), reference
+    )
+    return ctx
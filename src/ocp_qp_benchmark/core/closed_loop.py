@@ -0,0 +1,269 @@
+"""Closed-loop real-time MPC latency benchmark."""
+
+import json
+import os
+import tempfile
+from copy import deepcopy
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+import pandas
+from tqdm import tqdm
+
+from acados_template import AcadosOcpQp, AcadosOcpQpSolver, AcadosOcpQpOptions
+
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.dataset.converters import lti_to_qp_dict
+from ocp_qp_benchmark.utils.qp_data import get_stage_field, load_qp_dict
+
+
+def latency_statistics(
+    latencies: np.ndarray,
+    sampling_period: float,
+    deadline: Optional[float] = None,
+    nb_bins: int = 50,
+) -> dict:
+    """Compute tail latency and deadline-miss statistics.
+
+    Args:
+        latencies: Per-step latencies in seconds.
+        sampling_period: Sampling period of the control loop in seconds.
+        deadline: Deadline for a single step (default: sampling_period).
+        nb_bins: Number of logarithmically spaced histogram bins.
+
+    Returns:
+        Dictionary containing latency percentiles, deadline misses and a
+        histogram (bin edges and counts).
+    """
+    latencies = np.asarray(latencies, dtype=float)
+    deadline = sampling_period if deadline is None else deadline
+    nb_steps = len(latencies)
+    nb_misses = int(np.count_nonzero(latencies > deadline))
+
+    low = max(latencies.min(), 1e-9)
+    high = max(latencies.max(), low * (1 + 1e-6))
+    bin_edges = np.geomspace(low, high, nb_bins + 1)
+    counts, _ = np.histogram(latencies, bins=bin_edges)
+
+    return {
+        "nb_steps": nb_steps,
+        "mean": float(np.mean(latencies)),
+        "median": float(np.median(latencies)),
+        "p99": float(np.percentile(latencies, 99)),
+        "p99_9": float(np.percentile(latencies, 99.9)),
+        "max": float(np.max(latencies)),
+        "deadline": deadline,
+        "deadline_misses": nb_misses,
+        "deadline_miss_rate": nb_misses / nb_steps,
+        "histogram_bin_edges": bin_edges,
+        "histogram_counts": counts,
+    }
+
+
+def _dynamics_from_qp_dict(qp_dict: dict) -> tuple[np.ndarray, ...]:
+    """Get the stage 0 dynamics (A, B), initial state and its bound indices."""
+    A = get_stage_field(qp_dict, "A", 0)
+    B = get_stage_field(qp_dict, "B", 0)
+    if A is None or B is None:
+        raise ValueError("QP does not contain dynamics on stage 0")
+    idxbx = get_stage_field(qp_dict, "idxbx", 0)
+    if idxbx is None or len(np.unique(idxbx)) != A.shape[1]:
+        raise ValueError(
+            "Closed-loop simulation requires all states to be bounded on "
+            "stage 0 to fix the initial state"
+        )
+    x0 = np.empty(A.shape[1])
+    x0[idxbx] = get_stage_field(qp_dict, "lbx", 0)
+    return A, B, x0, idxbx
+
+
+def simulate_closed_loop(
+    qp: AcadosOcpQp,
+    opts: AcadosOcpQpOptions,
+    A: np.ndarray,
+    B: np.ndarray,
+    x0: np.ndarray,
+    nb_steps: int = 1000,
+    noise_std: float = 0.0,
+    seed: Optional[int] = None,
+    idxbx0: Optional[np.ndarray] = None,
+    print_level: int = 0,
+) -> dict:
+    """Simulate an MPC loop on an LTI plant, solving one QP per step.
+
+    The solver is created once and reused for all steps, only the initial
+    state bounds on stage 0 are updated between steps. Solver creation is
+    not timed.
+
+    Args:
+        qp: OCP QP whose stage 0 state bounds fix the initial state.
+        opts: Solver options (will be copied to avoid mutation).
+        A: Plant state transition matrix.
+        B: Plant input matrix.
+        x0: Initial plant state.
+        nb_steps: Number of simulated steps.
+        noise_std: Standard deviation of additive process noise.
+        seed: Random seed for the process noise.
+        idxbx0: Indices of the states bounded on stage 0 in bound order
+            (default: all states in natural order).
+        print_level: Verbosity level (overrides opts.print_level).
+
+    Returns:
+        Dictionary with per-step arrays latency, runtime_internal,
+        iterations and status, the applied inputs u with one row per step
+        and the plant states x with one row per step and the final state.
+    """
+    solver_opts = deepcopy(opts)
+    solver_opts.print_level = print_level - 1
+    qp_solver = AcadosOcpQpSolver(qp, solver_opts)
+    rng = np.random.default_rng(seed)
+
+    latency = np.empty(nb_steps)
+    runtime_internal = np.empty(nb_steps)
+    iterations = np.empty(nb_steps, dtype=int)
+    status = np.empty(nb_steps, dtype=int)
+    states = np.empty((nb_steps + 1, len(x0)))
+    inputs = np.empty((nb_steps, B.shape[1]))
+
+    if idxbx0 is None:
+        idxbx0 = np.arange(len(x0))
+    x = np.array(x0, dtype=float)
+    states[0] = x
+    for k in range(nb_steps):
+        qp_solver.set(0, "lbx", x[idxbx0])
+        qp_solver.set(0, "ubx", x[idxbx0])
+
+        start_time = perf_counter()
+        status[k] = qp_solver.solve()
+        latency[k] = perf_counter() - start_time
+
+        runtime_internal[k] = qp_solver.get_stats("time_tot")
+        iterations[k] = qp_solver.get_stats("iter")
+        if print_level > 0 and status[k] != 0:
+            print(f"Step {k}: solver {opts.qp_solver} failed with status {status[k]}")
+
+        u = qp_solver.get_iterate().u_traj[0]
+        x = A @ x + B @ u
+        if noise_std > 0:
+            x += noise_std * rng.standard_normal(x.shape)
+        inputs[k] = u
+        states[k + 1] = x
+
+    return {
+        "latency": latency,
+        "runtime_internal": runtime_internal,
+        "iterations": iterations,
+        "status": status,
+        "u": inputs,
+        "x": states,
+    }
+
+
+def run_closed_loop(
+    systems: dict[str, dict],
+    solver_set: SolverSet,
+    sampling_period: float,
+    nb_steps: int = 1000,
+    horizon: int = 20,
+    u_max: Optional[float] = 1.0,
+    noise_std: float = 0.0,
+    deadline: Optional[float] = None,
+    seed: Optional[int] = None,
+    print_level: int = 1,
+) -> tuple[pandas.DataFrame, dict]:
+    """Run the closed-loop latency benchmark for all systems and solvers.
+
+    Systems are either LTI systems given by their matrices A, B, Q, R, e.g.
+    from `dataset.generators.generate_lti_system`, or dataset QPs given by
+    {"qp_data_path": ...}. For dataset QPs the plant is the stage 0
+    dynamics of the QP.
+
+    Args:
+        systems: Mapping from system name to system description.
+        solver_set: The set of solvers to benchmark.
+        sampling_period: Sampling period of the control loop in seconds.
+        nb_steps: Number of simulated steps per (system, solver) pair.
+        horizon: Prediction horizon for LTI systems.
+        u_max: Input bound for LTI systems, None for unconstrained inputs.
+        noise_std: Standard deviation of additive process noise.
+        deadline: Deadline for a single step (default: sampling_period).
+        seed: Random seed for initial states and process noise.
+        print_level: Verbosity level.
+
+    Returns:
+        Tuple of a data frame with one row of latency statistics per
+        (system, solver) pair and a dictionary mapping each system to a
+        dictionary of the per-step latencies by solver ID, as expected by
+        `plot_latency_histogram`.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    latencies = {}
+
+    progress_bar = None
+    if print_level > 0:
+        progress_bar = tqdm(total=len(systems) * len(solver_set), initial=0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for system_name, system in systems.items():
+            if "qp_data_path" in system:
+                qp_dict = load_qp_dict(system["qp_data_path"])
+                A, B, x0, idxbx0 = _dynamics_from_qp_dict(qp_dict)
+                qp_data_path = system["qp_data_path"]
+            else:
+                A, B = system["A"], system["B"]
+                x0 = rng.standard_normal(A.shape[0])
+                idxbx0 = None
+                qp_dict = lti_to_qp_dict(
+                    A, B, system["Q"], system["R"], horizon, x0, u_max
+                )
+                qp_data_path = os.path.join(tmp_dir, f"{system_name}.json")
+                with open(qp_data_path, "w") as f:
+                    json.dump(qp_dict, f)
+            qp = AcadosOcpQp.from_json(qp_data_path)
+
+            for i, opts in enumerate(solver_set):
+                solver_id = solver_set.solver_ids[i]
+                if progress_bar is not None:
+                    progress_bar.set_description(f"Solver: {solver_id}")
+                trace = simulate_closed_loop(
+                    qp,
+                    opts,
+                    A,
+                    B,
+                    x0,
+                    nb_steps=nb_steps,
+                    noise_std=noise_std,
+                    seed=seed,
+                    idxbx0=idxbx0,
+                    print_level=print_level - 1,
+                )
+                stats = latency_statistics(
+                    trace["latency"], sampling_period, deadline
+                )
+                latencies.setdefault(system_name, {})[solver_id] = trace["latency"]
+                rows.append(
+                    {
+                        "system": system_name,
+                        "solver": solver_id,
+                        "nb_steps": stats["nb_steps"],
+                        "latency_mean": stats["mean"],
+                        "latency_median": stats["median"],
+                        "latency_p99": stats["p99"],
+                        "latency_p99_9": stats["p99_9"],
+                        "latency_max": stats["max"],
+                        "deadline": stats["deadline"],
+                        "deadline_misses": stats["deadline_misses"],
+                        "deadline_miss_rate": stats["deadline_miss_rate"],
+                        "nb_failed": int(np.count_nonzero(trace["status"] != 0)),
+                        "iterations_max": int(np.max(trace["iterations"])),
+                    }
+                )
+                if progress_bar is not None:
+                    progress_bar.update(1)
+
+    if progress_bar is not None:
+        progress_bar.close()
+
+    return pandas.DataFrame(rows), latencies
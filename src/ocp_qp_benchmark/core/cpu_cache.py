@@ -0,0 +1,93 @@
+"""Cold-cache timing of solves by evicting CPU caches between solves."""
+
+import glob
+from typing import Callable, Optional
+
+import numpy as np
+
+# Last-level cache size assumed when it cannot be read from sysfs, in bytes
+DEFAULT_LLC_SIZE = 32 << 20
+
+# Bytes per cache line, one byte of each line is written
+CACHE_LINE_SIZE = 64
+
+
+def last_level_cache_size() -> int:
+    """Size of the largest CPU cache in bytes, from Linux sysfs.
+
+    Returns:
+        Size of the last-level cache, or DEFAULT_LLC_SIZE if unavailable.
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    sizes = []
+    for path in glob.glob("/sys/devices/system/cpu/cpu0/cache/index*/size"):
+        try:
+            with open(path, "r") as f:
+                text = f.read().strip()
+        except OSError:
+            continue
+        if text[-1:] in units:
+            sizes.append(int(text[:-1]) * units[text[-1]])
+        elif text.isdigit():
+            sizes.append(int(text))
+    return max(sizes) if sizes else DEFAULT_LLC_SIZE
+
+
+class CacheTiming:
+    """
+    Timing of solves with cold and warm CPU caches.
+
+    Before a cold solve, caches are evicted by writing one byte per cache
+    line of a buffer larger than the last-level cache. Writes make the
+    lines dirty, so the QP data and solver workspace must be fetched from
+    memory again. Cold and warm solves alternate, such that slow drifts of
+    the machine affect both modes alike.
+
+    Attributes:
+        nb_solves: Number of cold and of warm solves per job.
+        buffer_size: Size of the eviction buffer in bytes.
+    """
+
+    def __init__(self, nb_solves: int = 5, buffer_size: Optional[int] = None):
+        """Initialize cache timing.
+
+        Args:
+            nb_solves: Number of cold and of warm solves per job.
+            buffer_size: Size of the eviction buffer in bytes (default: twice
+                the last-level cache size).
+        """
+        self.nb_solves = nb_solves
+        self.buffer_size = (
+            buffer_size if buffer_size is not None else 2 * last_level_cache_size()
+        )
+        self._buffer = None
+
+    def __getstate__(self):
+        # The buffer is allocated again in worker processes
+        state = self.__dict__.copy()
+        state["_buffer"] = None
+        return state
+
+    def flush(self) -> None:
+        """Evict CPU caches by writing to every cache line of the buffer."""
+        if self._buffer is None:
+            self._buffer = np.zeros(self.buffer_size, dtype=np.uint8)
+        self._buffer[::CACHE_LINE_SIZE] += 1
+
+    def measure(self, timed_solve: Callable[[], float]) -> tuple[float, float]:
+        """Median runtimes of warm and cold solves.
+
+        Args:
+            timed_solve: Function solving again and returning the runtime.
+
+        Returns:
+            Tuple of the median warm and the median cold runtime.
+        """
+        warm, cold = [], []
+        for _ in range(self.nb_solves):
+            self.flush()
+            cold.append(timed_solve())
+            # Directly after a solve, its data is in cache
+            warm.append(timed_solve())
+        return float(np.median(warm)), float(np.median(cold))
+
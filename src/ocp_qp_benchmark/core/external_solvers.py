@@ -0,0 +1,327 @@
+"""Adapters for standalone QP solvers working on the sparse standard form."""
+
+from time import perf_counter
+from typing import Optional, Type
+
+import numpy as np
+from scipy import sparse
+
+from ocp_qp_benchmark.core.accuracy import solution_error
+from ocp_qp_benchmark.core.results import failure_context
+from ocp_qp_benchmark.core.supported_solvers import EXTERNAL_SOLVERS
+from ocp_qp_benchmark.dataset.standard_form import StandardFormQp, load_standard_form
+
+# acados return status codes used in the results
+ACADOS_SUCCESS = 0
+ACADOS_MAXITER = 2
+ACADOS_QP_FAILURE = 4
+ACADOS_UNKNOWN = -1
+
+
+class ExternalSolverOptions:
+    """Options of an external solver, mirroring `AcadosOcpQpOptions.qp_solver`."""
+
+    def __init__(self, qp_solver: str, settings: Optional[dict] = None):
+        """Initialize external solver options.
+
+        Args:
+            qp_solver: Name of the external solver, e.g. "EXTERNAL_OSQP".
+            settings: Solver-specific settings passed to the adapter.
+        """
+        self.qp_solver = qp_solver
+        self.settings = dict(settings) if settings is not None else {}
+        self.print_level = 0
+
+
+class ExternalSolver:
+    """Interface of an external solver adapter.
+
+    Subclasses import their solver package lazily in `is_available` and
+    `solve`, so that missing optional dependencies only disable the
+    corresponding solver.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether the solver package can be imported."""
+        raise NotImplementedError()
+
+    def solve(self, qp: StandardFormQp, settings: dict) -> dict:
+        """Set up and solve a standard form QP.
+
+        Args:
+            qp: Standard form QP.
+            settings: Solver-specific settings.
+
+        Returns:
+            Dictionary with keys status (acados status code), iterations,
+            runtime_internal (as reported by the solver) and x.
+        """
+        raise NotImplementedError()
+
+
+def _split_inequalities(qp: StandardFormQp):
+    """Split l <= A z <= u into equalities and one-sided inequalities.
+
+    Returns:
+        Tuple (A_eq, b_eq, G, h) such that A_eq z = b_eq and G z <= h.
+    """
+    A = qp.A.tocsr()
+    A_eq, b_eq = A[: qp.n_eq], qp.u[: qp.n_eq]
+    A_in, l_in, u_in = A[qp.n_eq :], qp.l[qp.n_eq :], qp.u[qp.n_eq :]
+    upper = np.isfinite(u_in)
+    lower = np.isfinite(l_in)
+    G = sparse.vstack([A_in[upper], -A_in[lower]], format="csc")
+    h = np.concatenate([u_in[upper], -l_in[lower]])
+    return A_eq.tocsc(), b_eq, G, h
+
+
+class OsqpSolver(ExternalSolver):
+    """OSQP through its Python interface."""
+
+    @staticmethod
+    def is_available() -> bool:
+        try:
+            import osqp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, qp: StandardFormQp, settings: dict) -> dict:
+        import osqp
+
+        solver = osqp.OSQP()
+        solver.setup(
+            P=sparse.triu(qp.P, format="csc"),
+            q=qp.q,
+            A=qp.A,
+            l=qp.l,
+            u=qp.u,
+            **{"verbose": False, **settings},
+        )
+        result = solver.solve()
+        if result.info.status_val == 1:
+            status = ACADOS_SUCCESS
+        elif result.info.status_val == -2:
+            status = ACADOS_MAXITER
+        else:
+            status = ACADOS_QP_FAILURE
+        return {
+            "status": status,
+            "iterations": result.info.iter,
+            "runtime_internal": result.info.run_time,
+            "x": result.x,
+        }
+
+
+class ClarabelSolver(ExternalSolver):
+    """Clarabel interior-point solver, constraints as zero and nonnegative cones."""
+
+    @staticmethod
+    def is_available() -> bool:
+        try:
+            import clarabel  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, qp: StandardFormQp, settings: dict) -> dict:
+        import clarabel
+
+        A_eq, b_eq, G, h = _split_inequalities(qp)
+        A = sparse.vstack([A_eq, G], format="csc")
+        b = np.concatenate([b_eq, h])
+        cones = [clarabel.ZeroConeT(A_eq.shape[0]), clarabel.NonnegativeConeT(G.shape[0])]
+
+        clarabel_settings = clarabel.DefaultSettings()
+        clarabel_settings.verbose = False
+        for key, value in settings.items():
+            setattr(clarabel_settings, key, value)
+
+        solver = clarabel.DefaultSolver(
+            sparse.triu(qp.P, format="csc"), qp.q, A, b, cones, clarabel_settings
+        )
+        solution = solver.solve()
+        if solution.status == clarabel.SolverStatus.Solved:
+            status = ACADOS_SUCCESS
+        elif solution.status == clarabel.SolverStatus.MaxIterations:
+            status = ACADOS_MAXITER
+        else:
+            status = ACADOS_QP_FAILURE
+        return {
+            "status": status,
+            "iterations": solution.iterations,
+            "runtime_internal": solution.solve_time,
+            "x": np.array(solution.x),
+        }
+
+
+class PiqpSolver(ExternalSolver):
+    """PIQP sparse proximal interior-point solver."""
+
+    @staticmethod
+    def is_available() -> bool:
+        try:
+            import piqp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, qp: StandardFormQp, settings: dict) -> dict:
+        import piqp
+
+        A_eq, b_eq, G, h = _split_inequalities(qp)
+        solver = piqp.SparseSolver()
+        solver.settings.verbose = False
+        for key, value in settings.items():
+            setattr(solver.settings, key, value)
+        solver.setup(qp.P.tocsc(), qp.q, A_eq, b_eq, G, h)
+        piqp_status = solver.solve()
+        if piqp_status == piqp.PIQP_SOLVED:
+            status = ACADOS_SUCCESS
+        elif piqp_status == piqp.PIQP_MAX_ITER_REACHED:
+            status = ACADOS_MAXITER
+        else:
+            status = ACADOS_QP_FAILURE
+        return {
+            "status": status,
+            "iterations": solver.result.info.iter,
+            "runtime_internal": solver.result.info.run_time,
+            "x": np.array(solver.result.x),
+        }
+
+
+class QpoasesSolver(ExternalSolver):
+    """qpOASES dense active-set solver through its Python interface.
+
+    qpOASES has no package on PyPI, its Python interface is built from the
+    qpOASES sources (interfaces/python) and not part of the external extra.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        try:
+            import qpoases  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, qp: StandardFormQp, settings: dict) -> dict:
+        import qpoases
+
+        infty = 1e20
+        H = qp.P.toarray()
+        A = qp.A.toarray()
+        lbA = np.where(np.isfinite(qp.l), qp.l, -infty)
+        ubA = np.where(np.isfinite(qp.u), qp.u, infty)
+        nWSR = np.array([settings.get("nWSR", 1000)])
+        cputime = np.array([settings.get("cputime", 1e10)])
+
+        solver = qpoases.PyQProblem(qp.n, qp.m)
+        options = qpoases.PyOptions()
+        options.printLevel = qpoases.PyPrintLevel.NONE
+        solver.setOptions(options)
+        return_value = solver.init(
+            H, qp.q, A, np.full(qp.n, -infty), np.full(qp.n, infty),
+            lbA, ubA, nWSR, cputime,
+        )
+        if return_value == qpoases.PyReturnValue.SUCCESSFUL_RETURN:
+            status = ACADOS_SUCCESS
+        elif return_value == qpoases.PyReturnValue.MAX_NWSR_REACHED:
+            status = ACADOS_MAXITER
+        else:
+            status = ACADOS_QP_FAILURE
+        x = np.zeros(qp.n)
+        solver.getPrimalSolution(x)
+        return {
+            "status": status,
+            "iterations": int(nWSR[0]),
+            "runtime_internal": float(cputime[0]),
+            "x": x,
+        }
+
+
+EXTERNAL_SOLVER_ADAPTERS: dict[str, Type[ExternalSolver]] = {
+    "EXTERNAL_OSQP": OsqpSolver,
+    "EXTERNAL_CLARABEL": ClarabelSolver,
+    "EXTERNAL_QPOASES": QpoasesSolver,
+    "EXTERNAL_PIQP": PiqpSolver,
+}
+
+
+def register_external_solver(name: str, adapter: Type[ExternalSolver]) -> None:
+    """Register an additional external solver adapter.
+
+    Args:
+        name: Solver name used in solver lists, e.g. "EXTERNAL_MYSOLVER".
+        adapter: Adapter class implementing `ExternalSolver`.
+    """
+    EXTERNAL_SOLVER_ADAPTERS[name] = adapter
+    if name not in EXTERNAL_SOLVERS:
+        EXTERNAL_SOLVERS.append(name)
+
+
+def solve_external_problem(
+    qp_data_path: str,
+    opts: ExternalSolverOptions,
+    print_level: int = 0,
+    reference: Optional[dict] = None,
+) -> dict:
+    """Solve a single QP problem with an external solver.
+
+    The conversion to standard form is cached per problem and not timed.
+    runtime_external covers setup and solve of the external solver, which
+    includes its factorizations like `AcadosOcpQpSolver.solve()` does.
+
+    Args:
+        qp_data_path: Path to the QP JSON file.
+        opts: External solver options.
+        print_level: Verbosity level.
+        reference: Reference solution to measure the accuracy against, see
+            `accuracy.load_reference_solution`.
+
+    Returns:
+        Dictionary containing solve results (status, iterations, runtimes,
+        cost, solution error).
+    """
+    ctx = {}
+    solution = None
+    try:
+        qp = load_standard_form(qp_data_path)
+    except Exception as e:
+        if print_level > 0:
+            print(f"Error converting {qp_data_path} to standard form, got error:\n {e}")
+        qp = None
+
+    if qp is not None:
+        adapter = EXTERNAL_SOLVER_ADAPTERS[opts.qp_solver]()
+        start_time = perf_counter()
+        try:
+            solution = adapter.solve(qp, opts.settings)
+        except Exception as e:
+            if print_level > 0:
+                print(f"Error in external solver {opts.qp_solver}, got error:\n {e}")
+            solution = None
+        runtime_external = perf_counter() - start_time
+
+    if qp is None or solution is None:
+        return failure_context()
+
+    if print_level > 0 and solution["status"] != ACADOS_SUCCESS:
+        print(f"Solver {opts.qp_solver} failed with status {solution['status']}")
+    ctx["status"] = solution["status"]
+    ctx["iterations"] = solution["iterations"]
+    ctx["runtime_external"] = runtime_external
+    ctx["runtime_internal"] = solution["runtime_internal"]
+    # No condensing, the solver time is the fair comparison
+    ctx["runtime_fair"] = solution["runtime_internal"]
+    # Setup is part of each solve, it cannot be separated from the solve
+    ctx["runtime_setup"] = np.nan
+    ctx["runtime_first_solve"] = runtime_external
+    ctx["runtime_teardown"] = np.nan
+    ctx["n_samples"] = 1
+    ctx["cost"] = np.nan
+    if solution["x"] is not None:
+        ctx["cost"] = qp.cost(solution["x"])
+        ctx["solution_error"] = solution_error(*qp.trajectories(solution["x"]), reference)
+    return ctx
@@ -0,0 +1,292 @@
+"""Long-term history of benchmark runs with trend and change-point analysis."""
+
+import os
+import sqlite3
+from pathlib import Path
+from time import time
+from typing import Optional, Union
+
+import numpy as np
+import pandas
+
+from ocp_qp_benchmark.core.results import RESULT_COLUMNS, shifted_geometric_mean
+
+# SQLite column types of result columns
+_SQL_TYPES = {float: "REAL", int: "INTEGER", str: "TEXT"}
+
+# Columns of the runs table returned with trends
+RUN_COLUMNS = ["run_id", "timestamp", "fingerprint", "git_commit", "label"]
+
+
+def detect_change_points(
+    values: np.ndarray, min_size: int = 3, penalty_factor: float = 4.0
+) -> list[int]:
+    """Indices where the level of a series changes, by binary segmentation.
+
+    A segment is split where the split reduces the sum of squared
+    deviations from the segment means the most, if the reduction exceeds
+    `penalty_factor * sigma^2 * log(n)`. The noise level sigma is estimated
+    robustly from the median absolute deviation of successive differences,
+    so that steps and drifts do not inflate it. A gradual drift ends up
+    split where its accumulated change becomes significant.
+
+    Args:
+        values: Series, e.g. log runtimes ordered by time.
+        min_size: Minimum number of values per segment.
+        penalty_factor: Scaling of the penalty of each change point.
+
+    Returns:
+        Sorted indices of the first value of each new segment.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * min_size:
+        return []
+    differences = np.diff(values)
+    sigma = 1.4826 * np.median(np.abs(differences - np.median(differences))) / np.sqrt(2)
+    # Floor for noiseless series, e.g. 0.1% for log runtimes
+    sigma = max(sigma, 1e-3)
+    penalty = penalty_factor * sigma**2 * np.log(n)
+
+    def sse(segment: np.ndarray) -> float:
+        return float(np.sum((segment - segment.mean()) ** 2))
+
+    change_points = []
+    segments = [(0, n)]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2 * min_size:
+            continue
+        segment = values[start:end]
+        total = sse(segment)
+        best_gain, best_split = 0.0, None
+        for split in range(min_size, len(segment) - min_size + 1):
+            gain = total - sse(segment[:split]) - sse(segment[split:])
+            if gain > best_gain:
+                best_gain, best_split = gain, split
+        if best_split is not None and best_gain > penalty:
+            change_points.append(start + best_split)
+            segments.append((start, start + best_split))
+            segments.append((start + best_split, end))
+    return sorted(change_points)
+
+
+class HistoryStore:
+    """
+    SQLite database of results of many runs, e.g. over acados releases.
+
+    Each ingested run is stored with its timestamp, acados build fingerprint,
+    git commit and a free label. Results are indexed by solver and problem
+    family, so that the history of one solver on one family is a single
+    index lookup.
+
+    Attributes:
+        file_path: Path to the SQLite database file.
+    """
+
+    def __init__(self, file_path: Union[str, Path] = "results/history.sqlite"):
+        """Open or create the history database.
+
+        Args:
+            file_path: Path to the SQLite database file.
+        """
+        self.file_path = Path(file_path)
+        os.makedirs(self.file_path.parent, exist_ok=True)
+        self._connection = sqlite3.connect(self.file_path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " timestamp REAL NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " git_commit TEXT NOT NULL,"
+            " label TEXT NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " run_id INTEGER NOT NULL REFERENCES runs(run_id),"
+            " family TEXT NOT NULL,"
+            " problem TEXT NOT NULL,"
+            " solver TEXT NOT NULL)"
+        )
+        # Add result columns, also those introduced after the database was created
+        existing = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(results)")
+        }
+        for column, column_type in RESULT_COLUMNS.items():
+            if column not in existing:
+                self._connection.execute(
+                    f"ALTER TABLE results ADD COLUMN {column} {_SQL_TYPES[column_type]}"
+                )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_solver_family"
+            " ON results (solver, family, run_id)"
+        )
+        self._connection.commit()
+
+    def ingest(
+        self,
+        df: pandas.DataFrame,
+        families: Optional[dict] = None,
+        fingerprint: str = "",
+        git_commit: str = "",
+        label: str = "",
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Store the results of one run.
+
+        Args:
+            df: Results data frame, see `Results.df`.
+            families: Family of each problem name, e.g. from
+                `problem_families` (default: "" for all problems).
+            fingerprint: Fingerprint of the acados build of the run.
+            git_commit: Git commit of the acados build of the run.
+            label: Free label, e.g. the acados release.
+            timestamp: Time of the run in seconds since the epoch (default:
+                now).
+
+        Returns:
+            ID of the run in the history.
+        """
+        families = families if families is not None else {}
+        cursor = self._connection.execute(
+            "INSERT INTO runs (timestamp, fingerprint, git_commit, label)"
+            " VALUES (?, ?, ?, ?)",
+            (time() if timestamp is None else timestamp, fingerprint, git_commit, label),
+        )
+        run_id = cursor.lastrowid
+        columns = [column for column in RESULT_COLUMNS if column in df.columns]
+        rows = []
+        for record in df[columns].itertuples(index=False):
+            values = [
+                value.item() if hasattr(value, "item") else value for value in record
+            ]
+            problem = values[columns.index("problem")]
+            rows.append((run_id, families.get(problem, ""), *values))
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        self._connection.executemany(
+            f"INSERT INTO results (run_id, family, {', '.join(columns)})"
+            f" VALUES ({placeholders})",
+            rows,
+        )
+        self._connection.commit()
+        return run_id
+
+    def runs(self) -> pandas.DataFrame:
+        """All ingested runs, ordered by time."""
+        return pandas.read_sql_query(
+            f"SELECT {', '.join(RUN_COLUMNS)} FROM runs ORDER BY timestamp, run_id",
+            self._connection,
+        )
+
+    def solvers(self) -> list[str]:
+        """IDs of all solvers in the history."""
+        rows = self._connection.execute("SELECT DISTINCT solver FROM results ORDER BY solver")
+        return [row[0] for row in rows]
+
+    def query(
+        self,
+        solver: str,
+        family: Optional[str] = None,
+        metric: str = "runtime_fair",
+    ) -> pandas.DataFrame:
+        """Results of a solver over all runs.
+
+        Args:
+            solver: Solver ID.
+            family: Problem family (default: all families).
+            metric: Result column to return.
+
+        Returns:
+            Data frame with the run columns, problem, status and the metric,
+            ordered by time.
+        """
+        if RESULT_COLUMNS.get(metric) not in (float, int):
+            raise ValueError(f"Unknown numeric metric: {metric}")
+        query = (
+            f"SELECT {', '.join('runs.' + column for column in RUN_COLUMNS)},"
+            f" results.problem, results.status, results.{metric}"
+            " FROM results JOIN runs ON results.run_id = runs.run_id"
+            " WHERE results.solver = ?"
+        )
+        parameters = [solver]
+        if family is not None:
+            query += " AND results.family = ?"
+            parameters.append(family)
+        query += " ORDER BY runs.timestamp, runs.run_id"
+        return pandas.read_sql_query(query, self._connection, params=parameters)
+
+    def trend(
+        self,
+        solver: str,
+        family: Optional[str] = None,
+        metric: str = "runtime_fair",
+        min_size: int = 3,
+        penalty_factor: float = 4.0,
+    ) -> pandas.DataFrame:
+        """Per-run summary of a solver with detected change points.
+
+        Each run is summarized by the shifted geometric mean of the metric
+        over solved problems, and change points are detected on its log,
+        see `detect_change_points`.
+
+        Args:
+            solver: Solver ID.
+            family: Problem family (default: all families).
+            metric: Result column to summarize.
+            min_size: Minimum number of runs between change points.
+            penalty_factor: Scaling of the penalty of each change point.
+
+        Returns:
+            Data frame with the run columns, value, nb_problems,
+            nb_failures and change_point (whether the level changes at the
+            run), ordered by time.
+        """
+        df = self.query(solver, family, metric)
+        rows = []
+        for run_values, run_df in df.groupby(RUN_COLUMNS, sort=False):
+            solved = run_df[(run_df["status"] == 0) & (run_df[metric] >= 0)]
+            rows.append(
+                {
+                    **dict(zip(RUN_COLUMNS, run_values)),
+                    "value": (
+                        shifted_geometric_mean(solved[metric].to_numpy())
+                        if len(solved)
+                        else np.nan
+                    ),
+                    "nb_problems": len(run_df),
+                    "nb_failures": len(run_df) - len(solved),
+                }
+            )
+        trend = pandas.DataFrame(
+            rows, columns=RUN_COLUMNS + ["value", "nb_problems", "nb_failures"]
+        )
+        trend["change_point"] = False
+        valid = trend.index[trend["value"] > 0]
+        change_points = detect_change_points(
+            np.log(trend.loc[valid, "value"].to_numpy()), min_size, penalty_factor
+        )
+        trend.loc[valid[change_points], "change_point"] = True
+        return trend
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+
+def problem_families(test_set) -> dict:
+    """Family of each problem of a test set, by problem name.
+
+    Args:
+        test_set: Test set, problems are grouped by `TestSet.group_by_family`.
+
+    Returns:
+        Dictionary mapping problem names to family names.
+    """
+    from ocp_qp_benchmark.utils.io import load_meta_data
+
+    families = {}
+    for family, paths in test_set.group_by_family().items():
+        for path in paths:
+            if os.path.isdir(path):
+                families[load_meta_data(path)["name"].split(".")[0]] = family
+    return families
@@ -0,0 +1,106 @@
+"""Solver worker processes with their own environment variables.
+
+Environment variables such as LD_LIBRARY_PATH or OMP_NUM_THREADS are read
+when a process starts or first loads a library, so they cannot be changed
+for a running process. An isolated worker is a fresh Python interpreter
+started with the requested environment, which executes function calls sent
+to it over a pipe.
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+from typing import Callable, Optional
+
+
+class IsolatedWorker:
+    """
+    Python process started with its own environment, executing function calls.
+
+    Functions and arguments are pickled, so functions must be importable at
+    module level. Output of the worker, including output of C libraries, is
+    forwarded to stderr.
+
+    Attributes:
+        name: Name of the worker, e.g. the acados build it loads.
+        env: Environment variables set on top of the current environment.
+    """
+
+    def __init__(self, env: Optional[dict] = None, name: str = ""):
+        """Start the worker process.
+
+        Args:
+            env: Environment variables set on top of the current environment.
+            name: Name of the worker.
+        """
+        self.name = name
+        self.env = dict(env) if env is not None else {}
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "ocp_qp_benchmark.core.isolation"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={**os.environ, **self.env},
+        )
+
+    def call(self, function: Callable, *args, **kwargs):
+        """Execute a function call in the worker and return its result.
+
+        Raises:
+            RuntimeError: If the call raised an exception in the worker or
+                the worker exited.
+        """
+        pickle.dump((function, args, kwargs), self._process.stdin)
+        self._process.stdin.flush()
+        try:
+            ok, result = pickle.load(self._process.stdout)
+        except EOFError:
+            raise RuntimeError(
+                f"Worker {self.name} exited with code {self._process.wait()}"
+            )
+        if not ok:
+            raise RuntimeError(f"Error in worker {self.name}:\n{result}")
+        return result
+
+    def is_alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _serve() -> None:
+    """Execute pickled function calls from stdin until stdin is closed."""
+    import traceback
+
+    requests = sys.stdin.buffer
+    # Keep the original stdout for replies, send all other output to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    while True:
+        try:
+            function, args, kwargs = pickle.load(requests)
+        except EOFError:
+            break
+        try:
+            reply = (True, function(*args, **kwargs))
+        except Exception:
+            reply = (False, traceback.format_exc())
+        sys.stdout.flush()
+        pickle.dump(reply, replies)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,252 @@
+"""Hardware performance counters of solves from Linux perf_event.
+
+Counters are opened with the perf_event_open system call through ctypes,
+so no extra dependency is needed. Where counters are unavailable (other
+operating systems, containers and VMs without PMU access, or
+/proc/sys/kernel/perf_event_paranoid too strict), counts are NaN.
+"""
+
+import ctypes
+import fcntl
+import math
+import os
+import platform
+import struct
+import sys
+from typing import Optional
+
+# perf_event_open system call numbers per architecture
+_SYSCALL_NUMBERS = {
+    "x86_64": 298,
+    "i386": 336,
+    "i686": 336,
+    "aarch64": 241,
+    "arm64": 241,
+    "armv7l": 364,
+    "ppc64le": 319,
+    "riscv64": 241,
+}
+
+PERF_TYPE_HARDWARE = 0
+
+# Hardware events counted around each solve, by result column
+PERF_EVENTS = {
+    "perf_cycles": 0,  # PERF_COUNT_HW_CPU_CYCLES
+    "perf_instructions": 1,  # PERF_COUNT_HW_INSTRUCTIONS
+    "perf_cache_misses": 3,  # PERF_COUNT_HW_CACHE_MISSES
+    "perf_branch_misses": 5,  # PERF_COUNT_HW_BRANCH_MISSES
+}
+
+# Result columns derived from the counts, see `derived_metrics`
+DERIVED_COLUMNS = ("ipc", "cache_misses_per_iter", "branch_misses_per_iter")
+
+# All result columns of performance counters
+PERF_COLUMNS = (*PERF_EVENTS, *DERIVED_COLUMNS)
+
+_PERF_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+_PERF_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+_PERF_FORMAT_GROUP = 1 << 3
+
+# Bits of the flags field of perf_event_attr
+_ATTR_DISABLED = 1 << 0
+_ATTR_EXCLUDE_KERNEL = 1 << 5
+_ATTR_EXCLUDE_HV = 1 << 6
+
+_PERF_FLAG_FD_CLOEXEC = 1 << 3
+
+_PERF_EVENT_IOC_ENABLE = 0x2400
+_PERF_EVENT_IOC_DISABLE = 0x2401
+_PERF_EVENT_IOC_RESET = 0x2403
+_PERF_IOC_FLAG_GROUP = 1
+
+
+class _PerfEventAttr(ctypes.Structure):
+    """struct perf_event_attr up to PERF_ATTR_SIZE_VER5."""
+
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("config", ctypes.c_uint64),
+        ("sample_period", ctypes.c_uint64),
+        ("sample_type", ctypes.c_uint64),
+        ("read_format", ctypes.c_uint64),
+        ("flags", ctypes.c_uint64),
+        ("wakeup_events", ctypes.c_uint32),
+        ("bp_type", ctypes.c_uint32),
+        ("config1", ctypes.c_uint64),
+        ("config2", ctypes.c_uint64),
+        ("branch_sample_type", ctypes.c_uint64),
+        ("sample_regs_user", ctypes.c_uint64),
+        ("sample_stack_user", ctypes.c_uint32),
+        ("clockid", ctypes.c_int32),
+        ("sample_regs_intr", ctypes.c_uint64),
+        ("aux_watermark", ctypes.c_uint32),
+        ("sample_max_stack", ctypes.c_uint16),
+        ("reserved_2", ctypes.c_uint16),
+    ]
+
+
+def _perf_event_open(config: int, group_fd: int) -> int:
+    """Open a hardware counter of the calling thread on any CPU.
+
+    Returns:
+        File descriptor of the counter.
+
+    Raises:
+        OSError: If the counter cannot be opened.
+    """
+    number = _SYSCALL_NUMBERS.get(platform.machine())
+    if not sys.platform.startswith("linux") or number is None:
+        raise OSError("perf_event_open is not supported on this platform")
+    attr = _PerfEventAttr()
+    attr.type = PERF_TYPE_HARDWARE
+    attr.size = ctypes.sizeof(_PerfEventAttr)
+    attr.config = config
+    attr.read_format = (
+        _PERF_FORMAT_GROUP
+        | _PERF_FORMAT_TOTAL_TIME_ENABLED
+        | _PERF_FORMAT_TOTAL_TIME_RUNNING
+    )
+    # Only the group leader starts disabled, members follow it
+    attr.flags = _ATTR_EXCLUDE_KERNEL | _ATTR_EXCLUDE_HV
+    if group_fd == -1:
+        attr.flags |= _ATTR_DISABLED
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.syscall.restype = ctypes.c_long
+    fd = libc.syscall(
+        ctypes.c_long(number),
+        ctypes.byref(attr),
+        ctypes.c_long(0),  # calling thread
+        ctypes.c_long(-1),  # any CPU
+        ctypes.c_long(group_fd),
+        ctypes.c_long(_PERF_FLAG_FD_CLOEXEC),
+    )
+    if fd < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return fd
+
+
+class PerfCounters:
+    """
+    Group of hardware counters read around a block of code.
+
+    Counters are opened lazily on first use, in the calling process,
+    and count user-space events of the calling thread only: threads started
+    by the solver (e.g. OpenMP) are not counted. Events that cannot be
+    opened are reported as NaN, and if the counters were multiplexed with
+    other events, counts are scaled to the time they were enabled.
+
+    Attributes:
+        events: Hardware event configuration per result column.
+        error: Why counters are unavailable, None if all events opened.
+    """
+
+    def __init__(self, events: Optional[dict] = None):
+        """Initialize counters, see `start`.
+
+        Args:
+            events: Hardware event configuration per result column (default:
+                PERF_EVENTS).
+        """
+        self.events = dict(events) if events is not None else dict(PERF_EVENTS)
+        self.error = None
+        self._fds = None
+        self._pid = None
+
+    def _open(self) -> None:
+        """Open the counters, skipping unavailable events."""
+        # Counters inherited from a parent process count the parent
+        self.close()
+        self._fds = {}
+        self._pid = os.getpid()
+        leader = -1
+        for column, config in self.events.items():
+            try:
+                fd = _perf_event_open(config, leader)
+            except OSError as e:
+                self.error = f"{column}: {e}"
+                continue
+            self._fds[column] = fd
+            if leader == -1:
+                leader = fd
+
+    @property
+    def available(self) -> bool:
+        """Whether at least one event is counted."""
+        if self._fds is None or self._pid != os.getpid():
+            self._open()
+        return len(self._fds) > 0
+
+    def start(self) -> None:
+        """Reset and start counting."""
+        if not self.available:
+            return
+        leader = next(iter(self._fds.values()))
+        fcntl.ioctl(leader, _PERF_EVENT_IOC_RESET, _PERF_IOC_FLAG_GROUP)
+        fcntl.ioctl(leader, _PERF_EVENT_IOC_ENABLE, _PERF_IOC_FLAG_GROUP)
+
+    def stop(self) -> dict:
+        """Stop counting and read the counts since `start`.
+
+        Returns:
+            Count of each event column, NaN for unavailable events.
+        """
+        counts = {column: math.nan for column in self.events}
+        if not self.available:
+            return counts
+        leader = next(iter(self._fds.values()))
+        fcntl.ioctl(leader, _PERF_EVENT_IOC_DISABLE, _PERF_IOC_FLAG_GROUP)
+        nb_events = len(self._fds)
+        data = os.read(leader, 8 * (3 + nb_events))
+        values = struct.unpack(f"{3 + nb_events}Q", data)
+        time_enabled, time_running = values[1], values[2]
+        scale = time_enabled / time_running if 0 < time_running < time_enabled else 1.0
+        for column, value in zip(self._fds, values[3:]):
+            counts[column] = value * scale
+        return counts
+
+    def close(self) -> None:
+        """Close the counters."""
+        for fd in (self._fds or {}).values():
+            os.close(fd)
+        self._fds = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def derived_metrics(counts: dict, iterations: int) -> dict:
+    """Instructions per cycle and misses per solver iteration.
+
+    Args:
+        counts: Event counts returned by `PerfCounters.stop`.
+        iterations: Number of solver iterations of the counted solve.
+
+    Returns:
+        Dictionary with ipc, cache_misses_per_iter and
+        branch_misses_per_iter, NaN where undefined.
+    """
+    cycles = counts.get("perf_cycles", math.nan)
+    instructions = counts.get("perf_instructions", math.nan)
+    per_iteration = iterations if iterations is not None and iterations > 0 else math.nan
+    return {
+        "ipc": instructions / cycles if cycles and cycles > 0 else math.nan,
+        "cache_misses_per_iter": counts.get("perf_cache_misses", math.nan) / per_iteration,
+        "branch_misses_per_iter": counts.get("perf_branch_misses", math.nan) / per_iteration,
+    }
+
+
+# Counters of the current process, opened on first use
+_process_counters = None
+
+
+def process_counters() -> PerfCounters:
+    """Counters of the current process, shared by all jobs it solves."""
+    global _process_counters
+    if _process_counters is None:
+        _process_counters = PerfCounters()
+    return _process_counters
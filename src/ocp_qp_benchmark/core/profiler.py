@@ -0,0 +1,111 @@
+"""Low-overhead wall time attribution to the phases of a benchmark run."""
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Optional
+
+import pandas
+
+# Phases timed inside a job, possibly in a worker process
+JOB_PHASES = ("load", "copy_options", "setup", "solve", "get_stats", "teardown")
+
+
+class PhaseProfiler:
+    """
+    Accumulate wall time and call counts per named phase.
+
+    Phases are timed with `perf_counter` around the instrumented code, so the
+    overhead is two clock reads and a dictionary update per phase.
+
+    Attributes:
+        totals: Accumulated wall time per phase, in seconds.
+        counts: Number of timed calls per phase.
+        wall_time: Total wall time of the profiled run, set by `run()`.
+        nb_workers: Number of worker processes of the profiled run, set by
+            `run()`. With more than one worker, job phases are timed in the
+            workers and do not overlap with the main process.
+    """
+
+    def __init__(self):
+        """Initialize an empty profiler."""
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.wall_time = None
+        self.nb_workers = 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """Context manager timing one call of a phase."""
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += perf_counter() - start_time
+            self.counts[name] += 1
+
+    def to_dict(self) -> dict:
+        """Phase totals and counts, e.g. to send them from a worker process."""
+        return {"totals": dict(self.totals), "counts": dict(self.counts)}
+
+    def merge(self, phases: dict) -> None:
+        """Add phase totals and counts produced by `to_dict`."""
+        for name, total in phases["totals"].items():
+            self.totals[name] += total
+        for name, count in phases["counts"].items():
+            self.counts[name] += count
+
+    def summary(self) -> pandas.DataFrame:
+        """Breakdown of the wall time per phase.
+
+        With parallel workers, job phases are summed over all workers and
+        their share may exceed the wall time. The "other" row is the wall
+        time not covered by any phase of the main process.
+
+        Returns:
+            Data frame with columns phase, calls, total, mean and share
+            (of the wall time), sorted by decreasing total.
+        """
+        rows = [
+            {
+                "phase": name,
+                "calls": self.counts[name],
+                "total": total,
+                "mean": total / max(self.counts[name], 1),
+            }
+            for name, total in self.totals.items()
+        ]
+        if self.wall_time is not None:
+            main_total = sum(
+                total
+                for name, total in self.totals.items()
+                if self.nb_workers == 1 or name not in JOB_PHASES
+            )
+            other = max(self.wall_time - main_total, 0.0)
+            rows.append({"phase": "other", "calls": 1, "total": other, "mean": other})
+        df = pandas.DataFrame(rows, columns=["phase", "calls", "total", "mean"])
+        df["share"] = df["total"] / self.wall_time if self.wall_time else float("nan")
+        return df.sort_values(by="total", ascending=False).reset_index(drop=True)
+
+    def print_summary(self) -> None:
+        """Print the breakdown of the wall time per phase."""
+        df = self.summary()
+        if self.wall_time is not None:
+            print(f"Wall time: {self.wall_time:.3f}s")
+        print(
+            df.to_string(
+                index=False,
+                formatters={
+                    "total": "{:.4f}s".format,
+                    "mean": "{:.2e}s".format,
+                    "share": "{:.1%}".format,
+                },
+            )
+        )
+
+
+def profile_phase(profiler: Optional[PhaseProfiler], name: str):
+    """Phase context of a profiler, or a no-op context without profiler."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
@@ -0,0 +1,281 @@
+"""Recommendation of the fastest reliable solver configuration for a QP."""
+
+import os
+from typing import Optional
+
+import numpy as np
+import pandas
+
+# Meta data entries used as features, per-stage lists are averaged
+FEATURES = (
+    "N",
+    "nx",
+    "nu",
+    "ng",
+    "n_variables",
+    "n_constraints",
+    "n_inequalities",
+    "n_slacks",
+    "kkt_nnz",
+    "has_slacks",
+)
+
+# Features spanning orders of magnitude, compared on a log scale
+LOG_FEATURES = ("n_variables", "n_constraints", "n_inequalities", "n_slacks", "kkt_nnz")
+
+
+def meta_features(meta_data: dict) -> dict:
+    """Feature values of a problem from its meta data.
+
+    Args:
+        meta_data: Problem meta data, see `BenchSetManager.generate_meta_json`.
+
+    Returns:
+        Dictionary of the FEATURES, NaN where the meta data lacks an entry.
+    """
+    features = {}
+    for name in FEATURES:
+        value = meta_data.get(name)
+        if value is None:
+            features[name] = np.nan
+            continue
+        if isinstance(value, (list, tuple)):
+            value = np.mean(value) if len(value) > 0 else 0.0
+        value = float(value)
+        features[name] = np.log1p(value) if name in LOG_FEATURES else value
+    return features
+
+
+def qp_features(qp, qp_dict: Optional[dict] = None) -> dict:
+    """Feature values of an `AcadosOcpQp`.
+
+    Args:
+        qp: The OCP QP problem.
+        qp_dict: Raw QP data, needed for structural statistics such as
+            dimensions and constraint counts.
+
+    Returns:
+        Dictionary of the FEATURES, see `meta_features`.
+    """
+    from ocp_qp_benchmark.dataset.manager import BenchSetManager
+
+    return meta_features(BenchSetManager().generate_meta_json(qp, "", qp_dict))
+
+
+class SolverRecommender:
+    """
+    k-nearest-neighbor recommender of solver configurations.
+
+    Problems are compared on standardized meta data features. The predicted
+    runtime of a solver is the geometric mean of its runtimes on the k
+    nearest training problems, failures counting as a penalty, and its
+    predicted reliability the fraction of these problems it solved. The
+    recommendation is the solver with the lowest predicted runtime among
+    those reliable enough.
+
+    Attributes:
+        k: Number of neighbors.
+        min_success: Minimum fraction of solved neighbors of a recommended
+            solver.
+        metric: Result column of the runtime.
+        failure_penalty: Failed solves count as this factor times the
+            largest successful runtime.
+        baseline: Solver with the best geometric mean runtime over all
+            training problems, the reference of expected speedups.
+    """
+
+    def __init__(
+        self,
+        k: int = 5,
+        min_success: float = 0.9,
+        metric: str = "runtime_fair",
+        failure_penalty: float = 10.0,
+    ):
+        """Initialize an untrained recommender.
+
+        Args:
+            k: Number of neighbors.
+            min_success: Minimum fraction of solved neighbors of a
+                recommended solver.
+            metric: Result column of the runtime.
+            failure_penalty: Failed solves count as this factor times the
+                largest successful runtime.
+        """
+        self.k = k
+        self.min_success = min_success
+        self.metric = metric
+        self.failure_penalty = failure_penalty
+        self.baseline = None
+
+    def fit(self, features: pandas.DataFrame, df: pandas.DataFrame) -> "SolverRecommender":
+        """Train on problem features and results.
+
+        Args:
+            features: Data frame of FEATURES indexed by problem name.
+            df: Results data frame, see `Results.df`.
+
+        Returns:
+            The trained recommender.
+        """
+        solved = (df["status"] == 0) & (df[self.metric] > 0)
+        if not solved.any():
+            raise ValueError("No solved problems to train on")
+        penalty = self.failure_penalty * df.loc[solved, self.metric].max()
+        runtimes = df[self.metric].where(solved, penalty)
+        table = pandas.DataFrame(
+            {
+                "problem": df["problem"].astype(str),
+                "solver": df["solver"].astype(str),
+                "log_runtime": np.log(runtimes),
+                "solved": solved.astype(float),
+            }
+        )
+        log_runtimes = table.pivot_table(index="problem", columns="solver", values="log_runtime")
+        successes = table.pivot_table(index="problem", columns="solver", values="solved")
+        problems = log_runtimes.index.intersection(features.index)
+        if len(problems) == 0:
+            raise ValueError("No problem has both features and results")
+
+        # Missing results count as failures
+        self.log_runtimes = log_runtimes.loc[problems].fillna(np.log(penalty))
+        self.successes = successes.loc[problems].fillna(0.0)
+        self.solvers = list(self.log_runtimes.columns)
+        X = features.loc[problems, list(FEATURES)].astype(float)
+        self._medians = X.median().fillna(0.0)
+        X = X.fillna(self._medians)
+        self._means = X.mean()
+        self._scales = X.std(ddof=0).replace(0.0, 1.0).fillna(1.0)
+        self._X = ((X - self._means) / self._scales).to_numpy()
+        self.baseline = self.log_runtimes.mean().idxmin()
+        return self
+
+    def _standardize(self, features: dict) -> np.ndarray:
+        """Standardized feature vector, imputing missing values."""
+        x = pandas.Series({name: features.get(name, np.nan) for name in FEATURES}, dtype=float)
+        x = x.fillna(self._medians)
+        return ((x - self._means) / self._scales).to_numpy()
+
+    def predict(self, features: dict) -> pandas.DataFrame:
+        """Predicted runtime and reliability of all solvers on a problem.
+
+        Args:
+            features: Feature values of the problem, see `meta_features`.
+
+        Returns:
+            Data frame indexed by solver with columns runtime (predicted),
+            success_rate, speedup (over the baseline solver) and reliable,
+            sorted by predicted runtime.
+        """
+        if self.baseline is None:
+            raise ValueError("Recommender is not trained, call fit() first")
+        distances = np.linalg.norm(self._X - self._standardize(features), axis=1)
+        neighbors = np.argsort(distances, kind="stable")[: self.k]
+        log_runtime = self.log_runtimes.iloc[neighbors].mean()
+        prediction = pandas.DataFrame(
+            {
+                "runtime": np.exp(log_runtime),
+                "success_rate": self.successes.iloc[neighbors].mean(),
+            }
+        )
+        prediction["speedup"] = prediction.loc[self.baseline, "runtime"] / prediction["runtime"]
+        prediction["reliable"] = prediction["success_rate"] >= self.min_success
+        return prediction.sort_values(by="runtime", kind="stable")
+
+    def recommend(self, features: dict) -> dict:
+        """Fastest reliable solver configuration for a problem.
+
+        Args:
+            features: Feature values of the problem, see `meta_features`.
+
+        Returns:
+            Dictionary with the recommended solver, its predicted runtime,
+            success rate and expected speedup over the baseline solver. If
+            no solver is reliable enough, the most reliable one is chosen.
+        """
+        prediction = self.predict(features)
+        reliable = prediction[prediction["reliable"]]
+        if len(reliable) > 0:
+            solver = reliable.index[0]
+        else:
+            solver = prediction["success_rate"].idxmax()
+        return {
+            "solver": solver,
+            "runtime": float(prediction.loc[solver, "runtime"]),
+            "success_rate": float(prediction.loc[solver, "success_rate"]),
+            "speedup": float(prediction.loc[solver, "speedup"]),
+            "baseline": self.baseline,
+        }
+
+
+def cross_validate(
+    features: pandas.DataFrame,
+    df: pandas.DataFrame,
+    nb_folds: int = 5,
+    seed: int = 0,
+    **kwargs,
+) -> dict:
+    """Cross-validate recommendations on a collection.
+
+    Problems are split into folds, and recommendations for the problems of
+    each fold are made by a recommender trained on the other folds.
+
+    Args:
+        features: Data frame of FEATURES indexed by problem name.
+        df: Results data frame.
+        nb_folds: Number of folds.
+        seed: Seed of the random split.
+        kwargs: Options of `SolverRecommender`.
+
+    Returns:
+        Dictionary with the fraction of problems where the recommendation
+        is the fastest solver that solved it (accuracy), its failure rate,
+        the geometric mean slowdown over that fastest solver (regret) and
+        the geometric mean speedup over the baseline solver of each fold.
+    """
+    recommender = SolverRecommender(**kwargs)
+    full = SolverRecommender(**kwargs).fit(features, df)
+    problems = np.array(full.log_runtimes.index)
+    rng = np.random.default_rng(seed)
+    folds = np.array_split(rng.permutation(problems), min(nb_folds, len(problems)))
+    correct, failures, regrets, speedups = [], [], [], []
+    for fold in folds:
+        train = df[~df["problem"].astype(str).isin(fold)]
+        recommender.fit(features, train)
+        for problem in fold:
+            solver = recommender.recommend(features.loc[problem].to_dict())["solver"]
+            solved = full.successes.loc[problem] > 0
+            log_runtimes = full.log_runtimes.loc[problem]
+            best = log_runtimes[solved].idxmin() if solved.any() else None
+            correct.append(solver == best)
+            failures.append(not solved.get(solver, False))
+            regrets.append(log_runtimes.get(solver, np.nan) - log_runtimes.min())
+            speedups.append(
+                log_runtimes.get(recommender.baseline, np.nan)
+                - log_runtimes.get(solver, np.nan)
+            )
+    return {
+        "nb_problems": len(problems),
+        "accuracy": float(np.mean(correct)),
+        "failure_rate": float(np.mean(failures)),
+        "regret": float(np.exp(np.nanmean(regrets))),
+        "speedup": float(np.exp(np.nanmean(speedups))),
+    }
+
+
+def collection_features(test_set) -> pandas.DataFrame:
+    """Features of all problems of a test set.
+
+    Args:
+        test_set: Test set of problems with meta data.
+
+    Returns:
+        Data frame of FEATURES indexed by problem name.
+    """
+    from ocp_qp_benchmark.utils.io import load_meta_data
+
+    rows = {}
+    for path in test_set.qp_folder_paths:
+        if os.path.isdir(path):
+            meta_data = load_meta_data(path)
+            rows[meta_data["name"].split(".")[0]] = meta_features(meta_data)
+    return pandas.DataFrame.from_dict(rows, orient="index", columns=list(FEATURES))
@@ -4,14 +4,289 @@ import json
 from pathlib import Path
 from typing import Optional, Union
 
+import numpy as np
 import pandas
 
+from ocp_qp_benchmark.core.perf_counters import PERF_COLUMNS
+from ocp_qp_benchmark.core.results_store import PartitionedResultsStore, new_run_id
 from ocp_qp_benchmark.core.test_set import TestSet
 
+# Columns of the results table and their types
+RESULT_COLUMNS = {
+    "problem": str,
+    "solver": str,
+    "cost": float,
+    "solution_error": float,
+    "iterations": int,
+    "runtime_external": float,
+    "runtime_internal": float,
+    "runtime_fair": float,
+    "runtime_setup": float,
+    "runtime_first_solve": float,
+    "runtime_teardown": float,
+    "n_samples": int,
+    "rel_ci": float,
+    "runtime_warm_fair": float,
+    "runtime_cold_fair": float,
+    "perf_cycles": float,
+    "perf_instructions": float,
+    "perf_cache_misses": float,
+    "perf_branch_misses": float,
+    "ipc": float,
+    "cache_misses_per_iter": float,
+    "branch_misses_per_iter": float,
+    "status": int,
+    "build": str,
+    "threads": int,
+}
+
+# Columns tagging the environment a result was measured in, and their
+# defaults for contexts without them
+TAG_COLUMNS = {
+    "build": "",
+    # 0: thread count not controlled
+    "threads": 0,
+}
+
+# Columns taken from the solution context of `solve_problem`
+CONTEXT_COLUMNS = [
+    column
+    for column in RESULT_COLUMNS
+    if column not in ("problem", "solver") and column not in TAG_COLUMNS
+]
+
+# Columns of optional measurements (sampling, cache timing, hardware events,
+# accuracy), NaN in contexts of solves that did not measure them
+MEASUREMENT_COLUMNS = (
+    "rel_ci",
+    "runtime_warm_fair",
+    "runtime_cold_fair",
+    *PERF_COLUMNS,
+    "solution_error",
+)
+
+
+def complete_context(context: dict) -> dict:
+    """Set the measurement columns missing from a solution context to NaN.
+
+    Args:
+        context: Solution context, updated in place.
+
+    Returns:
+        The context.
+    """
+    for column in MEASUREMENT_COLUMNS:
+        context.setdefault(column, np.nan)
+    return context
+
+
+def failure_context() -> dict:
+    """Solution context of a job whose solver could not be run."""
+    return complete_context(
+        {
+            "status": -1,  # ACADOS_UNKNOWN
+            "iterations": -1,
+            "runtime_external": -1,
+            "runtime_internal": -1,
+            "runtime_fair": -1,
+            "runtime_setup": -1,
+            "runtime_first_solve": -1,
+            "runtime_teardown": -1,
+            "n_samples": 0,
+            "cost": np.nan,
+        }
+    )
+
+
+def shifted_geometric_mean(values: np.ndarray, shift: float = 1e-5) -> float:
+    """Shifted geometric mean, robust to very small runtimes.
+
+    Args:
+        values: Positive values, e.g. runtimes in seconds.
+        shift: Shift added to each value before taking the geometric mean.
+
+    Returns:
+        Shifted geometric mean of the values.
+    """
+    values = np.asarray(values, dtype=float)
+    return float(np.exp(np.mean(np.log(values + shift))) - shift)
+
+
+def compare_results(
+    baseline: pandas.DataFrame,
+    candidate: pandas.DataFrame,
+    metric: str = "runtime_fair",
+) -> pandas.DataFrame:
+    """Compare two results tables solver by solver.
+
+    The metric is compared on the problems solved (status 0) by a solver in
+    both tables, so that ratios are not biased by different failures.
+
+    Args:
+        baseline: Results of the baseline run.
+        candidate: Results of the run to compare to the baseline.
+        metric: Result column to compare.
+
+    Returns:
+        Data frame with one row per solver present in both tables and
+        columns solved_baseline, solved_candidate, nb_common, and the shifted
+        geometric means of the metric and their ratio (candidate/baseline).
+    """
+    rows = []
+    solvers = sorted(set(baseline["solver"]) & set(candidate["solver"]))
+    for solver_id in solvers:
+        a = baseline[baseline["solver"] == solver_id].set_index("problem")
+        b = candidate[candidate["solver"] == solver_id].set_index("problem")
+        solved_a = a.index[a["status"] == 0]
+        solved_b = b.index[b["status"] == 0]
+        common = solved_a.intersection(solved_b)
+        row = {
+            "solver": solver_id,
+            "solved_baseline": len(solved_a),
+            "solved_candidate": len(solved_b),
+            "nb_common": len(common),
+            f"{metric}_baseline": np.nan,
+            f"{metric}_candidate": np.nan,
+            "ratio": np.nan,
+        }
+        if len(common) > 0:
+            row[f"{metric}_baseline"] = shifted_geometric_mean(a.loc[common, metric])
+            row[f"{metric}_candidate"] = shifted_geometric_mean(b.loc[common, metric])
+            row["ratio"] = row[f"{metric}_candidate"] / row[f"{metric}_baseline"]
+        rows.append(row)
+    return pandas.DataFrame(rows)
+
+
+def setup_cost_summary(
+    df: pandas.DataFrame, solver_ids: Optional[list[str]] = None
+) -> pandas.DataFrame:
+    """One-time and per-solve cost of each solver.
+
+    The one-time cost of a job is its setup and teardown time plus the extra
+    latency of the first solve over later solves. Costs are medians over the
+    solved problems with measured setup time.
+
+    Later solves are only timed with sampling, see `runner.solve_problem`.
+    Without it, runtime_first_solve equals runtime_external, so the
+    first-solve penalty is 0 and the per-solve cost includes it.
+
+    Args:
+        df: Results data frame.
+        solver_ids: Solver IDs to summarize (default: all in df).
+
+    Returns:
+        Data frame indexed by solver with columns one_time_cost,
+        per_solve_cost and nb_problems.
+    """
+    solved = df[(df["status"] == 0) & (df["runtime_setup"] >= 0)]
+    if solver_ids is None:
+        solver_ids = sorted(set(solved["solver"]))
+    rows = []
+    for solver_id in solver_ids:
+        solver_df = solved[solved["solver"] == solver_id]
+        first_solve_penalty = (
+            solver_df["runtime_first_solve"] - solver_df["runtime_external"]
+        ).clip(lower=0)
+        one_time = (
+            solver_df["runtime_setup"]
+            + solver_df["runtime_teardown"].fillna(0)
+            + first_solve_penalty
+        )
+        rows.append(
+            {
+                "solver": solver_id,
+                "one_time_cost": float(one_time.median()) if len(one_time) else np.nan,
+                "per_solve_cost": (
+                    float(solver_df["runtime_external"].median())
+                    if len(solver_df)
+                    else np.nan
+                ),
+                "nb_problems": len(solver_df),
+            }
+        )
+    return pandas.DataFrame(
+        rows, columns=["solver", "one_time_cost", "per_solve_cost", "nb_problems"]
+    ).set_index("solver")
+
+
+def break_even_solves(summary: pandas.DataFrame) -> pandas.DataFrame:
+    """Number of solves after which a solver becomes cheaper than another.
+
+    With one-time cost S and per-solve cost c, the total cost of n solves is
+    S + n * c, and solver i catches up with solver j after
+    (S_i - S_j) / (c_j - c_i) solves.
+
+    Args:
+        summary: Output of `setup_cost_summary`.
+
+    Returns:
+        Square data frame, entry (i, j) is the break-even number of solves
+        of solver i against solver j, NaN if i is never cheaper after more
+        solves (it has no lower per-solve cost).
+    """
+    solvers = list(summary.index)
+    S = summary["one_time_cost"].to_numpy()
+    c = summary["per_solve_cost"].to_numpy()
+    matrix = np.full((len(solvers), len(solvers)), np.nan)
+    for i in range(len(solvers)):
+        for j in range(len(solvers)):
+            if i != j and c[i] < c[j]:
+                matrix[i, j] = max((S[i] - S[j]) / (c[j] - c[i]), 0.0)
+    return pandas.DataFrame(matrix, index=solvers, columns=solvers)
+
+
+def cache_sensitivity_summary(
+    df: pandas.DataFrame, solver_ids: Optional[list[str]] = None
+) -> pandas.DataFrame:
+    """Cold/warm cache runtime ratio of each solver.
+
+    Args:
+        df: Results data frame with cold and warm cache timings.
+        solver_ids: Solver IDs to summarize (default: all in df).
+
+    Returns:
+        Data frame indexed by solver with columns warm and cold (shifted
+        geometric means of the fair runtimes), ratio (geometric mean of the
+        per-problem cold/warm ratios), max_ratio and nb_problems, sorted by
+        decreasing ratio.
+    """
+    timed = df[
+        (df["status"] == 0)
+        & (df["runtime_warm_fair"] > 0)
+        & (df["runtime_cold_fair"] > 0)
+    ]
+    if solver_ids is None:
+        solver_ids = sorted(set(timed["solver"]))
+    rows = []
+    for solver_id in solver_ids:
+        solver_df = timed[timed["solver"] == solver_id]
+        ratios = solver_df["runtime_cold_fair"] / solver_df["runtime_warm_fair"]
+        rows.append(
+            {
+                "solver": solver_id,
+                "warm": shifted_geometric_mean(solver_df["runtime_warm_fair"]),
+                "cold": shifted_geometric_mean(solver_df["runtime_cold_fair"]),
+                "ratio": float(np.exp(np.log(ratios).mean())) if len(ratios) else np.nan,
+                "max_ratio": float(ratios.max()) if len(ratios) else np.nan,
+                "nb_problems": len(solver_df),
+            }
+        )
+    summary = pandas.DataFrame(
+        rows, columns=["solver", "warm", "cold", "ratio", "max_ratio", "nb_problems"]
+    ).set_index("solver")
+    return summary.sort_values(by="ratio", ascending=False)
+
+
+def is_dataset_path(path: Union[str, Path]) -> bool:
+    """Whether a results path denotes a partitioned dataset (a directory)."""
+    path = Path(path)
+    return path.is_dir() or path.suffix == ""
+
 
 class Results:
     """
-    Log Test set results into csv file or parquet file.
+    Log Test set results into csv file, parquet file or partitioned parquet
+    dataset.
 
     Attributes:
         df: Data frame storing the results.
@@ -24,62 +299,95 @@ class Results:
     test_set: TestSet
 
     @staticmethod
-    def read_from_file(path: Union[str, Path]) -> Optional[pandas.DataFrame]:
-        """Load a pandas dataframe from a CSV or Parquet file.
+    def read_from_file(
+        path: Union[str, Path],
+        solvers: Optional[list[str]] = None,
+        problems: Optional[list[str]] = None,
+    ) -> Optional[pandas.DataFrame]:
+        """Load a pandas dataframe from a CSV file, Parquet file or dataset.
+
+        For Parquet files and datasets, the solver and problem filters are
+        pushed down to the reader, so that other rows are not loaded.
 
         Args:
-            path: Path to the file to load.
+            path: Path to the file or dataset directory to load.
+            solvers: Solver IDs to load (default: all).
+            problems: Problem names to load (default: all).
 
         Returns:
             Loaded dataframe, or None if the file does not exist.
         """
         file_path = Path(path)
+        if is_dataset_path(file_path):
+            return PartitionedResultsStore(file_path).read(
+                solvers=solvers, problems=problems
+            )
         if not file_path.exists():
             return None
 
-        read_func = (
-            pandas.read_csv
-            if file_path.suffix == ".csv"
-            else pandas.read_parquet
-        )
-        df = read_func(file_path)
+        if file_path.suffix == ".csv":
+            df = pandas.read_csv(file_path)
+            if solvers is not None:
+                df = df[df["solver"].isin(solvers)]
+            if problems is not None:
+                df = df[df["problem"].isin(problems)]
+        else:
+            filters = [
+                (column, "in", list(values))
+                for column, values in (("solver", solvers), ("problem", problems))
+                if values is not None
+            ]
+            df = pandas.read_parquet(file_path, filters=filters or None)
         return df
 
     def __init__(
-        self, file_path: Optional[Union[str, Path]], test_set: TestSet
+        self,
+        file_path: Optional[Union[str, Path]],
+        test_set: TestSet,
+        solvers: Optional[list[str]] = None,
+        run_id: Optional[str] = None,
     ):
         """Initialize results.
 
         Args:
             file_path: Path to the results file (format: CSV or Parquet), or
-                `None` if there is no file associated with these results.
+                to a directory for a partitioned Parquet dataset, or `None`
+                if there is no file associated with these results.
             test_set: Test set from which results were produced.
+            solvers: If set, only results of these solver IDs are loaded.
+            run_id: Run identifier for new results written to a dataset
+                (default: current time).
         """
-        df = pandas.DataFrame(
-            [],
-            columns=[
-                "problem",
-                "solver",
-                "cost",
-                "iterations",
-                "runtime_external",
-                "runtime_internal",
-                "runtime_fair",
-                "status",
-            ],
-        ).astype(
-            {
-                "problem": str,
-                "solver": str,
-                "cost": float,
-                "iterations": int,
-                "runtime_external": float,
-                "runtime_internal": float,
-                "runtime_fair": float,
-                "status": int,
-            }
+        df = pandas.DataFrame([], columns=list(RESULT_COLUMNS)).astype(
+            RESULT_COLUMNS
         )
 
+        # Problems in the test set
+        problems = []
+        for path_dict in test_set:
+            with open(path_dict["meta_data_path"], "r") as f:
+                meta_data = json.load(f)
+            problem_name = meta_data["name"].split(".")[0]
+            problems.append(problem_name)
+
+        self.__store = None
+        self.__pending_rows = {}
+        self.run_id = run_id if run_id is not None else new_run_id()
+        if file_path is not None and is_dataset_path(file_path):
+            # Datasets are append-only, only the test set needs to be loaded
+            self.__store = PartitionedResultsStore(file_path)
+            df_from_file = self.__store.read(solvers=solvers, problems=problems)
+            if df_from_file is not None:
+                df = pandas.concat(
+                    [df, df_from_file.drop(columns="run")], ignore_index=True
+                )
+                df = df.astype({"problem": "category", "solver": "category"})
+            self.__complementary_df = df.iloc[0:0]
+            self.df = df
+            self.file_path = Path(file_path)
+            self.test_set = test_set
+            return
+
         if file_path is not None:
             file_path = Path(file_path)
             df_from_file = Results.read_from_file(file_path)
@@ -96,15 +404,11 @@ class Results:
                 df.to_csv(file_path, index=False)
 
         # Filter out problems from the CSV that are in the test set
-        problems = []
-        for path_dict in test_set:
-            with open(path_dict["meta_data_path"], "r") as f:
-                meta_data = json.load(f)
-            problem_name = meta_data["name"].split(".")[0]
-            problems.append(problem_name)
-
-        test_set_df = df[df["problem"].isin(problems)]
-        complementary_df = df[~df["problem"].isin(problems)]
+        in_test_set = df["problem"].isin(problems)
+        if solvers is not None:
+            in_test_set &= df["solver"].isin(solvers)
+        test_set_df = df[in_test_set]
+        complementary_df = df[~in_test_set]
 
         self.__complementary_df = complementary_df
         self.df = test_set_df
@@ -114,9 +418,19 @@ class Results:
     def write(self, path: Optional[Union[str, Path]] = None) -> None:
         """Write results to their CSV file for persistence.
 
+        For a partitioned dataset, only results updated since the last write
+        are appended as a new partition of the current run.
+
         Args:
             path: Optional path to a separate file to write to.
         """
+        if self.__store is not None and path is None:
+            self.__store.append(
+                pandas.DataFrame(list(self.__pending_rows.values())), self.run_id
+            )
+            self.__pending_rows = {}
+            return
+
         path_check = path or self.file_path
         save_path = Path(path_check)
         save_df = pandas.concat([self.df, self.__complementary_df])
@@ -137,8 +451,10 @@ class Results:
         Args:
             problem: Path to problem meta file.
             solver_id: Solver identifier string.
-            context: Solution context containing status, iterations, etc.
+            context: Solution context containing status, iterations, etc.,
+                missing measurement columns are NaN.
         """
+        context = complete_context(dict(context))
         with open(problem, "r") as f:
             meta_data = json.load(f)
         problem_name = meta_data["name"].split(".")[0]
@@ -150,20 +466,18 @@ class Results:
             ]
         )
 
-        new_row = pandas.DataFrame(
-            [
-                {
-                    "problem": problem_name,
-                    "solver": solver_id,
-                    "cost": context["cost"],
-                    "iterations": context["iterations"],
-                    "runtime_external": context["runtime_external"],
-                    "runtime_internal": context["runtime_internal"],
-                    "runtime_fair": context["runtime_fair"],
-                    "status": context["status"],
-                }
-            ]
-        )
+        row = {
+            "problem": problem_name,
+            "solver": solver_id,
+            **{column: context[column] for column in CONTEXT_COLUMNS},
+            **{
+                column: context.get(column, default)
+                for column, default in TAG_COLUMNS.items()
+            },
+        }
+        if self.__store is not None:
+            self.__pending_rows[(problem_name, solver_id)] = row
+        new_row = pandas.DataFrame([row])
         self.df = pandas.concat([self.df, new_row], ignore_index=True)
 
     def get_solver_ids(self) -> list[str]:
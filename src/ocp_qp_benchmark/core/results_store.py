@@ -0,0 +1,133 @@
+"""Partitioned Parquet dataset storage of results."""
+
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas
+import pyarrow
+import pyarrow.dataset as ds
+
+# Partition columns, directories are laid out as run=.../solver=.../
+PARTITION_COLUMNS = ("run", "solver")
+
+
+def new_run_id() -> str:
+    """Run identifier that sorts chronologically, e.g. "20261018T101500-1a2b3c"."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class PartitionedResultsStore:
+    """
+    Results stored as a Parquet dataset partitioned by run and solver.
+
+    Files are only ever added: every write appends new files to the
+    partition of the current run. When reading, the latest run wins for
+    each (problem, solver) pair. String columns are dictionary-encoded in
+    the files and loaded as categoricals.
+
+    Attributes:
+        root: Root directory of the dataset.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Initialize the store.
+
+        Args:
+            root: Root directory of the dataset, created on first write.
+        """
+        self.root = Path(root)
+        self._partitioning = ds.partitioning(
+            pyarrow.schema([(column, pyarrow.string()) for column in PARTITION_COLUMNS]),
+            flavor="hive",
+        )
+
+    def exists(self) -> bool:
+        """Whether the dataset contains any files."""
+        return self.root.is_dir() and any(self.root.rglob("*.parquet"))
+
+    def read(
+        self,
+        solvers: Optional[list[str]] = None,
+        problems: Optional[list[str]] = None,
+        runs: Optional[list[str]] = None,
+        columns: Optional[list[str]] = None,
+        latest_only: bool = True,
+    ) -> Optional[pandas.DataFrame]:
+        """Load results, reading only the requested partitions and rows.
+
+        Filters on run and solver prune whole directories, the filter on
+        problem is pushed down to the Parquet row groups.
+
+        Args:
+            solvers: Solver IDs to load (default: all).
+            problems: Problem names to load (default: all).
+            runs: Run IDs to load (default: all).
+            columns: Columns to load (default: all).
+            latest_only: Keep only the latest run of each (problem, solver).
+
+        Returns:
+            Data frame with categorical problem and solver columns, or None
+            if the dataset does not exist.
+        """
+        if not self.exists():
+            return None
+        dataset = ds.dataset(
+            self.root, format="parquet", partitioning=self._partitioning
+        )
+
+        expression = None
+        for column, values in (("solver", solvers), ("problem", problems), ("run", runs)):
+            if values is None:
+                continue
+            condition = ds.field(column).isin(list(values))
+            expression = condition if expression is None else expression & condition
+
+        if columns is not None:
+            columns = list(dict.fromkeys(["problem", "solver", "run", *columns]))
+        table = dataset.to_table(filter=expression, columns=columns)
+        df = table.to_pandas()
+
+        if latest_only and len(df) > 0:
+            df = df.sort_values(by="run", kind="stable").drop_duplicates(
+                subset=["problem", "solver"], keep="last"
+            )
+        for column in ("problem", "solver", "run"):
+            df[column] = df[column].astype("category")
+        return df.reset_index(drop=True)
+
+    def append(self, df: pandas.DataFrame, run_id: str) -> None:
+        """Append results as new files in the partitions of a run.
+
+        Args:
+            df: Results to append, with a solver column.
+            run_id: Identifier of the run the results belong to.
+        """
+        if len(df) == 0:
+            return
+        df = df.assign(run=run_id)
+        for column in ("problem", "solver", "run"):
+            df[column] = df[column].astype(str)
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self.root,
+            format="parquet",
+            partitioning=self._partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                use_dictionary=True, compression="zstd"
+            ),
+        )
+
+    def list_runs(self) -> list[str]:
+        """Run IDs present in the dataset, oldest first."""
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            path.name.split("=", 1)[1]
+            for path in self.root.iterdir()
+            if path.is_dir() and path.name.startswith("run=")
+        )
@@ -1,7 +1,11 @@
 """Benchmark runner."""
 
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
 from time import perf_counter
+from typing import Callable, Optional
 
 import numpy as np
 from tqdm import tqdm
@@ -10,7 +14,29 @@ from acados_template import AcadosOcpQp, AcadosOcpQpSolver, AcadosOcpQpOptions
 
 from ocp_qp_benchmark.core.test_set import TestSet
 from ocp_qp_benchmark.core.solver_set import SolverSet
-from ocp_qp_benchmark.core.results import Results
+from ocp_qp_benchmark.core.results import Results, complete_context, failure_context
+from ocp_qp_benchmark.core.cache import ResultCache
+from ocp_qp_benchmark.core.accuracy import load_reference_solution, solution_error
+from ocp_qp_benchmark.core.casadi_solvers import (
+    CasadiSolverOptions,
+    clear_nlp_solver_cache,
+    solve_casadi_problem,
+)
+from ocp_qp_benchmark.core.external_solvers import solve_external_problem
+from ocp_qp_benchmark.core.traces import TRACE_COLUMNS, TraceStore
+from ocp_qp_benchmark.core.profiler import PhaseProfiler, profile_phase
+from ocp_qp_benchmark.core.sampling import SamplingOptions, sample_adaptively
+from ocp_qp_benchmark.core.cpu_cache import CacheTiming
+from ocp_qp_benchmark.core.perf_counters import derived_metrics, process_counters
+from ocp_qp_benchmark.core.telemetry import RunTelemetry
+from ocp_qp_benchmark.core.scheduler import (
+    longest_first,
+    predict_job_costs,
+    prediction_unit,
+    problem_size,
+    simulate_makespan,
+)
+from ocp_qp_benchmark.dataset.standard_form import load_standard_form
 
 
 def solve_problem(
@@ -18,6 +44,12 @@ def solve_problem(
     opts: AcadosOcpQpOptions,
     repeat_times: int = 1,
     print_level: int = 0,
+    collect_trace: bool = False,
+    profiler: Optional[PhaseProfiler] = None,
+    sampling: Optional[SamplingOptions] = None,
+    cache_timing: Optional[CacheTiming] = None,
+    count_events: bool = False,
+    reference: Optional[dict] = None,
 ) -> dict:
     """Solve a single QP problem with the given solver options.
 
@@ -26,60 +58,366 @@ def solve_problem(
         opts: Solver options (will be copied to avoid mutation).
         repeat_times: Number of times to repeat the solve (for timing).
         print_level: Verbosity level (overrides opts.print_level).
+        collect_trace: Whether to add the per-iteration residuals exposed
+            by the solver to the context, see `get_convergence_trace`.
+        profiler: If set, time spent copying options, creating the solver,
+            solving, reading statistics and releasing the solver is added
+            to its phases.
+        sampling: If set, the solve is repeated on the same solver after
+            the first solve until the confidence interval of the mean solve
+            time is narrow enough, see `sampling.sample_adaptively`. The
+            runtimes are then means over the samples without outliers. The
+            solver options are assumed not to warm start from the previous
+            solution.
+        cache_timing: If set, the solve is repeated alternately with
+            evicted (cold) and hot (warm) CPU caches, see `CacheTiming`.
+        count_events: Whether to count hardware events (cycles,
+            instructions, cache and branch misses) of the first solve with
+            Linux perf_event, see `PerfCounters`.
+        reference: Reference solution to measure the accuracy of the first
+            solve against, see `accuracy.load_reference_solution`.
 
     Returns:
         Dictionary containing solve results (status, iterations, runtimes, cost).
+        runtime_setup and runtime_teardown are the times to construct and
+        release the solver, runtime_first_solve the latency of the first
+        solve after construction. n_samples is the number of timing samples
+        kept and rel_ci the relative width of their confidence interval.
+        runtime_warm_fair and runtime_cold_fair are the median fair runtimes
+        with warm and cold caches, NaN without cache timing. The PERF_COLUMNS
+        are event counts and derived metrics, NaN if not counted.
+        solution_error is the relative error of the primal solution with
+        respect to the reference, see `accuracy.solution_error`, NaN
+        without reference. Measurements not taken are NaN, see
+        `results.complete_context`.
     """
     ctx = {}
     runtime_external = 1e50
+    runtime_setup = None
 
     if repeat_times != 1:
         raise NotImplementedError("repeat_times != 1 not implemented yet")
 
     # Copy options to avoid mutation and set print level
-    solver_opts = deepcopy(opts)
-    solver_opts.print_level = print_level - 1
+    with profile_phase(profiler, "copy_options"):
+        solver_opts = deepcopy(opts)
+        solver_opts.print_level = print_level - 1
 
     for _ in range(repeat_times):
         try:
-            qp_solver = AcadosOcpQpSolver(qp, solver_opts)
+            with profile_phase(profiler, "setup"):
+                setup_start_time = perf_counter()
+                qp_solver = AcadosOcpQpSolver(qp, solver_opts)
+                setup_time = perf_counter() - setup_start_time
         except Exception as e:
             if print_level > 0:
                 print(
                     f"Error initializing solver {opts.qp_solver} "
                     f"got error:\n {e}"
                 )
-            ctx["status"] = -1  # ACADOS_UNKNOWN
-            ctx["iterations"] = -1
-            ctx["runtime_external"] = -1
-            ctx["runtime_internal"] = -1
-            ctx["runtime_fair"] = -1
-            ctx["cost"] = np.nan
-            return ctx
-
-        start_time = perf_counter()
-        status = qp_solver.solve()
+            return failure_context()
+
+        with profile_phase(profiler, "solve"):
+            if count_events:
+                process_counters().start()
+            start_time = perf_counter()
+            status = qp_solver.solve()
+            solve_time = perf_counter() - start_time
+            if count_events:
+                counts = process_counters().stop()
+            runtime_external = min(runtime_external, solve_time)
         if print_level > 0 and status != 0:
             print(f"Solver {opts.qp_solver} failed with status {status}")
-        runtime_external = min(runtime_external, perf_counter() - start_time)
-        iter = qp_solver.get_stats("iter")
-        runtime_internal = qp_solver.get_stats("time_tot")
-        runtime_fair = (
-            qp_solver.get_stats("time_qp_xcond")
-            + qp_solver.get_stats("time_qp_solver_call")
-        )
+        with profile_phase(profiler, "get_stats"):
+            iter = qp_solver.get_stats("iter")
+            runtime_internal = qp_solver.get_stats("time_tot")
+            runtime_fair = (
+                qp_solver.get_stats("time_qp_xcond")
+                + qp_solver.get_stats("time_qp_solver_call")
+            )
+            if collect_trace:
+                trace = get_convergence_trace(qp_solver)
+            error = np.nan
+            if reference is not None:
+                iterate = qp_solver.get_iterate()
+                error = solution_error(iterate.x_traj, iterate.u_traj, reference)
+        n_samples = 1
+        rel_ci = np.nan
+        if sampling is not None:
+            with profile_phase(profiler, "sampling"):
+                samples, inliers, rel_ci = sample_adaptively(
+                    lambda: _timed_solve(qp_solver), sampling
+                )
+                n_samples = int(np.sum(inliers))
+                runtime_external, runtime_internal, runtime_fair = np.mean(
+                    samples[inliers], axis=0
+                )
+        runtime_warm_fair = runtime_cold_fair = np.nan
+        if cache_timing is not None:
+            with profile_phase(profiler, "cache_timing"):
+                runtime_warm_fair, runtime_cold_fair = cache_timing.measure(
+                    lambda: _timed_solve(qp_solver)[2]
+                )
         # TODO: reset() needed
-        qp_solver = None
+        with profile_phase(profiler, "teardown"):
+            teardown_start_time = perf_counter()
+            qp_solver = None
+            teardown_time = perf_counter() - teardown_start_time
+        # One-time costs are taken from the first repetition
+        if runtime_setup is None:
+            runtime_setup = setup_time
+            runtime_first_solve = solve_time
+            runtime_teardown = teardown_time
 
     ctx["status"] = status
     ctx["iterations"] = iter
     ctx["runtime_external"] = runtime_external
     ctx["runtime_internal"] = runtime_internal
     ctx["runtime_fair"] = runtime_fair
+    ctx["runtime_setup"] = runtime_setup
+    ctx["runtime_first_solve"] = runtime_first_solve
+    ctx["runtime_teardown"] = runtime_teardown
+    ctx["n_samples"] = n_samples
+    ctx["rel_ci"] = rel_ci
+    ctx["runtime_warm_fair"] = runtime_warm_fair
+    ctx["runtime_cold_fair"] = runtime_cold_fair
+    if count_events:
+        ctx.update(counts)
+        ctx.update(derived_metrics(counts, iter))
     # TODO: get_cost() needs to be called after solve()
     ctx["cost"] = 0.0
+    ctx["solution_error"] = error
+    if collect_trace and trace is not None:
+        ctx["trace"] = trace
 
-    return ctx
+    return complete_context(ctx)
+
+
+def _timed_solve(qp_solver: AcadosOcpQpSolver) -> tuple[float, float, float]:
+    """Solve again and return external, internal and fair runtimes."""
+    start_time = perf_counter()
+    qp_solver.solve()
+    runtime_external = perf_counter() - start_time
+    return (
+        runtime_external,
+        qp_solver.get_stats("time_tot"),
+        qp_solver.get_stats("time_qp_xcond") + qp_solver.get_stats("time_qp_solver_call"),
+    )
+
+
+def get_convergence_trace(qp_solver: AcadosOcpQpSolver) -> Optional[np.ndarray]:
+    """Get the per-iteration residuals of the last solve.
+
+    Uses the "statistics" stats of the acados QP solver, a table with one
+    row per field and one column per iteration, as for all acados solvers.
+    The first row is the iteration index, followed by the stationarity,
+    equality, inequality and complementarity residuals.
+
+    Args:
+        qp_solver: Solver after a call to solve().
+
+    Returns:
+        Array with one row per iteration and the columns TRACE_COLUMNS, or
+        None if the solver does not expose residual statistics.
+    """
+    try:
+        statistics = np.asarray(qp_solver.get_stats("statistics"), dtype=float)
+    except Exception:
+        return None
+    nb_columns = len(TRACE_COLUMNS)
+    if statistics.ndim != 2 or statistics.size == 0 or statistics.shape[0] < nb_columns + 1:
+        return None
+    return np.ascontiguousarray(statistics[1 : nb_columns + 1].T)
+
+
+def solve_job(
+    opts,
+    qp_data_path: str,
+    print_level: int = 0,
+    collect_trace: bool = False,
+    profiler: Optional[PhaseProfiler] = None,
+    sampling: Optional[SamplingOptions] = None,
+    cache_timing: Optional[CacheTiming] = None,
+    count_events: bool = False,
+) -> dict:
+    """Solve a single (problem, solver) job, dispatching on the solver type.
+
+    Args:
+        opts: Solver options (acados, CasADi or external solver).
+        qp_data_path: Path to the QP JSON file.
+        print_level: Verbosity level.
+        collect_trace: Whether to collect per-iteration residuals, only
+            supported by acados OCP QP solvers.
+        profiler: If set, phases of acados OCP QP solver jobs are timed,
+            other solvers are timed as a whole in the "solve" phase.
+        sampling: If set, solve times are sampled adaptively, only
+            supported by acados OCP QP solvers.
+        cache_timing: If set, solves are also timed with cold and warm CPU
+            caches, only supported by acados OCP QP solvers.
+        count_events: Whether to count hardware events of the solve, only
+            supported by acados OCP QP solvers.
+
+    Returns:
+        Dictionary containing solve results (status, iterations, runtimes,
+        cost, solution error with respect to the reference solution).
+    """
+    with profile_phase(profiler, "load"):
+        reference = load_reference_solution(qp_data_path)
+        if isinstance(opts, AcadosOcpQpOptions):
+            qp = AcadosOcpQp.from_json(qp_data_path)
+    if isinstance(opts, AcadosOcpQpOptions):
+        return solve_problem(
+            qp,
+            opts,
+            print_level=print_level,
+            collect_trace=collect_trace,
+            profiler=profiler,
+            sampling=sampling,
+            cache_timing=cache_timing,
+            count_events=count_events,
+            reference=reference,
+        )
+    with profile_phase(profiler, "solve"):
+        if isinstance(opts, CasadiSolverOptions):
+            ctx = solve_casadi_problem(
+                qp_data_path, opts, print_level=print_level, reference=reference
+            )
+        else:
+            ctx = solve_external_problem(
+                qp_data_path, opts, print_level=print_level, reference=reference
+            )
+    # Loading and setup cannot be separated from solving, events are not counted
+    return complete_context(ctx)
+
+
+def _timed_solve_job(
+    opts,
+    qp_data_path: str,
+    print_level: int,
+    collect_trace: bool = False,
+    profile: bool = False,
+    sampling: Optional[SamplingOptions] = None,
+    cache_timing: Optional[CacheTiming] = None,
+    count_events: bool = False,
+) -> tuple[dict, float]:
+    """Solve a job and measure its wall time including problem loading.
+
+    With `profile`, the phase times of the job are added to the context
+    under "phases", such that they can be sent back from worker processes.
+    """
+    profiler = PhaseProfiler() if profile else None
+    start_time = perf_counter()
+    ctx = solve_job(
+        opts,
+        qp_data_path,
+        print_level=print_level,
+        collect_trace=collect_trace,
+        profiler=profiler,
+        sampling=sampling,
+        cache_timing=cache_timing,
+        count_events=count_events,
+    )
+    job_time = perf_counter() - start_time
+    if profiler is not None:
+        ctx["phases"] = profiler.to_dict()
+    return ctx, job_time
+
+
+def _measurement_config(
+    sampling: Optional[SamplingOptions],
+    cache_timing: Optional[CacheTiming],
+    count_events: bool,
+) -> dict:
+    """Settings of the measurement modes changing the solution contexts.
+
+    Used in cache keys, such that e.g. single-sample contexts are not
+    reused by sampled runs and vice versa.
+    """
+    measurement = {}
+    if sampling is not None:
+        measurement["sampling"] = vars(sampling)
+    if cache_timing is not None:
+        measurement["cache_timing"] = {
+            "nb_solves": cache_timing.nb_solves,
+            "buffer_size": cache_timing.buffer_size,
+        }
+    if count_events:
+        measurement["count_events"] = True
+    return measurement
+
+
+def _rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman rank correlation of two arrays."""
+    if len(a) < 2:
+        return np.nan
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def _solve_in_pool(
+    solve: Callable,
+    job_args: list[tuple],
+    nb_workers: int,
+    on_dispatch: Callable[[int], None],
+    on_finish: Callable[[int, dict, float], None],
+    print_level: int = 1,
+) -> None:
+    """Solve jobs in parallel worker processes, storing failures per job.
+
+    A job raising an exception is finished with `failure_context`. If a
+    worker process dies, e.g. by a segfault in a C solver, the pool breaks
+    and its unfinished jobs are solved again in a new pool of one worker,
+    which solves them in submission order: the first job breaking it is
+    the one crashing and is stored as failed, the others continue in a new
+    pool of nb_workers.
+
+    Args:
+        solve: Picklable function of the job arguments returning the
+            solution context and the job time, e.g. `_timed_solve_job`.
+        job_args: Positional arguments of each job.
+        nb_workers: Number of worker processes.
+        on_dispatch: Called with the job index when a worker starts it.
+        on_finish: Called with the job index, context and job time.
+        print_level: Verbosity level.
+    """
+    remaining = list(range(len(job_args)))
+    pool_size = nb_workers
+    while remaining:
+        broken = []
+        with ProcessPoolExecutor(max_workers=pool_size) as executor:
+            # Jobs are dispatched to idle workers in submission order
+            futures = {executor.submit(solve, *job_args[k]): k for k in remaining}
+            # Queued jobs only start when a worker becomes idle, so they are
+            # marked dispatched as earlier jobs finish
+            nb_dispatched = min(pool_size, len(remaining))
+            for k in remaining[:nb_dispatched]:
+                on_dispatch(k)
+            for future in as_completed(futures):
+                k = futures[future]
+                try:
+                    ctx, job_time = future.result()
+                except BrokenProcessPool:
+                    broken.append(k)
+                    continue
+                except Exception as e:
+                    if print_level > 0:
+                        print(f"Warning: job {k} failed in its worker: {e}")
+                    ctx, job_time = failure_context(), 0.0
+                if nb_dispatched < len(remaining):
+                    on_dispatch(remaining[nb_dispatched])
+                    nb_dispatched += 1
+                on_finish(k, ctx, job_time)
+        broken = [k for k in remaining if k in set(broken)]
+        if broken and pool_size == 1:
+            if print_level > 0:
+                print(f"Warning: job {broken[0]} crashed its worker process")
+            on_finish(broken[0], failure_context(), 0.0)
+            broken = broken[1:]
+            pool_size = nb_workers
+        elif broken:
+            pool_size = 1
+        remaining = broken
 
 
 def run(
@@ -87,7 +425,16 @@ def run(
     solver_set: SolverSet,
     results: Results,
     print_level: int = 1,
-) -> None:
+    cache: Optional[ResultCache] = None,
+    nb_workers: int = 1,
+    schedule: Optional[str] = None,
+    traces: Optional[TraceStore] = None,
+    profiler: Optional[PhaseProfiler] = None,
+    telemetry: Optional[RunTelemetry] = None,
+    sampling: Optional[SamplingOptions] = None,
+    cache_timing: Optional[CacheTiming] = None,
+    count_events: bool = False,
+) -> Optional[dict]:
     """Run a given test set and store results.
 
     Args:
@@ -95,7 +442,37 @@ def run(
         solver_set: The set of solvers to benchmark.
         results: Results object to store benchmark results.
         print_level: Verbosity level.
+        cache: If set, jobs with a valid cached result for the same QP
+            content, solver configuration and acados build are not solved
+            again, and new results are added to the cache. Runs with
+            sampling, cache timing or event counting only reuse results
+            measured with the same settings.
+        nb_workers: Number of worker processes solving jobs in parallel.
+        schedule: Job order. None solves all problems solver by solver,
+            "longest_first" dispatches jobs by decreasing predicted cost,
+            predicted from previous results in `results` or, without
+            history, from the problem size in the meta data.
+        traces: If set, per-iteration residuals of solved jobs are collected
+            and written to this sidecar store alongside the results.
+        profiler: If set, the wall time of the run is attributed to job
+            phases (load, setup, solve, ...) and harness phases (cache,
+            results update and write, ...), see `PhaseProfiler.summary`.
+        telemetry: If set, progress, throughput, failures, running jobs and
+            a size-aware ETA are streamed while jobs finish.
+        sampling: If set, solve times are sampled adaptively until their
+            confidence interval is narrow enough, see `solve_problem`.
+        cache_timing: If set, solves are also timed with cold and warm CPU
+            caches, see `CacheTiming`. Parallel workers share the last-level
+            cache, so cold timings are most meaningful with one worker.
+        count_events: Whether to count hardware events of each solve with
+            Linux perf_event, see `solve_problem`. Counts are NaN where
+            counters are unavailable.
+
+    Returns:
+        If a schedule is used, a report with predicted and actual makespan
+        of the solved jobs, otherwise None.
     """
+    run_start_time = perf_counter()
     progress_bar = None
     if print_level > 0:
         nb_problems = test_set.count_problems()
@@ -105,28 +482,191 @@ def run(
             initial=0,
         )
 
+    # Collect jobs not available in the cache, solver by solver
+    measurement = _measurement_config(sampling, cache_timing, count_events)
+    jobs = []
     for i, opts in enumerate(solver_set):
         solver_id = solver_set.solver_ids[i]
-        if progress_bar is not None:
-            progress_bar.set_description(f"Solver: {solver_id}")
+        config_hash = cache.config_hash(opts, measurement) if cache is not None else None
 
         for json_path_dict in test_set:
-            qp = AcadosOcpQp.from_json(json_path_dict["qp_data_path"])
-            if print_level > 1:
-                print(
-                    f"Solving problem {json_path_dict['qp_data_path']} "
-                    f"with solver {solver_id}"
+            if cache is not None:
+                with profile_phase(profiler, "cache"):
+                    ctx = cache.get(json_path_dict["qp_data_path"], config_hash)
+                if ctx is not None:
+                    with profile_phase(profiler, "results_update"):
+                        results.update(
+                            json_path_dict["meta_data_path"],
+                            solver_id,
+                            ctx,
+                        )
+                    if progress_bar is not None:
+                        progress_bar.update(1)
+                    continue
+            jobs.append((i, json_path_dict, config_hash))
+
+    if schedule not in (None, "longest_first"):
+        raise ValueError(f"Unknown schedule: {schedule}")
+
+    # (problem name, solver ID, problem size) of each job
+    job_descriptions = None
+    if schedule is not None or telemetry is not None:
+        job_descriptions = []
+        for i, json_path_dict, _ in jobs:
+            with open(json_path_dict["meta_data_path"], "r") as f:
+                meta_data = json.load(f)
+            job_descriptions.append(
+                (
+                    meta_data["name"].split(".")[0],
+                    solver_set.solver_ids[i],
+                    problem_size(meta_data),
                 )
-            ctx = solve_problem(qp, opts, print_level=print_level - 1)
+            )
+
+    predicted_costs = None
+    if schedule == "longest_first":
+        with profile_phase(profiler, "schedule"):
+            # Before dispatch, the results do not contain this run yet
+            predicted_unit = prediction_unit(job_descriptions, history=results.df)
+            predicted_costs = predict_job_costs(job_descriptions, history=results.df)
+            order = longest_first(predicted_costs)
+            jobs = [jobs[j] for j in order]
+            job_descriptions = [job_descriptions[j] for j in order]
+            predicted_costs = predicted_costs[order]
+
+    if telemetry is not None:
+        telemetry.start(job_descriptions, nb_workers=nb_workers)
+
+    nb_done = 0
+    write_interval = max(test_set.count_problems(), 1)
+
+    def finish_job(job: tuple, ctx: dict) -> None:
+        nonlocal nb_done
+        i, json_path_dict, config_hash = job
+        phases = ctx.pop("phases", None)
+        if profiler is not None and phases is not None:
+            profiler.merge(phases)
+        trace = ctx.pop("trace", None)
+        if traces is not None and trace is not None:
+            with open(json_path_dict["meta_data_path"], "r") as f:
+                problem_name = json.load(f)["name"].split(".")[0]
+            traces.add(
+                problem_name, solver_set.solver_ids[i], trace, ctx["runtime_fair"]
+            )
+        if cache is not None:
+            with profile_phase(profiler, "cache"):
+                cache.put(json_path_dict["qp_data_path"], config_hash, ctx)
+        with profile_phase(profiler, "results_update"):
             results.update(
                 json_path_dict["meta_data_path"],
-                solver_id,
+                solver_set.solver_ids[i],
                 ctx,
             )
-            if progress_bar is not None:
-                progress_bar.update(1)
+        if progress_bar is not None:
+            progress_bar.set_description(f"Solver: {solver_set.solver_ids[i]}")
+            progress_bar.update(1)
+        nb_done += 1
+        if nb_done % write_interval == 0:
+            write_outputs()
+
+    def write_outputs() -> None:
+        with profile_phase(profiler, "results_write"):
+            results.write()
+        if cache is not None:
+            with profile_phase(profiler, "cache"):
+                cache.commit()
+        if traces is not None:
+            with profile_phase(profiler, "traces_write"):
+                traces.write()
+
+    job_times = np.zeros(len(jobs))
+    start_time = perf_counter()
+    if nb_workers == 1:
+        for k, job in enumerate(jobs):
+            i, json_path_dict, _ = job
+            if print_level > 1:
+                print(
+                    f"Solving problem {json_path_dict['qp_data_path']} "
+                    f"with solver {solver_set.solver_ids[i]}"
+                )
+            if telemetry is not None:
+                telemetry.job_dispatched(k)
+            ctx, job_times[k] = _timed_solve_job(
+                solver_set.solvers[i],
+                json_path_dict["qp_data_path"],
+                print_level - 1,
+                traces is not None,
+                profiler is not None,
+                sampling,
+                cache_timing,
+                count_events,
+            )
+            finish_job(job, ctx)
+            if telemetry is not None:
+                telemetry.job_finished(k, ctx, job_times[k])
+    else:
+
+        def on_dispatch(k: int) -> None:
+            if telemetry is not None:
+                telemetry.job_dispatched(k)
+
+        def on_finish(k: int, ctx: dict, job_time: float) -> None:
+            job_times[k] = job_time
+            finish_job(jobs[k], ctx)
+            if telemetry is not None:
+                telemetry.job_finished(k, ctx, job_time)
+
+        _solve_in_pool(
+            _timed_solve_job,
+            [
+                (
+                    solver_set.solvers[i],
+                    json_path_dict["qp_data_path"],
+                    print_level - 1,
+                    traces is not None,
+                    profiler is not None,
+                    sampling,
+                    cache_timing,
+                    count_events,
+                )
+                for i, json_path_dict, _ in jobs
+            ],
+            nb_workers,
+            on_dispatch,
+            on_finish,
+            print_level,
+        )
+    makespan = perf_counter() - start_time
 
-        results.write()
+    write_outputs()
+    # Problems and CasADi solvers are only cached for the duration of the run
+    load_standard_form.cache_clear()
+    clear_nlp_solver_cache()
 
     if progress_bar is not None:
         progress_bar.close()
+    if profiler is not None:
+        profiler.wall_time = perf_counter() - run_start_time
+        profiler.nb_workers = nb_workers
+
+    if predicted_costs is None:
+        return None
+    report = {
+        "nb_jobs": len(jobs),
+        "nb_workers": nb_workers,
+        "predicted_makespan": simulate_makespan(predicted_costs, nb_workers),
+        # Without history, costs are predicted in units of problem size
+        "predicted_unit": predicted_unit,
+        "actual_makespan": makespan,
+        # Makespan of the actual job times under the same dispatch order
+        "simulated_makespan": simulate_makespan(job_times, nb_workers),
+        "cost_rank_correlation": _rank_correlation(predicted_costs, job_times),
+    }
+    if print_level > 0:
+        print(
+            f"Makespan of {report['nb_jobs']} jobs on {nb_workers} workers: "
+            f"predicted {report['predicted_makespan']:.3f} ({report['predicted_unit']}), "
+            f"actual {report['actual_makespan']:.3f}s "
+            f"(rank correlation of job costs: {report['cost_rank_correlation']:.2f})"
+        )
+    return report
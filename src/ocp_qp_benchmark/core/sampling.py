@@ -0,0 +1,119 @@
+"""Adaptive repetition of timed solves until the timing is precise enough."""
+
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from scipy import stats
+
+
+class SamplingOptions:
+    """Options of adaptive sampling of solve times."""
+
+    def __init__(
+        self,
+        target_rel_ci: float = 0.02,
+        time_budget: float = 1.0,
+        min_samples: int = 5,
+        max_samples: int = 1000,
+        confidence: float = 0.95,
+        outlier_threshold: float = 5.0,
+    ):
+        """Initialize sampling options.
+
+        Args:
+            target_rel_ci: Target relative width of the confidence interval
+                of the mean solve time, e.g. 0.02 for +-1%.
+            time_budget: Maximum wall time spent sampling per job, in seconds.
+            min_samples: Minimum number of samples before checking precision.
+            max_samples: Maximum number of samples.
+            confidence: Confidence level of the interval.
+            outlier_threshold: Samples above the median by more than this
+                many scaled median absolute deviations are discarded.
+        """
+        self.target_rel_ci = target_rel_ci
+        self.time_budget = time_budget
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.confidence = confidence
+        self.outlier_threshold = outlier_threshold
+
+
+def inlier_mask(samples: np.ndarray, threshold: float = 5.0) -> np.ndarray:
+    """Mask of samples that are not slow outliers.
+
+    Interruptions like preemptions only make solves slower, so only samples
+    far above the median are discarded, using the median absolute deviation
+    scaled to the standard deviation of a normal distribution.
+
+    Args:
+        samples: Timing samples.
+        threshold: Number of scaled median absolute deviations above the
+            median from which samples are outliers.
+
+    Returns:
+        Boolean mask of the samples to keep.
+    """
+    samples = np.asarray(samples, dtype=float)
+    median = np.median(samples)
+    mad = 1.4826 * np.median(np.abs(samples - median))
+    if mad == 0:
+        return np.ones(len(samples), dtype=bool)
+    return samples <= median + threshold * mad
+
+
+def relative_ci_width(samples: np.ndarray, confidence: float = 0.95) -> float:
+    """Relative width of the Student t confidence interval of the mean.
+
+    Args:
+        samples: Timing samples.
+        confidence: Confidence level of the interval.
+
+    Returns:
+        Width of the interval divided by the mean, NaN with fewer than two
+        samples.
+    """
+    samples = np.asarray(samples, dtype=float)
+    n = len(samples)
+    mean = np.mean(samples) if n > 0 else 0.0
+    if n < 2 or mean <= 0:
+        return np.nan
+    t = stats.t.ppf(0.5 + confidence / 2, df=n - 1)
+    return float(2 * t * np.std(samples, ddof=1) / np.sqrt(n) / mean)
+
+
+def sample_adaptively(
+    measure: Callable[[], tuple], options: SamplingOptions
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Repeat a measurement until its confidence interval is narrow enough.
+
+    Sampling stops when the relative confidence interval width of the first
+    measured value over the inliers is below the target, when the time
+    budget is used up or after the maximum number of samples.
+
+    Args:
+        measure: Function performing one timed run and returning a tuple of
+            timings, the first one controls the precision.
+        options: Sampling options.
+
+    Returns:
+        Tuple of all samples (one row per run), the inlier mask and the
+        achieved relative confidence interval width.
+    """
+    samples = []
+    start_time = perf_counter()
+    while len(samples) < options.max_samples:
+        samples.append(measure())
+        if perf_counter() - start_time > options.time_budget:
+            break
+        if len(samples) < options.min_samples:
+            continue
+        values = np.array([sample[0] for sample in samples])
+        mask = inlier_mask(values, options.outlier_threshold)
+        rel_ci = relative_ci_width(values[mask], options.confidence)
+        if rel_ci <= options.target_rel_ci:
+            break
+    samples = np.array(samples, dtype=float)
+    mask = inlier_mask(samples[:, 0], options.outlier_threshold)
+    rel_ci = relative_ci_width(samples[mask, 0], options.confidence)
+    return samples, mask, rel_ci
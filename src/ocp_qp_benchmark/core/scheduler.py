@@ -0,0 +1,146 @@
+"""Cost-aware job scheduling for benchmark runs."""
+
+import heapq
+from typing import Optional
+
+import numpy as np
+import pandas
+
+# Meta data keys used as problem size, in order of preference
+SIZE_KEYS = ("kkt_nnz", "n_variables", "N")
+
+
+def problem_size(meta_data: dict) -> float:
+    """Size of a problem from its meta data, used to predict solve times.
+
+    Args:
+        meta_data: Problem meta data, see `BenchSetManager.generate_meta_json`.
+
+    Returns:
+        The first available of KKT nonzeros, number of variables or horizon
+        length, 1.0 if none is available.
+    """
+    for key in SIZE_KEYS:
+        if key in meta_data:
+            return float(max(meta_data[key], 1))
+    return 1.0
+
+
+def _fit_power_law(sizes: np.ndarray, runtimes: np.ndarray) -> tuple[float, float]:
+    """Least squares fit of log(runtime) = log(c) + alpha * log(size)."""
+    log_sizes = np.log(sizes)
+    log_runtimes = np.log(runtimes)
+    if len(sizes) < 2 or np.ptp(log_sizes) == 0:
+        return float(np.mean(log_runtimes - log_sizes)), 1.0
+    alpha, log_c = np.polyfit(log_sizes, log_runtimes, 1)
+    return float(log_c), float(alpha)
+
+
+def predict_job_costs(
+    jobs: list[tuple[str, str, float]],
+    history: Optional[pandas.DataFrame] = None,
+    metric: str = "runtime_external",
+) -> np.ndarray:
+    """Predict the cost of (problem, solver) jobs.
+
+    A job is predicted by, in order of preference:
+    1. its previous result in `history`,
+    2. a power law in the problem size fitted on the solver's history,
+    3. a power law fitted on the history of all solvers,
+    4. the problem size itself (relative units).
+
+    Args:
+        jobs: List of (problem name, solver ID, problem size) tuples.
+        history: Previous results with columns problem, solver and metric.
+        metric: Result column used as job cost.
+
+    Returns:
+        Predicted cost of each job, in seconds where history is available.
+    """
+    sizes = np.array([size for _, _, size in jobs], dtype=float)
+    valid = _usable_history(jobs, history, metric)
+    if valid is None:
+        return sizes
+
+    known = valid.groupby(["problem", "solver"])[metric].median().to_dict()
+    size_of = {problem: size for problem, _, size in jobs}
+    valid_sizes = valid["problem"].map(size_of).to_numpy(dtype=float)
+
+    models = {}
+    if len(valid) > 0:
+        models[None] = _fit_power_law(valid_sizes, valid[metric].to_numpy())
+        for solver_id in valid["solver"].unique():
+            mask = (valid["solver"] == solver_id).to_numpy()
+            models[solver_id] = _fit_power_law(
+                valid_sizes[mask], valid[metric].to_numpy()[mask]
+            )
+
+    costs = np.empty(len(jobs))
+    for i, (problem, solver_id, size) in enumerate(jobs):
+        if (problem, solver_id) in known:
+            costs[i] = known[(problem, solver_id)]
+        elif solver_id in models or None in models:
+            log_c, alpha = models.get(solver_id, models.get(None))
+            costs[i] = np.exp(log_c + alpha * np.log(size))
+        else:
+            costs[i] = size
+    return costs
+
+
+def _usable_history(
+    jobs: list[tuple[str, str, float]],
+    history: Optional[pandas.DataFrame],
+    metric: str,
+) -> Optional[pandas.DataFrame]:
+    """Successful results of the problems of the jobs, None if there are none."""
+    if history is None or len(history) == 0:
+        return None
+    problems = {problem for problem, _, _ in jobs}
+    valid = history[
+        (history["status"] == 0)
+        & (history[metric] > 0)
+        & history["problem"].isin(problems)
+    ]
+    return valid if len(valid) > 0 else None
+
+
+def prediction_unit(
+    jobs: list[tuple[str, str, float]],
+    history: Optional[pandas.DataFrame] = None,
+    metric: str = "runtime_external",
+) -> str:
+    """Unit of the costs predicted by `predict_job_costs`.
+
+    Returns:
+        "s" if costs are predicted from history, "relative" if they are
+        problem sizes.
+    """
+    return "s" if _usable_history(jobs, history, metric) is not None else "relative"
+
+
+def longest_first(costs: np.ndarray) -> np.ndarray:
+    """Job order for longest-processing-time-first scheduling.
+
+    Args:
+        costs: Predicted cost of each job.
+
+    Returns:
+        Job indices sorted by decreasing cost (stable for equal costs).
+    """
+    return np.argsort(-np.asarray(costs), kind="stable")
+
+
+def simulate_makespan(costs: np.ndarray, nb_workers: int) -> float:
+    """Makespan of greedy list scheduling, each job goes to the first idle worker.
+
+    Args:
+        costs: Cost of each job, in dispatch order.
+        nb_workers: Number of parallel workers.
+
+    Returns:
+        Time at which the last job finishes.
+    """
+    finish_times = [0.0] * nb_workers
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+    return max(finish_times)
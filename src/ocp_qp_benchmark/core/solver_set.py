@@ -1,6 +1,7 @@
 """Solver settings and configuration."""
 
 import inspect
+import os
 from typing import List, Union
 
 from acados_template import AcadosOcpQpOptions
@@ -10,6 +11,14 @@ from ocp_qp_benchmark.core.supported_solvers import (
     ACADOS_CASADI_SOLVERS,
     EXTERNAL_SOLVERS,
 )
+from ocp_qp_benchmark.core.casadi_solvers import (
+    CasadiSolverOptions,
+    is_casadi_available,
+)
+from ocp_qp_benchmark.core.external_solvers import (
+    EXTERNAL_SOLVER_ADAPTERS,
+    ExternalSolverOptions,
+)
 import json
 
 class SolverSet:
@@ -65,10 +74,22 @@ class SolverSet:
             print(f"Skipping solver {name} due to missing dependencies.")
 
     def _add_acados_casadi_qp_solver(self, name: str, opts: dict):
-        raise NotImplementedError(f"Casadi solvers not implemented yet")
+        '''
+        Add a CasADi NLP solver configuration to the set.
+        '''
+        if is_casadi_available():
+            self.solvers.append(CasadiSolverOptions(name, opts))
+        else:
+            print(f"Skipping solver {name} due to missing dependencies.")
 
     def _add_external_solver(self, name: str, opts: dict):
-        raise NotImplementedError(f"External solvers not implemented yet")
+        '''
+        Add an external solver configuration to the set.
+        '''
+        if EXTERNAL_SOLVER_ADAPTERS[name].is_available():
+            self.solvers.append(ExternalSolverOptions(name, opts))
+        else:
+            print(f"Skipping solver {name} due to missing dependencies.")
 
     def check_compile(self, name: str) -> bool:
         solver_name = name.lower().split("_")[-1]
@@ -91,20 +112,17 @@ class SolverSet:
 
         if isinstance(opts, AcadosOcpQpOptions):
             # Add non-default options to the ID
-            default_opts = AcadosOcpQpOptions()
-
-            # Get all properties of the class
-            props = [name for name, value in inspect.getmembers(type(opts)) if isinstance(value, property)]
-
-            for attr in props:
-                opts_value = getattr(opts, attr)
+            for attr, value in get_options_dict(opts, non_default_only=True).items():
                 if attr == "qp_solver":
                     continue  # skip qp_solver in ID
-                default_value = getattr(default_opts, attr)
-                if opts_value != default_value:
-                    parts.append(f"{attr}={opts_value}")
+                parts.append(f"{attr}={value}")
 
             return "_".join(parts)
+        elif hasattr(opts, "settings"):
+            # External and CasADi solver options
+            for key, value in sorted(opts.settings.items()):
+                parts.append(f"{key}={value}")
+            return "_".join(parts)
         elif isinstance(opts, dict):
             raise NotImplementedError("get_solver_id for dict options not implemented yet")
 
@@ -116,6 +134,81 @@ class SolverSet:
                     ids.append(self.solver_ids[i])
         return ids
 
+    def get_configs(self) -> list[dict]:
+        """Get serializable solver configurations.
+
+        Returns:
+            List of dictionaries with solver name, solver ID and the
+            non-default options of each configuration.
+        """
+        configs = []
+        for solver_id, opts in zip(self.solver_ids, self.solvers):
+            options = get_options_dict(opts, non_default_only=True)
+            options.pop("qp_solver", None)
+            configs.append(
+                {
+                    "solver_id": solver_id,
+                    "name": opts.qp_solver,
+                    "options": options,
+                }
+            )
+        return configs
+
     def dump_configs_to_json(self, path: str):
         """Dump solver configurations to a JSON file for record-keeping."""
-        raise NotImplementedError("Dumping solver configs to JSON not implemented yet")
\ No newline at end of file
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.get_configs(), f, indent=4, default=_json_default)
+
+    @classmethod
+    def from_configs_json(cls, path: str) -> "SolverSet":
+        """Create a solver set from a JSON file written by `dump_configs_to_json`.
+
+        Args:
+            path: Path to the JSON file.
+
+        Returns:
+            Solver set with the same configurations.
+        """
+        with open(path, "r") as f:
+            configs = json.load(f)
+        return cls(
+            solver_list=[(config["name"], config["options"]) for config in configs]
+        )
+
+
+def _json_default(value):
+    """Convert numpy values in solver options to plain Python types."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def get_options_dict(opts, non_default_only: bool = False) -> dict:
+    """Get the options of a solver configuration as dictionary.
+
+    Args:
+        opts: Solver options object (`AcadosOcpQpOptions` or options of
+            an external or CasADi solver).
+        non_default_only: Only include options that differ from the
+            defaults of `AcadosOcpQpOptions`.
+
+    Returns:
+        Dictionary mapping option names to values, sorted by name.
+    """
+    if not isinstance(opts, AcadosOcpQpOptions):
+        # External and CasADi solver options: all settings are non-default
+        return {"qp_solver": opts.qp_solver, **dict(sorted(opts.settings.items()))}
+
+    default_opts = AcadosOcpQpOptions()
+
+    # Get all properties of the class
+    props = [name for name, value in inspect.getmembers(type(opts)) if isinstance(value, property)]
+
+    options = {}
+    for attr in props:
+        opts_value = getattr(opts, attr)
+        if non_default_only and opts_value == getattr(default_opts, attr):
+            continue
+        options[attr] = opts_value
+    return options
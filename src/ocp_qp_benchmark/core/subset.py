@@ -0,0 +1,232 @@
+"""Selection of small representative problem subsets for quick benchmarks."""
+
+from typing import Optional
+
+import numpy as np
+import pandas
+from scipy import stats
+
+from ocp_qp_benchmark.core.results import shifted_geometric_mean
+from ocp_qp_benchmark.core.scheduler import problem_size
+
+
+def solver_scores(
+    df: pandas.DataFrame,
+    problems: Optional[list[str]] = None,
+    metric: str = "runtime_fair",
+    failure_penalty: float = 10.0,
+) -> pandas.Series:
+    """Score of each solver on a set of problems, lower is better.
+
+    Args:
+        df: Results data frame.
+        problems: Problems to score on (default: all in df).
+        metric: Result column to score.
+        failure_penalty: Failed solves count as this factor times the
+            largest successful value of the metric.
+
+    Returns:
+        Shifted geometric mean of the metric per solver.
+    """
+    if problems is not None:
+        df = df[df["problem"].isin(problems)]
+    solved = df["status"] == 0
+    penalty = failure_penalty * df.loc[solved, metric].max() if solved.any() else 1.0
+    values = df[metric].where(solved & (df[metric] >= 0), penalty)
+    return values.groupby(df["solver"].astype(str)).apply(
+        lambda solver_values: shifted_geometric_mean(solver_values.to_numpy())
+    )
+
+
+def ranking_agreement(
+    df: pandas.DataFrame,
+    subset: list[str],
+    metric: str = "runtime_fair",
+) -> dict:
+    """How well solver rankings on a subset reproduce the full-set rankings.
+
+    Args:
+        df: Results data frame of the full set.
+        subset: Problem names of the subset.
+        metric: Result column to rank solvers on.
+
+    Returns:
+        Dictionary with the Kendall tau and Spearman correlations of the
+        solver scores, whether the best solver is the same, and the
+        number of solvers ranked.
+    """
+    full = solver_scores(df, metric=metric)
+    partial = solver_scores(df, problems=subset, metric=metric).reindex(full.index)
+    if len(full) < 2:
+        return {"kendall_tau": np.nan, "spearman": np.nan, "same_best": True, "nb_solvers": len(full)}
+    return {
+        "kendall_tau": float(stats.kendalltau(full, partial).statistic),
+        "spearman": float(stats.spearmanr(full, partial).statistic),
+        "same_best": bool(full.idxmin() == partial.idxmin()),
+        "nb_solvers": len(full),
+    }
+
+
+def split_latest_run(
+    df: pandas.DataFrame,
+) -> tuple[pandas.DataFrame, Optional[pandas.DataFrame]]:
+    """Split results into the latest run and the runs before it.
+
+    A subset selected on the earlier runs can be scored on the latest run,
+    so that its ranking agreement is not measured on the data it was
+    selected on.
+
+    Args:
+        df: Results data frame with a run column, e.g. read from a dataset
+            with all runs.
+
+    Returns:
+        Latest result of each (problem, solver) pair before the latest run,
+        and the results of the latest run. Without a run column or with a
+        single run, the results and None.
+    """
+    if "run" not in df.columns or df["run"].nunique() < 2:
+        return df, None
+    runs = df["run"].astype(str)
+    latest = runs.max()
+    earlier = df[runs != latest].sort_values(by="run", kind="stable")
+    earlier = earlier.drop_duplicates(subset=["problem", "solver"], keep="last")
+    return earlier, df[runs == latest]
+
+
+def _family_quotas(families: pandas.Series, k: int) -> dict:
+    """Number of problems per family, proportional to family sizes.
+
+    Every family gets at least one problem if k allows it, the remainder is
+    allocated by largest fractional share.
+    """
+    counts = families.value_counts().sort_index()
+    k = min(k, int(counts.sum()))
+    if k >= len(counts):
+        quotas = pandas.Series(1, index=counts.index)
+        remaining = k - len(counts)
+        shares = (counts - 1) / max((counts - 1).sum(), 1) * remaining
+    else:
+        quotas = pandas.Series(0, index=counts.index)
+        remaining = k
+        shares = counts / counts.sum() * remaining
+    floors = np.floor(shares).astype(int)
+    quotas += floors
+    leftover = remaining - int(floors.sum())
+    order = (shares - floors).sort_values(ascending=False, kind="stable").index
+    for family in order[:leftover]:
+        quotas[family] += 1
+    return {family: int(min(quota, counts[family])) for family, quota in quotas.items()}
+
+
+def select_representative(
+    problems: pandas.DataFrame,
+    k: int,
+    history: Optional[pandas.DataFrame] = None,
+    metric: str = "runtime_fair",
+) -> list[str]:
+    """Select k problems stratified by family, size and difficulty.
+
+    Within each family, problems are ordered by size and difficulty and
+    picked at evenly spaced quantiles. With history of at least two
+    solvers, problems are instead added greedily within the family quotas,
+    each time choosing the problem whose addition best reproduces the
+    full-set solver ranking (Kendall tau), ties broken by stratification.
+
+    Args:
+        problems: Data frame with columns problem, family and size, and
+            optionally difficulty.
+        k: Number of problems to select.
+        history: Previous results of the full set, see `Results.df`.
+        metric: Result column to rank solvers on.
+
+    Returns:
+        Names of the selected problems.
+    """
+    problems = problems.copy()
+    if "difficulty" not in problems:
+        problems["difficulty"] = 0.0
+    problems["stratum"] = (
+        problems["size"].rank(pct=True) + problems["difficulty"].rank(pct=True)
+    )
+    quotas = _family_quotas(problems["family"], k)
+
+    # Stratified targets: evenly spaced quantiles of each family
+    preference = {}
+    for family, family_df in problems.groupby("family"):
+        ordered = family_df.sort_values(by="stratum", kind="stable")["problem"].tolist()
+        quota = quotas[family]
+        if quota == 0:
+            continue
+        targets = set(
+            ordered[int(j)] for j in np.linspace(0, len(ordered) - 1, quota).round()
+        )
+        for position, problem in enumerate(ordered):
+            preference[problem] = 0 if problem in targets else 1 + position / len(ordered)
+
+    use_history = (
+        history is not None
+        and len(history) > 0
+        and history["solver"].nunique() >= 2
+        and history["problem"].isin(problems["problem"]).any()
+    )
+    if not use_history:
+        return sorted(problem for problem, rank in preference.items() if rank == 0)
+
+    history = history[history["problem"].isin(problems["problem"])]
+    family_of = dict(zip(problems["problem"], problems["family"]))
+    remaining_quota = dict(quotas)
+    selected = []
+    candidates = [problem for problem in preference if problem in set(history["problem"])]
+    while candidates and sum(remaining_quota.values()) > 0:
+        best = None
+        for problem in candidates:
+            if remaining_quota[family_of[problem]] == 0:
+                continue
+            tau = ranking_agreement(history, selected + [problem], metric)["kendall_tau"]
+            key = (np.nan_to_num(tau, nan=-1.0), -preference[problem])
+            if best is None or key > best[0]:
+                best = (key, problem)
+        if best is None:
+            break
+        selected.append(best[1])
+        candidates.remove(best[1])
+        remaining_quota[family_of[best[1]]] -= 1
+    return sorted(selected)
+
+
+def problem_features(
+    meta_data: list[dict],
+    families: list[str],
+    history: Optional[pandas.DataFrame] = None,
+    metric: str = "runtime_fair",
+) -> pandas.DataFrame:
+    """Features of problems used for stratification.
+
+    Args:
+        meta_data: Meta data of each problem.
+        families: Family of each problem.
+        history: Previous results, used for the difficulty: the median over
+            solvers of the log metric, failures counting as the largest value.
+        metric: Result column measuring difficulty.
+
+    Returns:
+        Data frame with columns problem, family, size and difficulty.
+    """
+    problems = pandas.DataFrame(
+        {
+            "problem": [meta["name"].split(".")[0] for meta in meta_data],
+            "family": families,
+            "size": [problem_size(meta) for meta in meta_data],
+        }
+    )
+    problems["difficulty"] = 0.0
+    if history is not None and len(history) > 0:
+        solved = (history["status"] == 0) & (history[metric] > 0)
+        worst = history.loc[solved, metric].max() if solved.any() else 1.0
+        values = np.log(history[metric].where(solved, worst))
+        difficulty = values.groupby(history["problem"].astype(str)).median()
+        problems["difficulty"] = (
+            problems["problem"].map(difficulty).fillna(difficulty.median() if len(difficulty) else 0.0)
+        )
+    return problems
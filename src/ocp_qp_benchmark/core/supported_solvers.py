@@ -12,7 +12,10 @@ AcadosQPSolver = Literal[
 AcadosCasadiSolver = Literal['IPOPT']
 
 External_solvers = Literal[
-    None # placeholder for future external solvers
+    "EXTERNAL_OSQP",
+    "EXTERNAL_CLARABEL",
+    "EXTERNAL_QPOASES",
+    "EXTERNAL_PIQP",
 ]
 
 ACADOS_OCP_QP_SOLVERS = list(get_args(AcadosQPSolver))
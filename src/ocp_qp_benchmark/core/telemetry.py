@@ -0,0 +1,237 @@
+"""Live telemetry of benchmark runs: JSON-lines stream and HTTP status endpoint."""
+
+import itertools
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import perf_counter, time
+from typing import Optional, Union
+
+import numpy as np
+
+
+class RunTelemetry:
+    """
+    Progress, throughput and ETA of a run, streamed while jobs finish.
+
+    Every finished job appends one JSON line to `file_path`, and the current
+    status can be polled as JSON from a local HTTP endpoint. The ETA weights
+    each remaining job by its problem size and the running median of the
+    time per unit size of its solver.
+
+    With parallel workers, jobs are dispatched in order to idle workers, so
+    the running jobs are taken to be the oldest unfinished dispatched jobs.
+
+    Attributes:
+        file_path: Path to the append-only JSON-lines file, or None.
+        port: Port of the HTTP status endpoint on localhost, or None.
+        window: Number of latest runtimes per solver used for medians.
+    """
+
+    def __init__(
+        self,
+        file_path: Optional[Union[str, Path]] = None,
+        port: Optional[int] = None,
+        window: int = 50,
+    ):
+        """Initialize telemetry, starting the status endpoint if a port is set.
+
+        Args:
+            file_path: Path to the append-only JSON-lines file.
+            port: Port of the HTTP status endpoint on localhost, 0 to pick
+                a free port.
+            window: Number of latest runtimes per solver used for medians.
+        """
+        self.file_path = Path(file_path) if file_path is not None else None
+        self.window = window
+        self._lock = threading.Lock()
+        self._jobs = []
+        self._nb_workers = 1
+        self._nb_done = 0
+        self._done_work = 0.0
+        # Unfinished dispatched jobs, in dispatch order
+        self._dispatch_times = {}
+        self._solver_stats = {}
+        self._start_time = None
+        self._file = None
+        if self.file_path is not None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.file_path, "a")
+
+        self._server = None
+        self.port = port
+        if port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), _status_handler(self))
+            self.port = self._server.server_address[1]
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def start(self, jobs: list[tuple[str, str, float]], nb_workers: int = 1) -> None:
+        """Start tracking a run.
+
+        Args:
+            jobs: List of (problem name, solver ID, problem size) tuples, in
+                dispatch order.
+            nb_workers: Number of parallel workers.
+        """
+        with self._lock:
+            self._jobs = list(jobs)
+            self._nb_workers = nb_workers
+            self._start_time = perf_counter()
+            for _, solver_id, size in self._jobs:
+                stats = self._solver_stats.setdefault(
+                    solver_id,
+                    {
+                        "done": 0,
+                        "failures": 0,
+                        "remaining_size": 0.0,
+                        "runtimes": deque(maxlen=self.window),
+                        "seconds_per_size": deque(maxlen=self.window),
+                    },
+                )
+                stats["remaining_size"] += size
+        self._emit({"event": "start", "jobs_total": len(jobs), "nb_workers": nb_workers})
+
+    def job_dispatched(self, k: int) -> None:
+        """Mark job k as dispatched to a worker."""
+        with self._lock:
+            self._dispatch_times[k] = perf_counter()
+
+    def job_finished(self, k: int, ctx: dict, job_time: float) -> None:
+        """Record the result of job k.
+
+        Args:
+            k: Index of the job in the list passed to `start`.
+            ctx: Solution context of the job.
+            job_time: Wall time of the job including problem loading.
+        """
+        problem, solver_id, size = self._jobs[k]
+        with self._lock:
+            self._nb_done += 1
+            self._done_work += job_time
+            self._dispatch_times.pop(k, None)
+            stats = self._solver_stats[solver_id]
+            stats["done"] += 1
+            stats["failures"] += int(ctx["status"] != 0)
+            stats["remaining_size"] -= size
+            stats["runtimes"].append(ctx["runtime_external"])
+            stats["seconds_per_size"].append(job_time / size)
+        status = self.status()
+        self._emit(
+            {
+                "event": "job",
+                "problem": problem,
+                "solver": solver_id,
+                "size": size,
+                "status": ctx["status"],
+                "iterations": ctx["iterations"],
+                "runtime_external": ctx["runtime_external"],
+                "job_time": job_time,
+                "jobs_done": status["jobs_done"],
+                "solves_per_sec": status["solves_per_sec"],
+                "eta": status["eta"],
+            }
+        )
+
+    def status(self) -> dict:
+        """Snapshot of the run status.
+
+        Returns:
+            Dictionary with jobs done and total, failures, elapsed time,
+            solves per second, ETA in seconds, per-solver done, failures and
+            running median runtime, and the running jobs.
+        """
+        with self._lock:
+            now = perf_counter()
+            elapsed = now - self._start_time if self._start_time is not None else 0.0
+            nb_done = self._nb_done
+            running = itertools.islice(self._dispatch_times.items(), self._nb_workers)
+            return {
+                "time": time(),
+                "jobs_done": nb_done,
+                "jobs_total": len(self._jobs),
+                "failures": sum(s["failures"] for s in self._solver_stats.values()),
+                "elapsed": elapsed,
+                "solves_per_sec": nb_done / elapsed if elapsed > 0 else 0.0,
+                "eta": self._eta(elapsed),
+                "solvers": {
+                    solver_id: {
+                        "done": s["done"],
+                        "failures": s["failures"],
+                        "median_runtime": (
+                            float(np.median(s["runtimes"])) if s["runtimes"] else None
+                        ),
+                    }
+                    for solver_id, s in self._solver_stats.items()
+                },
+                "running": [
+                    {
+                        "worker": w,
+                        "problem": self._jobs[k][0],
+                        "solver": self._jobs[k][1],
+                        "running_for": now - dispatch_time,
+                    }
+                    for w, (k, dispatch_time) in enumerate(running)
+                ],
+            }
+
+    def _eta(self, elapsed: float) -> Optional[float]:
+        """Remaining time, from the time per unit size of each solver so far."""
+        if self._done_work <= 0:
+            return None
+        medians = {
+            solver_id: float(np.median(s["seconds_per_size"]))
+            for solver_id, s in self._solver_stats.items()
+            if s["seconds_per_size"]
+        }
+        default = float(np.median(list(medians.values())))
+        remaining_work = sum(
+            s["remaining_size"] * medians.get(solver_id, default)
+            for solver_id, s in self._solver_stats.items()
+        )
+        # Wall time per unit of work accounts for parallelism and overhead
+        return elapsed * remaining_work / self._done_work
+
+    def _emit(self, event: dict) -> None:
+        """Append an event to the JSON-lines file."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(event, default=_json_default) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write the final status and stop the status endpoint."""
+        self._emit({"event": "end", **self.status()})
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _json_default(value):
+    """Convert numpy scalars for JSON serialization."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _status_handler(telemetry: RunTelemetry):
+    """Request handler class serving the status of a telemetry as JSON."""
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(telemetry.status(), default=_json_default).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StatusHandler
@@ -59,6 +59,19 @@ class TestSet:
                 }
                 yield path_dict
 
+    def group_by_family(self) -> Dict[str, list[str]]:
+        """Group problem folders by family, i.e. by their dataset subfolder.
+
+        Returns:
+            Dictionary mapping family names (e.g. "random_qp") to lists of
+            problem folder paths.
+        """
+        families = {}
+        for qp_folder_path in self.qp_folder_paths:
+            family = os.path.basename(os.path.dirname(os.path.normpath(qp_folder_path)))
+            families.setdefault(family, []).append(qp_folder_path)
+        return families
+
     def count_problems(self) -> int:
         """Count the number of problems in the test set."""
         return len(self.qp_folder_paths)
@@ -80,4 +93,48 @@ class TestSet:
                         break
                     else:
                         filtered_paths.append(qp_folder_path)
-        self.qp_folder_paths = filtered_paths
\ No newline at end of file
+        self.qp_folder_paths = filtered_paths
+
+    def representative(self, k: int, history=None, verbose: bool = False) -> "TestSet":
+        """Select a small representative subset of the problems.
+
+        Problems are stratified by family, problem size and, where history
+        exists, difficulty. With history of several solvers, problems are
+        chosen so that solver rankings on the subset reproduce the rankings
+        on the full set, see `core.subset.select_representative`.
+
+        Args:
+            k: Number of problems to select.
+            history: Previous results data frame of this test set, e.g.
+                `Results.df`, or None.
+            verbose: Whether to print the selected problems.
+
+        Returns:
+            New test set of at most k problems.
+        """
+        from ocp_qp_benchmark.core.subset import problem_features, select_representative
+
+        if k < 1:
+            raise ValueError(f"Number of problems must be positive, got {k}")
+        folders = [path for path in self.qp_folder_paths if os.path.isdir(path)]
+        families = {
+            path: family
+            for family, paths in self.group_by_family().items()
+            for path in paths
+        }
+        problems = problem_features(
+            [load_meta_data(path) for path in folders],
+            [families[path] for path in folders],
+            history,
+        )
+        selected = set(select_representative(problems, k, history))
+        subset = TestSet(
+            [
+                path
+                for path, problem in zip(folders, problems["problem"])
+                if problem in selected
+            ],
+            verbose=verbose,
+        )
+        subset.description = f"{k} representative problems of {len(folders)}"
+        return subset
@@ -0,0 +1,131 @@
+"""Thread-count scaling of solvers and their linear algebra backends."""
+
+from typing import Optional
+
+import pandas
+
+from ocp_qp_benchmark.core.builds import run_in_environments
+from ocp_qp_benchmark.core.results import Results, shifted_geometric_mean
+from ocp_qp_benchmark.core.sampling import SamplingOptions
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.core.test_set import TestSet
+
+# Environment variables controlling OpenMP and BLAS threading
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def thread_env(nb_threads: int) -> dict:
+    """Environment variables limiting OpenMP and BLAS to a number of threads."""
+    return {name: str(nb_threads) for name in THREAD_ENV_VARS}
+
+
+def threads_tag(nb_threads: int) -> str:
+    """Environment name of a thread count, used in solver IDs, e.g. "threads=4"."""
+    return f"threads={nb_threads}"
+
+
+def run_thread_scaling(
+    test_set: TestSet,
+    solver_set: SolverSet,
+    results: Results,
+    thread_counts: list[int] = (1, 2, 4),
+    print_level: int = 1,
+    sampling: Optional[SamplingOptions] = None,
+) -> None:
+    """Run every job under several thread counts.
+
+    Each thread count has its own isolated worker process, started with
+    OpenMP and BLAS threading limited by `thread_env`, and jobs are
+    interleaved across thread counts, see `run_in_environments`. Results
+    are stored with solver IDs like "PARTIAL_CONDENSING_HPIPM@threads=4"
+    and the thread count in the threads column.
+
+    Args:
+        test_set: The test set containing problems to benchmark.
+        solver_set: The set of solvers to benchmark.
+        results: Results object to store benchmark results.
+        thread_counts: Thread counts to run every job with.
+        print_level: Verbosity level.
+        sampling: If set, solve times are sampled adaptively, see
+            `runner.solve_problem`.
+    """
+    run_in_environments(
+        test_set,
+        solver_set,
+        results,
+        environments={threads_tag(n): thread_env(n) for n in thread_counts},
+        tags={threads_tag(n): {"threads": n} for n in thread_counts},
+        print_level=print_level,
+        sampling=sampling,
+    )
+
+
+def thread_scaling_summary(
+    df: pandas.DataFrame,
+    problem_sizes: Optional[dict] = None,
+    metric: str = "runtime_external",
+    nb_size_classes: int = 2,
+) -> pandas.DataFrame:
+    """Speedup and efficiency against the thread count.
+
+    Speedups are computed per problem relative to the smallest thread count
+    on problems solved under all thread counts, and aggregated with the
+    shifted geometric mean per solver and problem size class.
+
+    Args:
+        df: Results of `run_thread_scaling`, with a threads column.
+        problem_sizes: Optional dictionary mapping problem names to sizes,
+            see `scheduler.problem_size`, to split problems into classes.
+        metric: Runtime column to compute speedups from.
+        nb_size_classes: Number of problem size classes (quantiles).
+
+    Returns:
+        Data frame with columns solver (without thread tag), size_class,
+        threads, speedup, efficiency and nb_problems.
+    """
+    df = df[df["threads"] > 0].copy()
+    df["base_solver"] = df["solver"].astype(str).str.rsplit("@", n=1).str[0]
+    df["size_class"] = 0
+    if problem_sizes is not None and nb_size_classes > 1:
+        sizes = df["problem"].astype(str).map(problem_sizes).astype(float)
+        df["size_class"] = pandas.qcut(
+            sizes.rank(method="first"), nb_size_classes, labels=False
+        )
+
+    rows = []
+    for (solver_id, size_class), group in df.groupby(["base_solver", "size_class"]):
+        runtimes = group.pivot_table(
+            index="problem", columns="threads", values=metric, aggfunc="min", observed=True
+        )
+        statuses = group.pivot_table(
+            index="problem", columns="threads", values="status", aggfunc="max", observed=True
+        )
+        solved = runtimes[(statuses == 0).all(axis=1)].dropna()
+        if len(solved) == 0:
+            continue
+        base_threads = min(solved.columns)
+        for threads in solved.columns:
+            speedup = shifted_geometric_mean(
+                solved[base_threads] / solved[threads], shift=0.0
+            )
+            rows.append(
+                {
+                    "solver": solver_id,
+                    "size_class": int(size_class),
+                    "threads": int(threads),
+                    "speedup": speedup,
+                    "efficiency": speedup * base_threads / threads,
+                    "nb_problems": len(solved),
+                }
+            )
+    return pandas.DataFrame(
+        rows,
+        columns=["solver", "size_class", "threads", "speedup", "efficiency", "nb_problems"],
+    )
@@ -0,0 +1,273 @@
+"""Concurrent throughput benchmark under multi-worker load."""
+
+import multiprocessing
+import os
+import queue
+import threading
+from copy import deepcopy
+from time import perf_counter
+from typing import Callable, Optional
+
+import numpy as np
+import pandas
+
+from acados_template import AcadosOcpQp, AcadosOcpQpSolver, AcadosOcpQpOptions
+
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.core.test_set import TestSet
+
+
+def _throughput_worker(
+    worker_index: int,
+    qp_data_paths: list[str],
+    opts: AcadosOcpQpOptions,
+    duration: float,
+    barrier,
+    result_queue,
+) -> None:
+    """Repeatedly solve the given problems with solvers owned by this worker.
+
+    Solvers are created before the start barrier, so only solves are timed.
+    Problems are cycled starting at an offset depending on the worker index,
+    such that workers do not solve the same problem at the same time.
+
+    If the setup fails, the barrier is aborted such that the other workers
+    stop, and a record with the error is sent instead of the results.
+    """
+    try:
+        solver_opts = deepcopy(opts)
+        solver_opts.print_level = 0
+        qp_solvers = [
+            AcadosOcpQpSolver(AcadosOcpQp.from_json(path), solver_opts)
+            for path in qp_data_paths
+        ]
+    except Exception as e:
+        barrier.abort()
+        result_queue.put({"worker": worker_index, "error": f"{type(e).__name__}: {e}"})
+        return
+    latencies = []
+    nb_failed = 0
+
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        # Another worker failed, the measurement is cancelled
+        result_queue.put({"worker": worker_index, "aborted": True})
+        return
+    start_time = perf_counter()
+    k = worker_index
+    while perf_counter() - start_time < duration:
+        qp_solver = qp_solvers[k % len(qp_solvers)]
+        solve_start = perf_counter()
+        status = qp_solver.solve()
+        latencies.append(perf_counter() - solve_start)
+        nb_failed += int(status != 0)
+        k += 1
+    elapsed = perf_counter() - start_time
+
+    result_queue.put(
+        {
+            "worker": worker_index,
+            "latencies": np.array(latencies),
+            "elapsed": elapsed,
+            "nb_failed": nb_failed,
+        }
+    )
+
+
+def _collect_results(workers: list, barrier, result_queue, timeout: float) -> dict:
+    """Wait for one record per worker, also for workers that died.
+
+    Workers that exited without sending a record, e.g. after a crash in the
+    solver, get an error record and the barrier is aborted.
+
+    Returns:
+        Dictionary mapping worker indices to their records.
+    """
+    worker_results = {}
+    while len(worker_results) < len(workers):
+        try:
+            result = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            dead = [
+                i
+                for i, worker in enumerate(workers)
+                if i not in worker_results and not worker.is_alive()
+            ]
+            # Records sent right before exiting are already in the queue
+            while True:
+                try:
+                    result = result_queue.get_nowait()
+                except queue.Empty:
+                    break
+                worker_results[result["worker"]] = result
+            for i in dead:
+                if i not in worker_results:
+                    error = "exited without result"
+                    exitcode = getattr(workers[i], "exitcode", None)
+                    if exitcode is not None:
+                        error += f" (exit code {exitcode})"
+                    worker_results[i] = {"worker": i, "error": error}
+                    barrier.abort()
+            continue
+        worker_results[result["worker"]] = result
+        if "error" in result:
+            barrier.abort()
+    return worker_results
+
+
+def measure_throughput(
+    qp_data_paths: list[str],
+    opts: AcadosOcpQpOptions,
+    nb_workers: int,
+    duration: float = 5.0,
+    backend: str = "process",
+    timeout: float = 1.0,
+    worker: Callable = _throughput_worker,
+) -> list[dict]:
+    """Run concurrent workers solving the same set of problems.
+
+    Args:
+        qp_data_paths: Paths to QP JSON files solved by every worker.
+        opts: Solver options, each worker creates its own solvers.
+        nb_workers: Number of concurrent workers.
+        duration: Duration of the timed phase in seconds.
+        backend: "process" for worker processes, "thread" for threads.
+        timeout: Interval in seconds at which workers are checked for
+            having died while waiting for their results.
+        worker: Worker function, with the signature of `_throughput_worker`.
+
+    Returns:
+        List with one dictionary per worker containing its latencies,
+        elapsed time and number of failed solves.
+
+    Raises:
+        RuntimeError: If a worker failed to set up its solvers or died.
+    """
+    if backend == "process":
+        mp_context = multiprocessing.get_context()
+        barrier = mp_context.Barrier(nb_workers)
+        result_queue = mp_context.Queue()
+        worker_class = mp_context.Process
+    elif backend == "thread":
+        barrier = threading.Barrier(nb_workers)
+        result_queue = queue.Queue()
+        worker_class = threading.Thread
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    workers = [
+        worker_class(
+            target=worker,
+            args=(i, qp_data_paths, opts, duration, barrier, result_queue),
+        )
+        for i in range(nb_workers)
+    ]
+    for worker_process in workers:
+        worker_process.start()
+    # Collect before joining, processes block until their queue is drained
+    worker_results = _collect_results(workers, barrier, result_queue, timeout)
+    for worker_process in workers:
+        worker_process.join()
+    errors = [
+        f"worker {i}: {result['error']}"
+        for i, result in sorted(worker_results.items())
+        if "error" in result
+    ]
+    if errors:
+        raise RuntimeError("Throughput measurement failed, " + "; ".join(errors))
+    return [worker_results[i] for i in range(nb_workers)]
+
+
+def default_worker_counts() -> list[int]:
+    """Powers of two up to the number of cores, and the number of cores."""
+    nb_cores = os.cpu_count() or 1
+    counts = [2**i for i in range(nb_cores.bit_length()) if 2**i < nb_cores]
+    return counts + [nb_cores]
+
+
+def run_throughput(
+    test_set: TestSet,
+    solver_set: SolverSet,
+    worker_counts: Optional[list[int]] = None,
+    duration: float = 5.0,
+    backend: str = "process",
+    print_level: int = 1,
+) -> pandas.DataFrame:
+    """Measure aggregate throughput of each solver as the worker count grows.
+
+    Args:
+        test_set: Problems solved in a loop by every worker.
+        solver_set: The set of solvers to benchmark.
+        worker_counts: Numbers of concurrent workers (default: powers of two
+            up to the number of cores).
+        duration: Duration of the timed phase per measurement in seconds.
+        backend: "process" for worker processes, "thread" for threads.
+        print_level: Verbosity level.
+
+    Returns:
+        Data frame with one row per (solver, number of workers) containing
+        aggregate solves/sec, per-worker throughput spread and latency
+        percentiles over all workers.
+    """
+    if worker_counts is None:
+        worker_counts = default_worker_counts()
+    qp_data_paths = [path_dict["qp_data_path"] for path_dict in test_set]
+
+    rows = []
+    for i, opts in enumerate(solver_set):
+        solver_id = solver_set.solver_ids[i]
+        for nb_workers in worker_counts:
+            if print_level > 0:
+                print(f"Throughput of {solver_id} with {nb_workers} workers...")
+            worker_results = measure_throughput(
+                qp_data_paths, opts, nb_workers, duration, backend
+            )
+            rows.append(
+                {
+                    "solver": solver_id,
+                    "workers": nb_workers,
+                    **summarize_workers(worker_results),
+                }
+            )
+    return add_scaling(pandas.DataFrame(rows))
+
+
+def summarize_workers(worker_results: list[dict]) -> dict:
+    """Aggregate throughput and latency percentiles of concurrent workers.
+
+    Args:
+        worker_results: Records returned by `measure_throughput`.
+
+    Returns:
+        Dictionary with the number of solves, the aggregate solves/sec (sum
+        of the worker rates), the spread of the worker rates, latency
+        percentiles over all workers and the number of failed solves.
+    """
+    latencies = np.concatenate([r["latencies"] for r in worker_results])
+    worker_rates = np.array([len(r["latencies"]) / r["elapsed"] for r in worker_results])
+    return {
+        "solves": len(latencies),
+        "solves_per_sec": float(np.sum(worker_rates)),
+        "worker_solves_per_sec_min": float(np.min(worker_rates)),
+        "worker_solves_per_sec_max": float(np.max(worker_rates)),
+        "latency_median": float(np.median(latencies)),
+        "latency_p99": float(np.percentile(latencies, 99)),
+        "nb_failed": sum(r["nb_failed"] for r in worker_results),
+    }
+
+
+def add_scaling(df: pandas.DataFrame) -> pandas.DataFrame:
+    """Add speedup and efficiency relative to one worker per solver.
+
+    Args:
+        df: Data frame with columns solver, workers and solves_per_sec.
+
+    Returns:
+        The data frame with the speedup and efficiency columns, NaN for
+        solvers not measured with a single worker.
+    """
+    single = df[df["workers"] == 1].set_index("solver")["solves_per_sec"]
+    df["speedup"] = df["solves_per_sec"] / df["solver"].map(single)
+    df["efficiency"] = df["speedup"] / df["workers"]
+    return df
@@ -0,0 +1,250 @@
+"""Tolerance sweeps: runtime against achieved accuracy per solver family."""
+
+from typing import Optional
+
+import numpy as np
+import pandas
+
+from ocp_qp_benchmark.core.accuracy import REFERENCE_ACCURACY
+from ocp_qp_benchmark.core.results import Results
+from ocp_qp_benchmark.core.runner import run
+from ocp_qp_benchmark.core.solver_set import SolverSet, get_options_dict
+from ocp_qp_benchmark.core.subset import solver_scores
+from ocp_qp_benchmark.core.supported_solvers import ACADOS_OCP_QP_SOLVERS
+from ocp_qp_benchmark.core.test_set import TestSet
+
+# Default ladder of solver tolerances, from loose to tight
+TOLERANCES = (1e-2, 1e-4, 1e-6, 1e-8)
+
+# Termination tolerances of each solver family, all set to the same value.
+# The first option is read back to identify the rung of a configuration.
+TOLERANCE_OPTIONS = {
+    **{name: ("tol_stat", "tol_eq", "tol_ineq", "tol_comp") for name in ACADOS_OCP_QP_SOLVERS},
+    "IPOPT": ("ipopt.tol",),
+    "EXTERNAL_OSQP": ("eps_abs", "eps_rel"),
+    "EXTERNAL_CLARABEL": ("tol_gap_abs", "tol_gap_rel", "tol_feas"),
+    "EXTERNAL_PIQP": ("eps_abs", "eps_rel"),
+}
+
+
+def tolerance_options(name: str, tolerance: float) -> dict:
+    """Solver options setting all termination tolerances of a solver.
+
+    Args:
+        name: Solver name, e.g. "PARTIAL_CONDENSING_HPIPM".
+        tolerance: Value of the tolerances.
+
+    Returns:
+        Options dictionary for `SolverSet`.
+
+    Raises:
+        ValueError: If the tolerances of the solver cannot be set.
+    """
+    if name not in TOLERANCE_OPTIONS:
+        raise ValueError(f"Tolerances of solver {name} cannot be set")
+    return {option: tolerance for option in TOLERANCE_OPTIONS[name]}
+
+
+def tolerance_solver_set(
+    solver_names: list[str], tolerances: list[float] = TOLERANCES
+) -> SolverSet:
+    """Solver set with one configuration per solver and tolerance.
+
+    Solvers whose tolerances cannot be set, e.g. the active-set solver
+    EXTERNAL_QPOASES, are added once with their default options.
+
+    Args:
+        solver_names: Names of the solver families to sweep.
+        tolerances: Ladder of tolerances.
+
+    Returns:
+        Solver set of the sweep, see `tolerance_ladder`.
+    """
+    solver_list = []
+    for name in dict.fromkeys(solver_names):
+        if name not in TOLERANCE_OPTIONS:
+            print(f"Warning: tolerances of solver {name} cannot be set, using its defaults")
+            solver_list.append((name, {}))
+            continue
+        for tolerance in tolerances:
+            solver_list.append((name, tolerance_options(name, tolerance)))
+    return SolverSet(solver_list=solver_list)
+
+
+def tolerance_ladder(solver_set: SolverSet) -> pandas.DataFrame:
+    """Solver family and tolerance of each configuration of a solver set.
+
+    Args:
+        solver_set: Solver set, e.g. from `tolerance_solver_set`.
+
+    Returns:
+        Data frame with columns solver_id, solver and tolerance, NaN for
+        configurations with default tolerances.
+    """
+    rows = []
+    for solver_id, opts in zip(solver_set.solver_ids, solver_set.solvers):
+        options = get_options_dict(opts)
+        tolerance = np.nan
+        if opts.qp_solver in TOLERANCE_OPTIONS:
+            tolerance = float(options.get(TOLERANCE_OPTIONS[opts.qp_solver][0], np.nan))
+        rows.append({"solver_id": solver_id, "solver": opts.qp_solver, "tolerance": tolerance})
+    return pandas.DataFrame(rows, columns=["solver_id", "solver", "tolerance"])
+
+
+def run_tolerance_sweep(
+    test_set: TestSet,
+    solver_names: list[str],
+    results: Results,
+    tolerances: list[float] = TOLERANCES,
+    **kwargs,
+) -> pandas.DataFrame:
+    """Run every solver family at a ladder of tolerances.
+
+    The accuracy achieved by each solve is stored in the solution_error
+    column, measured against the reference solution of the problem.
+
+    Args:
+        test_set: The test set containing problems to benchmark.
+        solver_names: Names of the solver families to sweep.
+        results: Results object to store benchmark results.
+        tolerances: Ladder of tolerances.
+        **kwargs: Keyword arguments of `run`, e.g. nb_workers or cache.
+
+    Returns:
+        Ladder of the swept configurations, see `tolerance_ladder`.
+    """
+    solver_set = tolerance_solver_set(solver_names, tolerances)
+    run(test_set, solver_set, results, **kwargs)
+    return tolerance_ladder(solver_set)
+
+
+def _pareto_mask(errors: np.ndarray, runtimes: np.ndarray) -> np.ndarray:
+    """Points not dominated by a point at least as accurate and faster."""
+    mask = np.zeros(len(errors), dtype=bool)
+    best_runtime = np.inf
+    for i in np.lexsort((runtimes, errors)):
+        if np.isfinite(errors[i]) and runtimes[i] < best_runtime:
+            mask[i] = True
+            best_runtime = runtimes[i]
+    return mask
+
+
+def tolerance_sweep_summary(
+    df: pandas.DataFrame,
+    ladder: pandas.DataFrame,
+    metric: str = "runtime_fair",
+    quantile: float = 0.9,
+    failure_penalty: float = 10.0,
+) -> pandas.DataFrame:
+    """Runtime and achieved accuracy of each rung of a tolerance sweep.
+
+    The runtime of a rung is the shifted geometric mean of the metric over
+    all problems, failures counting as `failure_penalty` times the largest
+    runtime of the sweep. Its accuracy is the given quantile of the
+    solution error over problems with a reference solution, failures
+    counting as infinite error: the rung reaches this accuracy on at least
+    this fraction of problems.
+
+    Args:
+        df: Results data frame with the solution_error column.
+        ladder: Swept configurations, see `tolerance_ladder`.
+        metric: Runtime column.
+        quantile: Fraction of problems the accuracy is reached on.
+        failure_penalty: Penalty factor of failed solves on the runtime.
+
+    Returns:
+        Data frame with columns solver, solver_id, tolerance, runtime,
+        error, success_rate, nb_problems and pareto, the latter marking
+        rungs on the runtime vs accuracy Pareto frontier of their solver.
+    """
+    df = df[df["solver"].astype(str).isin(ladder["solver_id"])]
+    runtimes = solver_scores(df, metric=metric, failure_penalty=failure_penalty)
+    rows = []
+    for rung in ladder.itertuples(index=False):
+        rung_df = df[df["solver"].astype(str) == rung.solver_id]
+        if len(rung_df) == 0:
+            continue
+        solved = rung_df["status"] == 0
+        errors = rung_df["solution_error"].where(solved, np.inf)
+        errors = errors[rung_df["solution_error"].notna() | ~solved].to_numpy(dtype=float)
+        error = np.quantile(errors, quantile, method="higher") if len(errors) else np.nan
+        rows.append(
+            {
+                "solver": rung.solver,
+                "solver_id": rung.solver_id,
+                "tolerance": rung.tolerance,
+                "runtime": runtimes[rung.solver_id],
+                "error": error,
+                "success_rate": solved.mean(),
+                "nb_problems": len(rung_df),
+            }
+        )
+    columns = [
+        "solver",
+        "solver_id",
+        "tolerance",
+        "runtime",
+        "error",
+        "success_rate",
+        "nb_problems",
+        "pareto",
+    ]
+    summary = pandas.DataFrame(rows, columns=columns[:-1])
+    summary["pareto"] = False
+    for _, family in summary.groupby("solver", sort=False):
+        summary.loc[family.index, "pareto"] = _pareto_mask(
+            family["error"].to_numpy(dtype=float), family["runtime"].to_numpy(dtype=float)
+        )
+    return summary[columns]
+
+
+def fastest_at_accuracy(
+    summary: pandas.DataFrame,
+    targets: Optional[list[float]] = None,
+    reference_accuracy: float = REFERENCE_ACCURACY,
+) -> pandas.DataFrame:
+    """Fastest solver reaching each target accuracy.
+
+    Solution errors are measured against reference solutions of limited
+    accuracy, so targets below it are flagged as not resolved: any solver
+    reaching them only agrees with the reference up to its own error.
+
+    Args:
+        summary: Data frame returned by `tolerance_sweep_summary`.
+        targets: Target accuracies (default: the swept tolerances).
+        reference_accuracy: Accuracy of the reference solutions.
+
+    Returns:
+        Data frame indexed by target accuracy with the runtime of the
+        fastest rung of each solver reaching it (NaN if none does), the
+        fastest solver (None if none) and its tolerance in the columns
+        fastest and tolerance, and whether the target is resolved by the
+        reference solutions in the column resolved.
+    """
+    if targets is None:
+        targets = summary["tolerance"].dropna().unique()
+    targets = sorted(targets, reverse=True)
+    solvers = list(summary["solver"].unique())
+    rows = []
+    for target in targets:
+        reached = summary[summary["error"] <= target]
+        best = reached.loc[reached.groupby("solver")["runtime"].idxmin()]
+        row = {"target": target}
+        row.update({solver: np.nan for solver in solvers})
+        row.update(dict(zip(best["solver"], best["runtime"])))
+        row["fastest"] = None
+        row["tolerance"] = np.nan
+        if len(best) > 0:
+            fastest = best.loc[best["runtime"].idxmin()]
+            row["fastest"] = fastest["solver"]
+            row["tolerance"] = fastest["tolerance"]
+        row["resolved"] = target >= reference_accuracy
+        rows.append(row)
+    table = pandas.DataFrame(
+        rows, columns=["target", *solvers, "fastest", "tolerance", "resolved"]
+    ).set_index("target")
+    # Keep None for targets no solver reaches, string columns would turn it into NaN
+    table["fastest"] = pandas.Series(
+        [row["fastest"] for row in rows], index=table.index, dtype=object
+    )
+    return table
@@ -0,0 +1,103 @@
+"""Per-iteration convergence traces stored in a compact sidecar file."""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+# Residuals recorded per iteration, in column order
+TRACE_COLUMNS = ("res_stat", "res_eq", "res_ineq", "res_comp")
+
+
+class TraceStore:
+    """
+    Ragged per-iteration residual traces of (problem, solver) jobs.
+
+    All traces are concatenated into a single float32 array, with offsets
+    delimiting the rows of each job, and saved as one .npz file next to the
+    results table.
+
+    Attributes:
+        file_path: Path to the .npz sidecar file.
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        """Initialize the store, loading existing traces from file.
+
+        Args:
+            file_path: Path to the .npz sidecar file.
+        """
+        self.file_path = Path(file_path)
+        self._traces = {}
+        self._runtimes = {}
+        if self.file_path.exists():
+            with np.load(self.file_path) as data:
+                offsets = data["offsets"]
+                for j, key in enumerate(zip(data["problems"], data["solvers"])):
+                    key = (str(key[0]), str(key[1]))
+                    self._traces[key] = data["data"][offsets[j] : offsets[j + 1]]
+                    self._runtimes[key] = float(data["runtimes"][j])
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def add(
+        self, problem: str, solver_id: str, trace: np.ndarray, runtime: float
+    ) -> None:
+        """Add or replace the trace of a job.
+
+        Args:
+            problem: Problem name.
+            solver_id: Solver identifier string.
+            trace: Array with one row per iteration and TRACE_COLUMNS columns.
+            runtime: Solve time of the job, used for the time axis.
+        """
+        self._traces[(problem, solver_id)] = np.asarray(trace, dtype=np.float32)
+        self._runtimes[(problem, solver_id)] = runtime
+
+    def get(self, problem: str, solver_id: str) -> Optional[np.ndarray]:
+        """Get the trace of a job, None if there is none."""
+        return self._traces.get((problem, solver_id))
+
+    def get_runtime(self, problem: str, solver_id: str) -> Optional[float]:
+        """Get the solve time recorded with the trace of a job."""
+        return self._runtimes.get((problem, solver_id))
+
+    def problems(self) -> list[str]:
+        """Problems with at least one trace."""
+        return sorted({problem for problem, _ in self._traces})
+
+    def solvers(self, problem: str) -> list[str]:
+        """Solvers with a trace on a given problem."""
+        return sorted(solver for p, solver in self._traces if p == problem)
+
+    def write(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Write all traces to the sidecar file.
+
+        Args:
+            path: Optional path to a separate file to write to.
+        """
+        keys = sorted(self._traces)
+        lengths = [len(self._traces[key]) for key in keys]
+        data = (
+            np.concatenate([self._traces[key] for key in keys])
+            if keys
+            else np.zeros((0, len(TRACE_COLUMNS)), dtype=np.float32)
+        )
+        save_path = Path(path or self.file_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            save_path,
+            problems=np.array([problem for problem, _ in keys], dtype=str),
+            solvers=np.array([solver for _, solver in keys], dtype=str),
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            runtimes=np.array([self._runtimes[key] for key in keys]),
+            data=data,
+            columns=np.array(TRACE_COLUMNS),
+        )
+
+
+def trace_path_for_results(results_path: Union[str, Path]) -> Path:
+    """Sidecar trace file of a results file, e.g. results.csv -> results_traces.npz."""
+    results_path = Path(results_path)
+    return results_path.with_name(f"{results_path.stem}_traces.npz")
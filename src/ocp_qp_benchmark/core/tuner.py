@@ -0,0 +1,252 @@
+"""Automatic solver-option tuning with successive halving."""
+
+import itertools
+import math
+import os
+from typing import Any, Optional
+
+import numpy as np
+import pandas
+
+from acados_template import AcadosOcpQp, AcadosOcpQpOptions
+
+from ocp_qp_benchmark.core.results import shifted_geometric_mean
+from ocp_qp_benchmark.core.runner import solve_problem
+from ocp_qp_benchmark.core.solver_set import SolverSet
+from ocp_qp_benchmark.core.test_set import TestSet
+
+
+def expand_search_space(search_space: dict[str, list[Any]]) -> list[dict]:
+    """Expand a search space into the list of all option combinations.
+
+    Args:
+        search_space: Maps `AcadosOcpQpOptions` fields to candidate values,
+            e.g. {"cond_N": [2, 5, 10], "hpipm_mode": ["SPEED", "ROBUST"]}.
+
+    Returns:
+        List of option dictionaries, one per combination.
+    """
+    keys = sorted(search_space)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(search_space[key] for key in keys))
+    ]
+
+
+class _Evaluator:
+    """Solve (configuration, problem) pairs once and remember the scores."""
+
+    def __init__(
+        self,
+        solver_set: SolverSet,
+        metric: str,
+        failure_penalty: float,
+        print_level: int,
+    ):
+        self.solver_set = solver_set
+        self.metric = metric
+        self.failure_penalty = failure_penalty
+        self.print_level = print_level
+        self.qps = {}
+        self.contexts = {}
+
+    def _get_qp(self, qp_folder_path: str) -> AcadosOcpQp:
+        if qp_folder_path not in self.qps:
+            qp_folder_name = os.path.basename(qp_folder_path)
+            self.qps[qp_folder_path] = AcadosOcpQp.from_json(
+                os.path.join(qp_folder_path, f"{qp_folder_name}.json")
+            )
+        return self.qps[qp_folder_path]
+
+    def context(self, config_index: int, qp_folder_path: str) -> dict:
+        key = (config_index, qp_folder_path)
+        if key not in self.contexts:
+            self.contexts[key] = solve_problem(
+                self._get_qp(qp_folder_path),
+                self.solver_set.solvers[config_index],
+                print_level=self.print_level - 1,
+            )
+        return self.contexts[key]
+
+    def scores(self, config_indices: list[int], qp_folder_paths: list[str]) -> dict:
+        """Shifted geometric mean of the metric per configuration.
+
+        All configurations are solved on all problems before scoring, so
+        that scores do not depend on the evaluation order. Failed solves
+        count as `failure_penalty` times the largest successful value on
+        the same problem among these configurations or, if none succeeded
+        on it, the largest successful value on any of the problems, as in
+        `subset.solver_scores`.
+
+        Args:
+            config_indices: Indices of the configurations to score.
+            qp_folder_paths: Problems to score on.
+
+        Returns:
+            Dictionary mapping configuration indices to scores.
+        """
+        contexts = [
+            [self.context(i, qp_folder_path) for qp_folder_path in qp_folder_paths]
+            for i in config_indices
+        ]
+        values = np.array([[c[self.metric] for c in row] for row in contexts], dtype=float)
+        statuses = np.array([[c["status"] for c in row] for row in contexts])
+        solved = (statuses == 0) & (values >= 0)
+        successful = np.where(solved, values, -np.inf)
+        worst = successful.max(axis=0)
+        # Without any successful solve, all configurations score the same
+        fallback = successful.max() if solved.any() else 1.0
+        worst = np.where(np.isfinite(worst), worst, fallback)
+        values = np.where(solved, values, self.failure_penalty * worst)
+        return {
+            i: shifted_geometric_mean(values[row])
+            for row, i in enumerate(config_indices)
+        }
+
+
+def successive_halving(
+    solver_name: str,
+    configs: list[dict],
+    qp_folder_paths: list[str],
+    eta: int = 3,
+    min_problems: int = 4,
+    metric: str = "runtime_fair",
+    failure_penalty: float = 10.0,
+    seed: Optional[int] = None,
+    print_level: int = 1,
+) -> dict:
+    """Find the fastest configuration of a solver on a set of problems.
+
+    All configurations start on a small random subset of problems. After
+    each round only the best 1/eta configurations are kept and the subset
+    grows by a factor eta, until a single configuration is left or all
+    problems are used. The default configuration is scored in every round
+    as baseline, with the same failure penalties as the candidates. Solves
+    are never repeated across rounds.
+
+    Args:
+        solver_name: Name of the acados OCP QP solver.
+        configs: Candidate option dictionaries.
+        qp_folder_paths: Problem folders to tune on.
+        eta: Reduction factor per round.
+        min_problems: Number of problems in the first round.
+        metric: Result column to minimize.
+        failure_penalty: Factor applied to the worst runtime for failures.
+        seed: Random seed for the problem order.
+        print_level: Verbosity level.
+
+    Returns:
+        Dictionary with the best configuration, its solver ID and score,
+        the score of the default configuration on the same problems and
+        the resulting speedup.
+    """
+    if len(qp_folder_paths) == 0:
+        raise ValueError("No problems to tune on")
+
+    # The default configuration is evaluated alongside as baseline
+    candidate_configs = [{}] + [config for config in configs if config != {}]
+    solver_set = SolverSet(
+        solver_list=[(solver_name, config) for config in candidate_configs]
+    )
+    if len(solver_set) != len(candidate_configs):
+        raise ValueError(f"Solver {solver_name} is not available")
+    evaluator = _Evaluator(solver_set, metric, failure_penalty, print_level)
+
+    rng = np.random.default_rng(seed)
+    problems = list(rng.permutation(qp_folder_paths))
+    nb_problems = min(min_problems, len(problems))
+    alive = list(range(len(candidate_configs)))
+    nb_rounds = 0
+
+    while True:
+        nb_rounds += 1
+        subset = problems[:nb_problems]
+        # The baseline is scored with the same penalties as the candidates
+        scores = evaluator.scores(sorted({0, *alive}), subset)
+        if print_level > 0:
+            print(
+                f"Round {nb_rounds}: {len(alive)} configurations "
+                f"on {nb_problems} problems"
+            )
+        if len(alive) == 1 or nb_problems == len(problems):
+            break
+        nb_keep = max(1, math.ceil(len(alive) / eta))
+        alive = sorted(alive, key=lambda i: scores[i])[:nb_keep]
+        nb_problems = min(nb_problems * eta, len(problems))
+
+    best = min(alive, key=lambda i: scores[i])
+    baseline_score = scores[0]
+    return {
+        "solver": solver_name,
+        "best_config": candidate_configs[best],
+        "best_solver_id": solver_set.solver_ids[best],
+        "best_score": scores[best],
+        "baseline_score": baseline_score,
+        "speedup": baseline_score / scores[best],
+        "nb_problems": nb_problems,
+        "nb_rounds": nb_rounds,
+        "nb_solves": len(evaluator.contexts),
+    }
+
+
+def tune_solver_options(
+    solver_name: str,
+    search_space: dict[str, list[Any]],
+    test_set: TestSet,
+    eta: int = 3,
+    min_problems: int = 4,
+    metric: str = "runtime_fair",
+    failure_penalty: float = 10.0,
+    seed: Optional[int] = None,
+    print_level: int = 1,
+) -> pandas.DataFrame:
+    """Tune the options of a solver separately for each problem family.
+
+    Example:
+        tune_solver_options(
+            "PARTIAL_CONDENSING_HPIPM",
+            {"cond_N": [2, 5, 10], "hpipm_mode": ["SPEED", "BALANCE", "ROBUST"]},
+            test_set,
+        )
+
+    Args:
+        solver_name: Name of the acados OCP QP solver.
+        search_space: Maps `AcadosOcpQpOptions` fields to candidate values.
+        test_set: Test set, grouped into families by dataset subfolder.
+        eta: Reduction factor per successive halving round.
+        min_problems: Number of problems in the first round.
+        metric: Result column to minimize.
+        failure_penalty: Factor applied to the worst runtime for failures.
+        seed: Random seed for the problem order.
+        print_level: Verbosity level.
+
+    Returns:
+        Data frame with one row per family containing the best
+        configuration and its measured speedup over the default options.
+    """
+    default_opts = AcadosOcpQpOptions()
+    for key in search_space:
+        if not hasattr(default_opts, key):
+            raise ValueError(f"Unknown option: {key}")
+    configs = expand_search_space(search_space)
+
+    rows = []
+    for family, qp_folder_paths in test_set.group_by_family().items():
+        if print_level > 0:
+            print(
+                f"Tuning {solver_name} on family {family} "
+                f"({len(configs)} configurations, {len(qp_folder_paths)} problems)"
+            )
+        result = successive_halving(
+            solver_name,
+            configs,
+            qp_folder_paths,
+            eta=eta,
+            min_problems=min_problems,
+            metric=metric,
+            failure_penalty=failure_penalty,
+            seed=seed,
+            print_level=print_level,
+        )
+        rows.append({"family": family, **result})
+    return pandas.DataFrame(rows)
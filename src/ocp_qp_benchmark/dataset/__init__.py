@@ -1,4 +1,32 @@
-"""Dataset management utilities."""
+"""Dataset management utilities.
 
-from .manager import BenchSetManager
-from .generators import generate_problems
+Components are imported on first access, such that e.g. the standard form
+conversion does not import acados_template.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "BenchSetManager": "manager",
+    "QpCapture": "capture",
+    "generate_problems": "generators",
+    "generate_lti_system": "generators",
+    "compute_structural_statistics": "statistics",
+    "StandardFormQp": "standard_form",
+    "qp_dict_to_standard_form": "standard_form",
+    "load_standard_form": "standard_form",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,201 @@
+"""Capture of the QPs solved by an acados OCP solver into the collection."""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter, time
+from typing import Optional
+
+from ocp_qp_benchmark.utils.hashing import hash_file
+
+
+class QpCapture:
+    """
+    Record the QPs of a running `AcadosOcpSolver` as a new problem family.
+
+    While active, the `solve()` method of the solver is wrapped: after each
+    call, the last QP is dumped with `dump_last_qp_to_json` and queued.
+    acados only exposes the last QP of a solve, so with the SQP_RTI
+    nlp_solver_type every SQP iteration is captured, and with SQP the last
+    iteration of each solve.
+
+    Only the dump happens in the thread of the controller. Deduplication by
+    content hash, meta data, reference solutions and writing to the
+    collection happen in a background thread. Captures are rate-limited,
+    and dropped rather than blocking the controller when the buffer is full.
+
+    Attributes:
+        dataset_path: Folder of the problem family in the collection.
+        nb_solves: Number of solves since the capture started.
+        nb_captured: Number of QPs added to the collection.
+        nb_duplicates: Number of QPs skipped as already in the family.
+        nb_skipped: Number of solves not captured due to the rate limit.
+        nb_dropped: Number of QPs dropped because the buffer was full.
+    """
+
+    def __init__(
+        self,
+        solver,
+        name: str,
+        manager=None,
+        nlp_name: Optional[str] = None,
+        min_interval: float = 0.0,
+        max_problems: Optional[int] = None,
+        buffer_size: int = 64,
+    ):
+        """Initialize the capture, see `start`.
+
+        Args:
+            solver: The acados OCP solver of the controller to record.
+            name: Name of the problem family in the collection, problems are
+                appended if it already exists.
+            manager: Manager of the collection (default: `BenchSetManager()`).
+            nlp_name: Name of the originating NLP in the meta data (default:
+                the name of the solver, i.e. of its model).
+            min_interval: Minimum time between two captures, in seconds.
+            max_problems: Maximum number of QPs captured (default: no limit).
+            buffer_size: Maximum number of QPs waiting for ingestion.
+        """
+        if manager is None:
+            from ocp_qp_benchmark.dataset.manager import BenchSetManager
+
+            manager = BenchSetManager()
+        self.solver = solver
+        self.name = name
+        self.manager = manager
+        self.nlp_name = nlp_name if nlp_name is not None else getattr(solver, "name", "")
+        self.min_interval = min_interval
+        self.max_problems = max_problems
+        self.dataset_path = Path(manager.collection_path) / name
+
+        self.nb_solves = 0
+        self.nb_captured = 0
+        self.nb_duplicates = 0
+        self.nb_skipped = 0
+        self.nb_dropped = 0
+        self._nb_queued = 0
+        self._last_capture = None
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._original_solve = None
+        self._thread = None
+        self._tmp_path = None
+
+    def start(self) -> None:
+        """Start recording the solves of the solver."""
+        if self._original_solve is not None:
+            return
+        self.dataset_path.mkdir(parents=True, exist_ok=True)
+        # Continue numbering and deduplication of an existing family
+        existing = [path for path in self.dataset_path.iterdir() if path.is_dir()]
+        self._index = len(existing)
+        self._seen = set()
+        for qp_folder_path in existing:
+            qp_data_path = qp_folder_path / f"{qp_folder_path.name}.json"
+            if qp_data_path.exists():
+                self._seen.add(hash_file(str(qp_data_path)))
+
+        self._tmp_path = tempfile.mkdtemp(prefix="qp_capture_")
+        self._thread = threading.Thread(target=self._ingest, daemon=True)
+        self._thread.start()
+        self._original_solve = self.solver.solve
+        self._solve_in_instance = "solve" in vars(self.solver)
+        self.solver.solve = self._solve
+
+    def _solve(self, *args, **kwargs):
+        """Solve with the original method, then capture the QP."""
+        status = self._original_solve(*args, **kwargs)
+        self._record(status)
+        return status
+
+    def _record(self, status: int) -> None:
+        """Dump the last QP of the solver and queue it for ingestion."""
+        solve_index = self.nb_solves
+        self.nb_solves += 1
+        now = perf_counter()
+        if (
+            self.max_problems is not None and self._nb_queued >= self.max_problems
+        ) or (
+            self._last_capture is not None
+            and now - self._last_capture < self.min_interval
+        ):
+            self.nb_skipped += 1
+            return
+        if self._queue.full():
+            self.nb_dropped += 1
+            return
+
+        fd, qp_data_path = tempfile.mkstemp(suffix=".json", dir=self._tmp_path)
+        os.close(fd)
+        self.solver.dump_last_qp_to_json(qp_data_path, overwrite=True)
+        try:
+            sqp_iteration = int(self.solver.get_stats("sqp_iter"))
+        except Exception:
+            sqp_iteration = -1
+        origin = {
+            "nlp_name": self.nlp_name,
+            "nlp_solve_index": solve_index,
+            "sqp_iteration": sqp_iteration,
+            "nlp_status": int(status),
+            "capture_time": time(),
+        }
+        self._last_capture = now
+        self._nb_queued += 1
+        self._queue.put_nowait((qp_data_path, origin))
+
+    def _ingest(self) -> None:
+        """Add queued QPs to the collection until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            qp_data_path, origin = item
+            try:
+                qp_hash = hash_file(qp_data_path)
+                if qp_hash in self._seen:
+                    self.nb_duplicates += 1
+                    os.remove(qp_data_path)
+                    continue
+                self._seen.add(qp_hash)
+                file_name = f"qp_{self._index:06d}.json"
+                self._index += 1
+                json_file = Path(self._tmp_path) / file_name
+                os.replace(qp_data_path, json_file)
+                added = self.manager.add_problem(
+                    json_file,
+                    self.dataset_path,
+                    name=f"{self.name}_{file_name}",
+                    extra_meta_data={**origin, "qp_hash": qp_hash},
+                    move=True,
+                )
+                if added is not None:
+                    self.nb_captured += 1
+            except Exception as e:
+                print(f"Warning: failed to capture QP of solve {origin['nlp_solve_index']}: {e}")
+
+    def stop(self) -> None:
+        """Stop recording and wait until all queued QPs are ingested."""
+        if self._original_solve is None:
+            return
+        if self._solve_in_instance:
+            self.solver.solve = self._original_solve
+        else:
+            del self.solver.solve
+        self._original_solve = None
+        self._queue.put(None)
+        self._thread.join()
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+        print(
+            f"Captured {self.nb_captured} QPs of {self.nb_solves} solves into "
+            f"{self.dataset_path} ({self.nb_duplicates} duplicates, "
+            f"{self.nb_skipped} rate-limited, {self.nb_dropped} dropped)"
+        )
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
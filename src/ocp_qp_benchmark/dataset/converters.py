@@ -1,11 +1,63 @@
 """Data format converters."""
 
+import json
 import os
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 
 
+def lti_to_qp_dict(
+    A: np.ndarray,
+    B: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+    N: int,
+    x0: Optional[np.ndarray] = None,
+    u_max: Optional[float] = None,
+) -> dict:
+    """Build the raw OCP QP data of a linear MPC problem.
+
+    The initial state is fixed through state bounds on stage 0, so that it
+    can be updated on an existing solver.
+
+    Args:
+        A: State transition matrix.
+        B: Input matrix.
+        Q: State cost matrix, also used as terminal cost.
+        R: Input cost matrix.
+        N: Prediction horizon.
+        x0: Initial state (default: zeros).
+        u_max: If set, add box constraints |u| <= u_max on all inputs.
+
+    Returns:
+        Dictionary with raw QP data, keys of the form "{field}_{stage}".
+    """
+    nx, nu = B.shape
+    x0 = np.zeros(nx) if x0 is None else np.asarray(x0, dtype=float)
+
+    qp_dict = {"N": int(N)}
+    for k in range(N + 1):
+        qp_dict[f"Q_{k}"] = Q.tolist()
+        qp_dict[f"q_{k}"] = np.zeros(nx).tolist()
+        if k < N:
+            qp_dict[f"A_{k}"] = A.tolist()
+            qp_dict[f"B_{k}"] = B.tolist()
+            qp_dict[f"b_{k}"] = np.zeros(nx).tolist()
+            qp_dict[f"R_{k}"] = R.tolist()
+            qp_dict[f"S_{k}"] = np.zeros((nu, nx)).tolist()
+            qp_dict[f"r_{k}"] = np.zeros(nu).tolist()
+            if u_max is not None:
+                qp_dict[f"idxbu_{k}"] = list(range(nu))
+                qp_dict[f"lbu_{k}"] = (-u_max * np.ones(nu)).tolist()
+                qp_dict[f"ubu_{k}"] = (u_max * np.ones(nu)).tolist()
+    qp_dict["idxbx_0"] = list(range(nx))
+    qp_dict["lbx_0"] = x0.tolist()
+    qp_dict["ubx_0"] = x0.tolist()
+    return qp_dict
+
+
 def convert_npz_to_json(npz_path: str, output_dir: str) -> str:
     """Convert NPZ file to JSON format for acados.
 
@@ -16,8 +68,6 @@ def convert_npz_to_json(npz_path: str, output_dir: str) -> str:
     Returns:
         Path to the generated JSON file.
     """
-    # This is a placeholder - the actual implementation depends on
-    # the acados JSON format requirements
     data = np.load(npz_path)
 
     # Extract problem data
@@ -27,17 +77,13 @@ def convert_npz_to_json(npz_path: str, output_dir: str) -> str:
     R = data["R"]
     N = int(data["N"])
 
-    # TODO: Implement actual conversion to acados OCP QP JSON format
-    # This requires creating the full OCP QP structure with:
-    # - Dynamics matrices for each stage
-    # - Cost matrices for each stage
-    # - Constraints (if any)
-
     output_path = os.path.join(
         output_dir, Path(npz_path).stem + ".json"
     )
 
-    # Placeholder: actual implementation would use acados_template
     print(f"Converting {npz_path} to {output_path}")
+    qp_dict = lti_to_qp_dict(A, B, Q, R, N)
+    with open(output_path, "w") as f:
+        json.dump(qp_dict, f)
 
     return output_path
@@ -8,6 +8,45 @@ import numpy as np
 from .converters import convert_npz_to_json
 
 
+def generate_lti_system(nx: int, nu: int) -> dict:
+    """Generate a random LTI system with quadratic cost.
+
+    Uses the global numpy random state, seed it for reproducibility.
+
+    Args:
+        nx: Number of states.
+        nu: Number of controls.
+
+    Returns:
+        Dictionary with dynamics matrices A, B and cost matrices Q, R.
+    """
+    # Simple Dynamics: x_{k+1} = A x_k + B u_k
+    # Generating LTI system for simplicity
+    A = np.random.randn(nx, nx)
+    # Normalize spectral radius to be around 1 for stability
+    # This prevents the states from exploding over the horizon
+    spectral_radius = np.max(np.abs(np.linalg.eigvals(A)))
+    if spectral_radius > 0:
+        A = A / spectral_radius
+
+    B = np.random.randn(nx, nu)
+
+    # Cost function: sum(0.5 * x_k^T Q x_k + 0.5 * u_k^T R u_k)
+    #                + 0.5 * x_N^T Q_N x_N
+    # Q >= 0, R > 0
+    # Generate random positive semidefinite Q
+    Q_temp = np.random.randn(nx, nx)
+    Q = Q_temp.T @ Q_temp
+    Q = Q / np.linalg.norm(Q)  # Normalize
+
+    # Generate random positive definite R
+    R_temp = np.random.randn(nu, nu)
+    R = R_temp.T @ R_temp + 1e-2 * np.eye(nu)  # Add regularization
+    R = R / np.linalg.norm(R)  # Normalize
+
+    return {"A": A, "B": B, "Q": Q, "R": R}
+
+
 def generate_problems(
     num_problems: int,
     horizon: int,
@@ -38,38 +77,16 @@ def generate_problems(
     generated_files = []
 
     for i in range(num_problems):
-        # Simple Dynamics: x_{k+1} = A x_k + B u_k
-        # Generating LTI system for simplicity
-        A = np.random.randn(nx, nx)
-        # Normalize spectral radius to be around 1 for stability
-        # This prevents the states from exploding over the horizon
-        spectral_radius = np.max(np.abs(np.linalg.eigvals(A)))
-        if spectral_radius > 0:
-            A = A / spectral_radius
-
-        B = np.random.randn(nx, nu)
-
-        # Cost function: sum(0.5 * x_k^T Q x_k + 0.5 * u_k^T R u_k)
-        #                + 0.5 * x_N^T Q_N x_N
-        # Q >= 0, R > 0
-        # Generate random positive semidefinite Q
-        Q_temp = np.random.randn(nx, nx)
-        Q = Q_temp.T @ Q_temp
-        Q = Q / np.linalg.norm(Q)  # Normalize
-
-        # Generate random positive definite R
-        R_temp = np.random.randn(nu, nu)
-        R = R_temp.T @ R_temp + 1e-2 * np.eye(nu)  # Add regularization
-        R = R / np.linalg.norm(R)  # Normalize
+        system = generate_lti_system(nx, nu)
 
         # Store matrices
         filename = os.path.join(output_dir, f"prob_{i}.npz")
         np.savez(
             filename,
-            A=A,
-            B=B,
-            Q=Q,
-            R=R,
+            A=system["A"],
+            B=system["B"],
+            Q=system["Q"],
+            R=system["R"],
             N=horizon,
         )
         generated_files.append(filename)
@@ -3,6 +3,7 @@
 import json
 import shutil
 from pathlib import Path
+from typing import Optional
 
 from acados_template import (
     AcadosOcpQp,
@@ -11,6 +12,9 @@ from acados_template import (
     AcadosOcpQpOptions,
 )
 
+from ocp_qp_benchmark.dataset.statistics import compute_structural_statistics
+from ocp_qp_benchmark.utils.qp_data import load_qp_dict
+
 
 class BenchSetManager:
     """Manager for benchmark dataset collections."""
@@ -70,49 +74,105 @@ class BenchSetManager:
         added_problems = []
 
         for json_file in files:
-            # Load problem
-            try:
-                qp = AcadosOcpQp.from_json(str(json_file))
-            except Exception as e:
-                print(
-                    f"Error loading {json_file}:\n {e}\nSkipping this file."
-                )
-                continue
-
-            # Generate meta data and reference solution
-            meta_dict = self.generate_meta_json(
-                qp, name=f"{new_name}_{json_file.name}"
+            new_folder_path = self.add_problem(
+                json_file, self.dataset_path, name=f"{new_name}_{json_file.name}"
+            )
+            if new_folder_path is not None:
+                added_problems.append(str(new_folder_path))
+
+        return added_problems
+
+    def add_problem(
+        self,
+        json_file: Path,
+        dataset_path: Path,
+        name: str,
+        extra_meta_data: Optional[dict] = None,
+        move: bool = False,
+    ) -> Optional[Path]:
+        """Add one QP JSON file to a problem set of the collection.
+
+        The problem is stored in a subfolder of `dataset_path` named after
+        the file, with its meta data and reference solution.
+
+        Args:
+            json_file: Path to the QP JSON file.
+            dataset_path: Folder of the problem set.
+            name: Name of the problem in its meta data.
+            extra_meta_data: Entries added to the meta data, e.g. the origin
+                of the problem.
+            move: Whether to move the JSON file instead of copying it.
+
+        Returns:
+            Path to the problem folder, or None if the QP could not be loaded.
+        """
+        json_file = Path(json_file)
+        # Load problem
+        try:
+            qp = AcadosOcpQp.from_json(str(json_file))
+        except Exception as e:
+            print(
+                f"Error loading {json_file}:\n {e}\nSkipping this file."
             )
-            ref_sol = self.generate_reference_solution(qp)
+            return None
 
-            # Create new folder
-            new_folder_path = self.dataset_path / json_file.stem
-            new_folder_path.mkdir()
+        # Generate meta data and reference solution
+        meta_dict = self.generate_meta_json(
+            qp, name=name, qp_dict=load_qp_dict(str(json_file))
+        )
+        if extra_meta_data is not None:
+            meta_dict.update(extra_meta_data)
+        ref_sol = self.generate_reference_solution(qp)
 
-            # Copy json file
+        # Create new folder
+        new_folder_path = Path(dataset_path) / json_file.stem
+        new_folder_path.mkdir()
+
+        # Copy json file
+        if move:
+            shutil.move(json_file, new_folder_path / json_file.name)
+        else:
             shutil.copy2(json_file, new_folder_path / json_file.name)
 
-            # Save meta json
-            (new_folder_path / f"{json_file.stem}_meta.json").write_text(
-                json.dumps(meta_dict, indent=4)
+        # Save meta json
+        (new_folder_path / f"{json_file.stem}_meta.json").write_text(
+            json.dumps(meta_dict, indent=4)
+        )
+
+        if ref_sol is not None:
+            # Save reference solution
+            (new_folder_path / f"{json_file.stem}_ref_sol.json").write_text(
+                ref_sol.to_json()
             )
+        print(f"Added problem from {json_file} to {new_folder_path}")
+        return new_folder_path
 
-            if ref_sol is not None:
-                # Save reference solution
-                (new_folder_path / f"{json_file.stem}_ref_sol.json").write_text(
-                    ref_sol.to_json()
-                )
-            print(f"Added problem from {json_file} to {new_folder_path}")
-            added_problems.append(str(new_folder_path))
+    def capture(self, solver, name: str, **kwargs):
+        """Capture the QPs of an `AcadosOcpSolver` into a new problem set.
 
-        return added_problems
+        Args:
+            solver: The acados OCP solver of the controller to record.
+            name: Name of the problem set in the collection.
+            kwargs: Options of `QpCapture`.
+
+        Returns:
+            A `QpCapture`, recording while used as a context manager.
+        """
+        from ocp_qp_benchmark.dataset.capture import QpCapture
 
-    def generate_meta_json(self, qp: AcadosOcpQp, name: str) -> dict:
+        return QpCapture(solver, name, manager=self, **kwargs)
+
+    def generate_meta_json(
+        self, qp: AcadosOcpQp, name: str, qp_dict: Optional[dict] = None
+    ) -> dict:
         """Generate meta data dictionary for a QP problem.
 
         Args:
             qp: The OCP QP problem.
             name: Name for the problem.
+            qp_dict: Raw QP data. If given, structural statistics (stage
+                dimensions, sizes, KKT nonzeros, conditioning estimates)
+                are added, see `compute_structural_statistics`.
 
         Returns:
             Dictionary containing meta data.
@@ -123,8 +183,52 @@ class BenchSetManager:
         meta_json["has_slacks"] = qp.has_slacks()
         meta_json["has_masks"] = qp.has_masks()
         meta_json["has_idxs_rev_not_idxs"] = qp.has_idxs_rev_not_idxs()
+        if qp_dict is not None:
+            try:
+                meta_json.update(compute_structural_statistics(qp_dict))
+            except ValueError as e:
+                print(f"Warning: no structural statistics for {name}: {e}")
         return meta_json
 
+    def backfill_meta_data(self, dataset_names: Optional[list[str]] = None) -> int:
+        """Add structural statistics to the meta data of existing problems.
+
+        Existing meta data entries are kept, statistics are overwritten.
+
+        Args:
+            dataset_names: Names of the problem sets in the collection to
+                update (default: all).
+
+        Returns:
+            Number of updated problems.
+        """
+        if dataset_names is None:
+            dataset_paths = [p for p in self.collection_path.iterdir() if p.is_dir()]
+        else:
+            dataset_paths = [self.collection_path / name for name in dataset_names]
+
+        nb_updated = 0
+        for dataset_path in sorted(dataset_paths):
+            for qp_folder_path in sorted(p for p in dataset_path.iterdir() if p.is_dir()):
+                qp_data_path = qp_folder_path / f"{qp_folder_path.name}.json"
+                meta_data_path = qp_folder_path / f"{qp_folder_path.name}_meta.json"
+                if not qp_data_path.exists() or not meta_data_path.exists():
+                    print(f"Skipping {qp_folder_path}: missing QP or meta data file")
+                    continue
+                try:
+                    stats = compute_structural_statistics(
+                        load_qp_dict(str(qp_data_path))
+                    )
+                except ValueError as e:
+                    print(f"Skipping {qp_folder_path}: {e}")
+                    continue
+                meta_data = json.loads(meta_data_path.read_text())
+                meta_data.update(stats)
+                meta_data_path.write_text(json.dumps(meta_data, indent=4))
+                nb_updated += 1
+        print(f"Updated meta data of {nb_updated} problems.")
+        return nb_updated
+
     def generate_reference_solution(
         self, qp: AcadosOcpQp
     ) -> AcadosOcpIterate:
@@ -0,0 +1,298 @@
+"""Conversion of OCP QPs to sparse standard form."""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from ocp_qp_benchmark.utils.qp_data import (
+    get_horizon,
+    get_stage_dims,
+    get_stage_field,
+    load_qp_dict,
+)
+
+# Bounds with magnitude at least ACADOS_INFTY are treated as infinite
+ACADOS_INFTY = 1e10
+
+
+@dataclass
+class StandardFormQp:
+    """Sparse QP in standard form.
+
+        minimize    0.5 z' P z + q' z
+        subject to  l <= A z <= u
+
+    The first `n_eq` rows of A are equality constraints (l == u). The
+    variables of stage k are [x_k, u_k, sl_k, su_k].
+
+    Attributes:
+        P: Symmetric cost Hessian (CSC).
+        q: Cost gradient.
+        A: Constraint matrix (CSC).
+        l: Lower constraint bounds, -inf if unbounded.
+        u: Upper constraint bounds, +inf if unbounded.
+        n_eq: Number of leading equality rows.
+        stage_offsets: Index of the first variable of each stage, followed
+            by the total number of variables.
+        nx: Number of states of each stage.
+        nu: Number of controls of each stage.
+    """
+
+    P: sparse.csc_matrix
+    q: np.ndarray
+    A: sparse.csc_matrix
+    l: np.ndarray
+    u: np.ndarray
+    n_eq: int
+    stage_offsets: np.ndarray
+    nx: np.ndarray
+    nu: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return self.P.shape[0]
+
+    @property
+    def m(self) -> int:
+        return self.A.shape[0]
+
+    def cost(self, z: np.ndarray) -> float:
+        """Evaluate the cost function at z."""
+        return float(0.5 * z @ (self.P @ z) + self.q @ z)
+
+    def trajectories(self, z: np.ndarray) -> tuple[list, list]:
+        """Split z into the state and control trajectories of the OCP.
+
+        Returns:
+            Tuple of the lists of x_k and u_k of all stages.
+        """
+        x_traj, u_traj = [], []
+        for offset, nx, nu in zip(self.stage_offsets, self.nx, self.nu):
+            x_traj.append(z[offset : offset + nx])
+            u_traj.append(z[offset + nx : offset + nx + nu])
+        return x_traj, u_traj
+
+
+def _field(qp_dict: dict, field: str, stage: int, size: int) -> np.ndarray:
+    """Vector field of a stage, zeros if not set."""
+    value = get_stage_field(qp_dict, field, stage)
+    return np.zeros(size) if value is None or value.size == 0 else value
+
+
+def _matrix(qp_dict: dict, field: str, stage: int, shape: tuple) -> np.ndarray:
+    """Matrix field of a stage, zeros if not set."""
+    value = get_stage_field(qp_dict, field, stage)
+    return np.zeros(shape) if value is None or value.size == 0 else value.reshape(shape)
+
+
+def _index_field(qp_dict: dict, field: str, stage: int) -> np.ndarray:
+    """Index field of a stage, empty if not set."""
+    value = get_stage_field(qp_dict, field, stage)
+    return np.zeros(0, dtype=int) if value is None else value
+
+
+def _soft_constraint_indices(qp_dict: dict, stage: int) -> np.ndarray:
+    """Indices into the stacked [bu, bx, g] constraints of all slacks."""
+    idxs = get_stage_field(qp_dict, "idxs", stage)
+    if idxs is not None and idxs.size > 0:
+        return idxs
+    idxs_rev = get_stage_field(qp_dict, "idxs_rev", stage)
+    if idxs_rev is not None and idxs_rev.size > 0:
+        constraints = np.flatnonzero(idxs_rev >= 0)
+        order = np.argsort(idxs_rev[constraints], kind="stable")
+        return constraints[order]
+    return np.zeros(0, dtype=int)
+
+
+def qp_dict_to_standard_form(qp_dict: dict) -> StandardFormQp:
+    """Convert a raw OCP QP to sparse standard form.
+
+    Soft constraints get one row per side, e.g. lg - sl <= C x + D u and
+    C x + D u <= ug + su, and slack bounds sl >= lls, su >= lus. Problems
+    with masks are not supported.
+
+    Args:
+        qp_dict: Raw QP data, see `utils.qp_data.load_qp_dict`.
+
+    Returns:
+        Standard form QP.
+    """
+    if any("mask" in key for key in qp_dict):
+        for key, value in qp_dict.items():
+            if "mask" in key and not np.all(np.asarray(value) == 1):
+                raise ValueError("QPs with masked constraints are not supported")
+
+    N = get_horizon(qp_dict)
+    dims = get_stage_dims(qp_dict)
+    nv = np.array([d["nx"] + d["nu"] + 2 * d["ns"] for d in dims])
+    stage_offsets = np.concatenate([[0], np.cumsum(nv)])
+    n = int(stage_offsets[-1])
+
+    P_blocks = []
+    q_parts = []
+    eq_blocks = []  # (row block, column offset) of equality constraints
+    eq_rhs = []
+    ineq_blocks = []
+    ineq_l = []
+    ineq_u = []
+
+    for k in range(N + 1):
+        nx, nu, ns = dims[k]["nx"], dims[k]["nu"], dims[k]["ns"]
+        nbx, nbu, ng = dims[k]["nbx"], dims[k]["nbu"], dims[k]["ng"]
+        offset = stage_offsets[k]
+
+        # Cost: [[Q, S'], [S, R]] on [x, u], diagonal slack penalties
+        Q = _matrix(qp_dict, "Q", k, (nx, nx))
+        R = _matrix(qp_dict, "R", k, (nu, nu))
+        S = _matrix(qp_dict, "S", k, (nu, nx))
+        cost_blocks = [sparse.csr_matrix(np.block([[Q, S.T], [S, R]]))]
+        if ns > 0:
+            cost_blocks.append(
+                sparse.diags(
+                    np.concatenate(
+                        [_field(qp_dict, "Zl", k, ns), _field(qp_dict, "Zu", k, ns)]
+                    )
+                )
+            )
+        P_blocks.append(sparse.block_diag(cost_blocks))
+        q_parts += [
+            _field(qp_dict, "q", k, nx),
+            _field(qp_dict, "r", k, nu),
+            _field(qp_dict, "zl", k, ns),
+            _field(qp_dict, "zu", k, ns),
+        ]
+
+        # Dynamics: A_k x_k + B_k u_k - x_{k+1} = -b_k
+        if k < N:
+            nx_next = dims[k + 1]["nx"]
+            AB = np.hstack(
+                [
+                    _matrix(qp_dict, "A", k, (nx_next, nx)),
+                    _matrix(qp_dict, "B", k, (nx_next, nu)),
+                    np.zeros((nx_next, 2 * ns)),
+                ]
+            )
+            eq_blocks.append((sparse.csr_matrix(AB), offset))
+            eq_blocks.append((-sparse.eye(nx_next, format="csr"), stage_offsets[k + 1]))
+            eq_rhs.append(-_field(qp_dict, "b", k, nx_next))
+
+        # Constraints on [x, u], stacked as [bu, bx, g] like in acados
+        idxbu = _index_field(qp_dict, "idxbu", k)
+        idxbx = _index_field(qp_dict, "idxbx", k)
+        Jbu = sparse.csr_matrix(
+            (np.ones(nbu), (np.arange(nbu), nx + idxbu)), shape=(nbu, nx + nu)
+        )
+        Jbx = sparse.csr_matrix(
+            (np.ones(nbx), (np.arange(nbx), idxbx)), shape=(nbx, nx + nu)
+        )
+        CD = sparse.csr_matrix(
+            np.hstack(
+                [_matrix(qp_dict, "C", k, (ng, nx)), _matrix(qp_dict, "D", k, (ng, nu))]
+            )
+        )
+        H = sparse.vstack([Jbu, Jbx, CD], format="csr")
+        lower = np.concatenate(
+            [
+                _field(qp_dict, "lbu", k, nbu),
+                _field(qp_dict, "lbx", k, nbx),
+                _field(qp_dict, "lg", k, ng),
+            ]
+        )
+        upper = np.concatenate(
+            [
+                _field(qp_dict, "ubu", k, nbu),
+                _field(qp_dict, "ubx", k, nbx),
+                _field(qp_dict, "ug", k, ng),
+            ]
+        )
+
+        idxs = _soft_constraint_indices(qp_dict, k)
+        hard = np.setdiff1d(np.arange(H.shape[0]), idxs)
+        ineq_blocks.append(
+            (sparse.hstack([H[hard], sparse.csr_matrix((len(hard), 2 * ns))], format="csr"), offset)
+        )
+        ineq_l.append(lower[hard])
+        ineq_u.append(upper[hard])
+
+        if ns > 0:
+            E = sparse.eye(ns, format="csr")
+            O = sparse.csr_matrix((ns, ns))
+            # Lower side: h + sl >= l, upper side: h - su <= u
+            ineq_blocks.append((sparse.hstack([H[idxs], E, O], format="csr"), offset))
+            ineq_l.append(lower[idxs])
+            ineq_u.append(np.full(ns, np.inf))
+            ineq_blocks.append((sparse.hstack([H[idxs], O, -E], format="csr"), offset))
+            ineq_l.append(np.full(ns, -np.inf))
+            ineq_u.append(upper[idxs])
+            # Slack bounds sl >= lls, su >= lus
+            slack_bounds = sparse.hstack(
+                [sparse.csr_matrix((2 * ns, nx + nu)), sparse.eye(2 * ns, format="csr")],
+                format="csr",
+            )
+            ineq_blocks.append((slack_bounds, offset))
+            ineq_l.append(
+                np.concatenate(
+                    [_field(qp_dict, "lls", k, ns), _field(qp_dict, "lus", k, ns)]
+                )
+            )
+            ineq_u.append(np.full(2 * ns, np.inf))
+
+    # Dynamics blocks come in pairs sharing the same rows
+    eq_row_blocks = []
+    row = 0
+    for i in range(0, len(eq_blocks), 2):
+        nrows = eq_blocks[i][0].shape[0]
+        eq_row_blocks += [(eq_blocks[i], row), (eq_blocks[i + 1], row)]
+        row += nrows
+    n_eq = row
+    ineq_row_blocks = []
+    for block in ineq_blocks:
+        ineq_row_blocks.append((block, row))
+        row += block[0].shape[0]
+
+    rows, cols, data = [], [], []
+    for (block, col_offset), row_offset in eq_row_blocks + ineq_row_blocks:
+        coo = sparse.coo_matrix(block)
+        rows.append(coo.row + row_offset)
+        cols.append(coo.col + col_offset)
+        data.append(coo.data)
+    A_std = sparse.csc_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(row, n),
+    )
+
+    b_eq = np.concatenate(eq_rhs) if eq_rhs else np.zeros(0)
+    l = np.concatenate([b_eq] + ineq_l)
+    u = np.concatenate([b_eq] + ineq_u)
+    l[l <= -ACADOS_INFTY] = -np.inf
+    u[u >= ACADOS_INFTY] = np.inf
+
+    return StandardFormQp(
+        P=sparse.block_diag(P_blocks, format="csc"),
+        q=np.concatenate(q_parts),
+        A=A_std,
+        l=l,
+        u=u,
+        n_eq=n_eq,
+        stage_offsets=stage_offsets,
+        nx=np.array([d["nx"] for d in dims]),
+        nu=np.array([d["nu"] for d in dims]),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_standard_form(qp_data_path: str) -> StandardFormQp:
+    """Load a QP JSON file in standard form, cached per path.
+
+    The cache is not bounded, as every problem is loaded again for each
+    solver of a run, and is cleared at the end of `runner.run`.
+
+    Args:
+        qp_data_path: Path to the QP JSON file.
+
+    Returns:
+        Standard form QP.
+    """
+    return qp_dict_to_standard_form(load_qp_dict(qp_data_path))
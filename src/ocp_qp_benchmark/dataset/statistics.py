@@ -0,0 +1,64 @@
+"""Structural statistics of OCP QPs for problem meta data."""
+
+import numpy as np
+from scipy import sparse
+
+from ocp_qp_benchmark.dataset.standard_form import qp_dict_to_standard_form
+from ocp_qp_benchmark.utils.qp_data import get_stage_dims
+
+STAGE_DIMS = ("nx", "nu", "nbx", "nbu", "ng", "ns")
+
+
+def _ratio(values: np.ndarray) -> float:
+    """Ratio of largest to smallest nonzero magnitude, 1.0 if all zero."""
+    values = np.abs(values)
+    values = values[values > 0]
+    if len(values) == 0:
+        return 1.0
+    return float(values.max() / values.min())
+
+
+def compute_structural_statistics(qp_dict: dict) -> dict:
+    """Compute dimensions, sparsity and cheap conditioning estimates of a QP.
+
+    All matrix statistics are computed from the sparse standard form, see
+    `dataset.standard_form`:
+    - kkt_nnz: nonzeros of the KKT matrix [[P, A'], [A, 0]].
+    - hessian_diag_ratio: max/min nonzero magnitude on the diagonal of P.
+    - hessian_gershgorin_min: Gershgorin lower bound on the smallest
+      eigenvalue of P, nonnegative values certify convexity.
+    - constraint_row_norm_ratio: max/min 2-norm of the rows of A.
+
+    Args:
+        qp_dict: Raw QP data, see `utils.qp_data.load_qp_dict`.
+
+    Returns:
+        Dictionary of per-stage dimension lists and scalar statistics.
+    """
+    dims = get_stage_dims(qp_dict)
+    stats = {dim: [d[dim] for d in dims] for dim in STAGE_DIMS}
+
+    qp = qp_dict_to_standard_form(qp_dict)
+    P = sparse.csr_matrix(qp.P)
+    A = sparse.csr_matrix(qp.A)
+
+    diag = P.diagonal()
+    off_diag_sums = np.asarray(abs(P).sum(axis=1)).ravel() - np.abs(diag)
+    row_norms = np.sqrt(np.asarray(A.multiply(A).sum(axis=1)).ravel())
+
+    stats["n_variables"] = qp.n
+    stats["n_equalities"] = qp.n_eq
+    stats["n_inequalities"] = int(
+        sum(d["nbx"] + d["nbu"] + d["ng"] for d in dims)
+    )
+    stats["n_constraints"] = stats["n_equalities"] + stats["n_inequalities"]
+    stats["n_slacks"] = int(2 * sum(stats["ns"]))
+    stats["hessian_nnz"] = int(P.nnz)
+    stats["constraint_nnz"] = int(A.nnz)
+    stats["kkt_nnz"] = int(P.nnz + 2 * A.nnz)
+    stats["hessian_diag_ratio"] = _ratio(diag)
+    stats["hessian_gershgorin_min"] = (
+        float(np.min(diag - off_diag_sums)) if len(diag) > 0 else 0.0
+    )
+    stats["constraint_row_norm_ratio"] = _ratio(row_norms)
+    return stats
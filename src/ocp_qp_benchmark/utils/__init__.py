@@ -1,3 +1,4 @@
 """Utility functions."""
 
 from .io import load_meta_data
+from .qp_data import load_qp_dict, get_horizon, get_stage_field, get_stage_dims
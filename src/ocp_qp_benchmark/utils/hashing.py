@@ -0,0 +1,108 @@
+"""Content hashes identifying problems, solver configurations and builds."""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from importlib import metadata
+from typing import Optional
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hash of the content of a file.
+
+    Args:
+        path: Path to the file, e.g. a QP JSON file.
+        chunk_size: Number of bytes read at once.
+
+    Returns:
+        Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_config(config: dict) -> str:
+    """SHA-256 hash of a solver configuration in canonical JSON form.
+
+    Args:
+        config: Solver configuration, e.g. from `get_options_dict`.
+
+    Returns:
+        Hex digest, independent of the key order of the configuration.
+    """
+    canonical = json.dumps(
+        config,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=lambda value: value.tolist() if hasattr(value, "tolist") else str(value),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def acados_build_fingerprint(acados_lib_path: Optional[str] = None) -> str:
+    """Fingerprint of the acados build the solvers are loaded from.
+
+    Combines the acados_template version, the content of link_libs.json and
+    name, size and modification time of all files in the acados library
+    folder, so that rebuilding acados changes the fingerprint.
+
+    Args:
+        acados_lib_path: Path to the acados library folder (default: the one
+            used by `AcadosCodeGenOpts`).
+
+    Returns:
+        Hex digest identifying the build.
+    """
+    if acados_lib_path is None:
+        from acados_template.acados_code_gen_opts import AcadosCodeGenOpts
+
+        acados_lib_path = AcadosCodeGenOpts().acados_lib_path
+
+    digest = hashlib.sha256()
+    try:
+        digest.update(metadata.version("acados_template").encode())
+    except metadata.PackageNotFoundError:
+        pass
+
+    link_libs_path = os.path.join(acados_lib_path, "link_libs.json")
+    if os.path.exists(link_libs_path):
+        digest.update(hash_file(link_libs_path).encode())
+
+    for entry in sorted(os.scandir(acados_lib_path), key=lambda e: e.name):
+        if entry.is_file():
+            stat = entry.stat()
+            digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def acados_commit(acados_lib_path: Optional[str] = None) -> str:
+    """Git commit of the acados source tree the build was made from.
+
+    Args:
+        acados_lib_path: Path to the acados library folder (default: the one
+            used by `AcadosCodeGenOpts`).
+
+    Returns:
+        Commit hash, or "" if the library folder is not in a git checkout.
+    """
+    import subprocess
+
+    if acados_lib_path is None:
+        from acados_template.acados_code_gen_opts import AcadosCodeGenOpts
+
+        acados_lib_path = AcadosCodeGenOpts().acados_lib_path
+    try:
+        output = subprocess.run(
+            ["git", "-C", acados_lib_path, "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return output.stdout.strip()
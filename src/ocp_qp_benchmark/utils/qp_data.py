@@ -0,0 +1,103 @@
+"""Access to the raw OCP QP data stored in dataset JSON files."""
+
+import json
+from typing import Optional
+
+import numpy as np
+
+# Stage fields that hold matrices, all other fields are vectors
+MATRIX_FIELDS = ("A", "B", "Q", "R", "S", "C", "D")
+INDEX_FIELDS = ("idxbx", "idxbu", "idxs", "idxs_rev")
+
+
+def load_qp_dict(qp_data_path: str) -> dict:
+    """Load the raw QP data from a JSON file as written by acados.
+
+    The data is stored per stage with keys of the form "{field}_{stage}",
+    e.g. "A_0", "lbx_3".
+
+    Args:
+        qp_data_path: Path to the QP JSON file.
+
+    Returns:
+        Dictionary containing the raw QP data.
+    """
+    with open(qp_data_path, "r") as f:
+        return json.load(f)
+
+
+def get_horizon(qp_dict: dict) -> int:
+    """Get the horizon length N of a raw QP.
+
+    Args:
+        qp_dict: Raw QP data.
+
+    Returns:
+        Horizon length N.
+    """
+    if "N" in qp_dict:
+        return int(qp_dict["N"])
+    stages = [
+        int(key.rsplit("_", 1)[1])
+        for key in qp_dict
+        if key.startswith("Q_") and key.rsplit("_", 1)[1].isdigit()
+    ]
+    return max(stages)
+
+
+def get_stage_field(
+    qp_dict: dict, field: str, stage: int
+) -> Optional[np.ndarray]:
+    """Get a field of a given stage as numpy array.
+
+    Args:
+        qp_dict: Raw QP data.
+        field: Name of the field, e.g. "A", "lbx", "idxbx".
+        stage: Stage index.
+
+    Returns:
+        Matrices as 2D float arrays, index fields as int arrays, all other
+        fields as 1D float arrays. None if the field is not set.
+    """
+    value = qp_dict.get(f"{field}_{stage}")
+    if value is None:
+        return None
+    if field in INDEX_FIELDS:
+        return np.asarray(value, dtype=int).reshape(-1)
+    if field in MATRIX_FIELDS:
+        array = np.asarray(value, dtype=float)
+        if array.size == 0:
+            return array.reshape(0, 0)
+        return np.atleast_2d(array)
+    return np.asarray(value, dtype=float).reshape(-1)
+
+
+def get_stage_dims(qp_dict: dict) -> list[dict]:
+    """Get the dimensions of every stage of a raw QP.
+
+    Args:
+        qp_dict: Raw QP data.
+
+    Returns:
+        List of N+1 dictionaries with keys nx, nu, nbx, nbu, ng, ns.
+    """
+    N = get_horizon(qp_dict)
+    dims = []
+    for k in range(N + 1):
+        Q = get_stage_field(qp_dict, "Q", k)
+        R = get_stage_field(qp_dict, "R", k)
+        idxbx = get_stage_field(qp_dict, "idxbx", k)
+        idxbu = get_stage_field(qp_dict, "idxbu", k)
+        lg = get_stage_field(qp_dict, "lg", k)
+        zl = get_stage_field(qp_dict, "zl", k)
+        dims.append(
+            {
+                "nx": Q.shape[0] if Q is not None else 0,
+                "nu": R.shape[0] if R is not None else 0,
+                "nbx": len(idxbx) if idxbx is not None else 0,
+                "nbu": len(idxbu) if idxbu is not None else 0,
+                "ng": len(lg) if lg is not None else 0,
+                "ns": len(zl) if zl is not None else 0,
+            }
+        )
+    return dims
@@ -1,3 +1,32 @@
-"""Visualization utilities."""
+"""Visualization utilities.
 
-from .plotting import plot_metric
+Plotting functions are imported on first access, such that matplotlib is
+only imported when plotting.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "plot_metric": "plotting",
+    "plot_latency_histogram": "plotting",
+    "plot_throughput_scaling": "plotting",
+    "plot_convergence": "plotting",
+    "plot_setup_cost": "plotting",
+    "plot_thread_scaling": "plotting",
+    "plot_history": "plotting",
+    "plot_tolerance_pareto": "plotting",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,7 +8,9 @@ import pandas
 
 from acados_template import latexify_plot
 
+from ocp_qp_benchmark.core.results import break_even_solves, setup_cost_summary
 from ocp_qp_benchmark.core.test_set import TestSet
+from ocp_qp_benchmark.core.traces import TRACE_COLUMNS, TraceStore
 
 def _shorten_solver_name(name: str) -> str:
     """Shorten solver name for plot labels."""
@@ -117,3 +119,457 @@ def plot_metric(
         print(f"Saved plot to {savefig}")
     else:
         plt.show(block=True)
+
+
+def plot_latency_histogram(
+    latencies: Dict[str, np.ndarray],
+    sampling_period: float,
+    deadline: Optional[float] = None,
+    nb_bins: int = 50,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot per-step latency histograms of a closed-loop benchmark.
+
+    Args:
+        latencies: Maps solver IDs to arrays of per-step latencies.
+        sampling_period: Sampling period of the control loop in seconds.
+        deadline: Deadline for a single step (default: sampling_period).
+        nb_bins: Number of logarithmically spaced histogram bins.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    deadline = sampling_period if deadline is None else deadline
+    all_values = np.concatenate(list(latencies.values()))
+    bin_edges = np.geomspace(
+        max(all_values.min(), 1e-9), max(all_values.max(), deadline), nb_bins + 1
+    )
+
+    for i, (solver_id, values) in enumerate(latencies.items()):
+        p99 = np.percentile(values, 99)
+        miss_rate = np.mean(values > deadline)
+        plt.hist(
+            values,
+            bins=bin_edges,
+            histtype="step",
+            color=f"C{i}",
+            label=(
+                f"{_shorten_solver_name(solver_id)} "
+                f"(p99={p99:.2e}s, miss={100 * miss_rate:.2f}\\%)"
+            ),
+        )
+        plt.axvline(x=p99, color=f"C{i}", linestyle=":")
+
+    plt.axvline(x=deadline, color="gray", linestyle="--", label="deadline")
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = "Closed-loop latency"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("latency [s]")
+    plt.xscale("log")
+    plt.ylabel("steps")
+    plt.yscale("log")
+    plt.grid(True)
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+
+
+def plot_throughput_scaling(
+    df: pandas.DataFrame,
+    solver_ids: Optional[List[str]] = None,
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot aggregate solves/sec against the number of concurrent workers.
+
+    Args:
+        df: Throughput data frame returned by `run_throughput`.
+        solver_ids: Solver IDs to compare (default: all in df).
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    plot_solver_ids: List[str] = (
+        solver_ids if solver_ids is not None else list(df["solver"].unique())
+    )
+    for i, solver_id in enumerate(plot_solver_ids):
+        solver_df = df[df["solver"] == solver_id].sort_values(by="workers")
+        plt.plot(
+            solver_df["workers"],
+            solver_df["solves_per_sec"],
+            linewidth=linewidth,
+            marker="o",
+            color=f"C{i}",
+            label=_shorten_solver_name(solver_id),
+        )
+        # Ideal linear scaling from the smallest worker count
+        base = solver_df.iloc[0]
+        plt.plot(
+            solver_df["workers"],
+            base["solves_per_sec"] * solver_df["workers"] / base["workers"],
+            linewidth=linewidth / 2,
+            color=f"C{i}",
+            linestyle=":",
+        )
+
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = "Throughput scaling (dotted: linear)"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("concurrent workers")
+    plt.ylabel("solves/sec")
+    plt.xscale("log", base=2)
+    plt.yscale("log")
+    plt.grid(True)
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+
+
+def plot_convergence(
+    traces: TraceStore,
+    problem: str,
+    solver_ids: Optional[List[str]] = None,
+    residual: str = "max",
+    x_axis: str = "iteration",
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot residuals against iterations or time for one problem.
+
+    The time of an iteration is not recorded, residual vs time assumes all
+    iterations of a solve take equally long.
+
+    Args:
+        traces: Trace store filled by `run(..., traces=...)`.
+        problem: Problem name.
+        solver_ids: Solver IDs to compare (default: all with a trace).
+        residual: One of TRACE_COLUMNS, or "max" for the largest of them.
+        x_axis: "iteration" or "time".
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    if solver_ids is None:
+        solver_ids = traces.solvers(problem)
+
+    for i, solver_id in enumerate(solver_ids):
+        trace = traces.get(problem, solver_id)
+        if trace is None or len(trace) == 0:
+            print(f"Warning: no trace for solver {solver_id} on {problem}")
+            continue
+        if residual == "max":
+            values = np.max(trace, axis=1)
+        else:
+            values = trace[:, TRACE_COLUMNS.index(residual)]
+        x = np.arange(1, len(values) + 1)
+        if x_axis == "time":
+            x = x * traces.get_runtime(problem, solver_id) / len(values)
+        plt.semilogy(
+            x,
+            values,
+            linewidth=linewidth,
+            marker=".",
+            color=f"C{i}",
+            label=_shorten_solver_name(solver_id),
+        )
+
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = f"Convergence on {problem}"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("iteration" if x_axis == "iteration" else "time [s]")
+    plt.ylabel(f"residual ({residual})")
+    plt.grid(True)
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+
+
+def plot_setup_cost(
+    df: pandas.DataFrame,
+    solver_ids: Optional[List[str]] = None,
+    max_solves: float = 1e4,
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> pandas.DataFrame:
+    """Plot total cost against the number of solves per solver setup.
+
+    Each solver is a line S + n * c with one-time cost S and per-solve cost
+    c, see `setup_cost_summary`. Intersections are marked at the break-even
+    number of solves.
+
+    Args:
+        df: Test set results data frame.
+        solver_ids: Solver IDs to compare (default: all in df).
+        max_solves: Largest number of solves on the x axis.
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+
+    Returns:
+        Break-even number of solves between solvers, see `break_even_solves`.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    summary = setup_cost_summary(df, solver_ids).dropna()
+    break_even = break_even_solves(summary)
+    n = np.logspace(0, np.log10(max_solves), 200)
+    for i, (solver_id, row) in enumerate(summary.iterrows()):
+        plt.loglog(
+            n,
+            row["one_time_cost"] + n * row["per_solve_cost"],
+            linewidth=linewidth,
+            color=f"C{i}",
+            label=(
+                f"{_shorten_solver_name(solver_id)} "
+                f"(setup {row['one_time_cost']:.1e}s, solve {row['per_solve_cost']:.1e}s)"
+            ),
+        )
+    for solver_i in break_even.index:
+        for solver_j in break_even.columns:
+            n_even = break_even.loc[solver_i, solver_j]
+            if np.isnan(n_even) or not 1 <= n_even <= max_solves:
+                continue
+            row = summary.loc[solver_i]
+            total = row["one_time_cost"] + n_even * row["per_solve_cost"]
+            plt.plot(n_even, total, marker="o", color="k")
+            plt.annotate(f"{n_even:.0f}", (n_even, total))
+
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = "One-time vs per-solve cost"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("number of solves per setup")
+    plt.ylabel("median total time [s]")
+    plt.grid(True, which="both")
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+    return break_even
+
+
+def plot_thread_scaling(
+    summary: pandas.DataFrame,
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot speedup and efficiency against the thread count.
+
+    Solvers are distinguished by color, problem size classes by line style
+    (solid: smallest problems).
+
+    Args:
+        summary: Data frame returned by `thread_scaling_summary`.
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    fig, (ax_speedup, ax_efficiency) = plt.subplots(1, 2, figsize=(10, 4))
+
+    linestyles = ["-", "--", "-.", ":"]
+    for i, solver_id in enumerate(summary["solver"].unique()):
+        solver_df = summary[summary["solver"] == solver_id]
+        for size_class, class_df in solver_df.groupby("size_class"):
+            class_df = class_df.sort_values(by="threads")
+            style = {
+                "linewidth": linewidth,
+                "marker": "o",
+                "color": f"C{i}",
+                "linestyle": linestyles[int(size_class) % len(linestyles)],
+            }
+            label = f"{_shorten_solver_name(solver_id)} (size class {size_class})"
+            ax_speedup.plot(class_df["threads"], class_df["speedup"], label=label, **style)
+            ax_efficiency.plot(class_df["threads"], class_df["efficiency"], **style)
+
+    threads = np.sort(summary["threads"].unique())
+    if len(threads) > 0:
+        ax_speedup.plot(threads, threads / threads[0], color="k", linestyle=":", linewidth=linewidth / 2)
+    ax_speedup.legend(loc=legend_loc)
+    ax_speedup.set_xlabel("threads")
+    ax_speedup.set_ylabel("speedup")
+    ax_efficiency.set_xlabel("threads")
+    ax_efficiency.set_ylabel("parallel efficiency")
+    for ax in (ax_speedup, ax_efficiency):
+        ax.set_xscale("log", base=2)
+        ax.grid(True)
+    if title is None:
+        title = "Thread-count scaling (dotted: linear)"
+    if title != "":
+        fig.suptitle(title)
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+
+
+def plot_history(
+    trends: Dict[str, pandas.DataFrame],
+    metric: str = "runtime_fair",
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot solver trends over runs with their change points.
+
+    Args:
+        trends: Trend data frame of each solver, see `HistoryStore.trend`.
+        metric: Metric summarized by the trends, for the axis label.
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    for i, (solver_id, trend) in enumerate(trends.items()):
+        dates = pandas.to_datetime(trend["timestamp"], unit="s")
+        plt.semilogy(
+            dates,
+            trend["value"],
+            linewidth=linewidth,
+            marker="o",
+            color=f"C{i}",
+            label=_shorten_solver_name(solver_id),
+        )
+        for date in dates[trend["change_point"]]:
+            plt.axvline(date, color=f"C{i}", linestyle="--", linewidth=linewidth / 2)
+
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = f"History of {metric} (dashed: change points)"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("run date")
+    plt.ylabel(f"shifted geometric mean of {metric}")
+    plt.grid(True, which="both")
+    plt.gcf().autofmt_xdate()
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
+
+
+def plot_tolerance_pareto(
+    summary: pandas.DataFrame,
+    linewidth: float = 2.0,
+    savefig: Optional[str] = None,
+    title: Optional[str] = None,
+    latexify: bool = True,
+    legend_loc: str = "best",
+) -> None:
+    """Plot runtime against achieved accuracy of a tolerance sweep.
+
+    Each rung is marked and labeled with its tolerance, the Pareto frontier
+    of each solver connects its non-dominated rungs.
+
+    Args:
+        summary: Data frame returned by `tolerance_sweep_summary`.
+        linewidth: Width of output lines, in px.
+        savefig: If set, save plot to this path rather than displaying it.
+        title: Plot title, set to "" to disable.
+        latexify: Whether to apply LaTeX styling to the plot.
+        legend_loc: Location of the legend.
+    """
+    if latexify:
+        latexify_plot()
+
+    plt.figure()
+
+    summary = summary[np.isfinite(summary["error"])]
+    for i, (solver, family) in enumerate(summary.groupby("solver", sort=False)):
+        frontier = family[family["pareto"]].sort_values(by="error")
+        plt.loglog(
+            frontier["error"],
+            frontier["runtime"],
+            linewidth=linewidth,
+            color=f"C{i}",
+            label=_shorten_solver_name(solver),
+        )
+        plt.loglog(
+            family["error"], family["runtime"], linestyle="", marker="o", color=f"C{i}"
+        )
+        for rung in family.itertuples(index=False):
+            if not np.isnan(rung.tolerance):
+                plt.annotate(f"{rung.tolerance:.0e}", (rung.error, rung.runtime))
+
+    plt.legend(loc=legend_loc)
+    if title is None:
+        title = "Runtime vs accuracy (labels: tolerance)"
+    if title != "":
+        plt.title(title)
+    plt.xlabel("achieved solution error")
+    plt.ylabel("shifted geometric mean of runtime [s]")
+    plt.gca().invert_xaxis()
+    plt.grid(True, which="both")
+    if savefig:
+        plt.savefig(fname=savefig)
+        print(f"Saved plot to {savefig}")
+    else:
+        plt.show(block=True)
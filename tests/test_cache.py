@@ -0,0 +1,95 @@
+"""Tests for the persistent result cache."""
+
+import json
+import math
+
+import pytest
+
+from ocp_qp_benchmark.core.cache import ResultCache
+from ocp_qp_benchmark.core.results import CONTEXT_COLUMNS, RESULT_COLUMNS
+from ocp_qp_benchmark.core.solver_set import SolverSet
+
+
+def make_context(**overrides) -> dict:
+    """Valid context of a successful solve with NaN measurements."""
+    context = {
+        column: 1.0 if RESULT_COLUMNS[column] is float else 1
+        for column in CONTEXT_COLUMNS
+    }
+    context.update(status=0, rel_ci=math.nan, solution_error=math.nan)
+    context.update(overrides)
+    return context
+
+
+@pytest.fixture
+def qp_data_path(tmp_path):
+    path = tmp_path / "qp_1.json"
+    path.write_text('{"N": 10}')
+    return str(path)
+
+
+def test_round_trip(tmp_path, qp_data_path):
+    """Test contexts are read back, NaN is stored as null."""
+    cache = ResultCache(tmp_path / "cache.sqlite", build_fingerprint="build-a")
+    cache.put(qp_data_path, "config-a", make_context(iterations=7))
+    stored = json.loads(cache._connection.execute("SELECT context FROM results").fetchone()[0])
+    assert stored["rel_ci"] is None
+
+    context = cache.get(qp_data_path, "config-a")
+    assert context["iterations"] == 7
+    assert context["status"] == 0
+    assert math.isnan(context["rel_ci"])
+    assert math.isnan(context["solution_error"])
+    cache.close()
+
+
+def test_miss_on_other_build_or_config(tmp_path, qp_data_path):
+    """Test entries only match the same configuration and acados build."""
+    cache = ResultCache(tmp_path / "cache.sqlite", build_fingerprint="build-a")
+    cache.put(qp_data_path, "config-a", make_context())
+    cache.commit()
+    assert cache.get(qp_data_path, "config-b") is None
+
+    other_build = ResultCache(tmp_path / "cache.sqlite", build_fingerprint="build-b")
+    assert other_build.get(qp_data_path, "config-a") is None
+    other_build.close()
+    cache.close()
+
+
+def test_initialization_failures_not_cached(tmp_path, qp_data_path):
+    """Test contexts of solvers that failed to initialize are not stored."""
+    cache = ResultCache(tmp_path / "cache.sqlite", build_fingerprint="build-a")
+    cache.put(qp_data_path, "config-a", make_context(status=-1))
+    assert cache.get(qp_data_path, "config-a") is None
+    cache.close()
+
+
+def test_incomplete_context_rejected(tmp_path, qp_data_path):
+    """Test contexts missing a result column are invalid."""
+    context = make_context()
+    del context["iterations"]
+    assert not ResultCache.is_valid(context)
+    assert ResultCache.is_valid(make_context())
+
+    cache = ResultCache(tmp_path / "cache.sqlite", build_fingerprint="build-a")
+    cache.put(qp_data_path, "config-a", context)
+    assert cache.get(qp_data_path, "config-a") is None
+    cache.close()
+
+
+def test_solver_configs_round_trip(tmp_path):
+    """Test a solver set is recreated from its dumped configurations."""
+    solver_set = SolverSet(
+        solver_list=[
+            ("PARTIAL_CONDENSING_HPIPM", {}),
+            ("PARTIAL_CONDENSING_HPIPM", {"iter_max": 500}),
+        ]
+    )
+    # The parent directory is created
+    path = tmp_path / "results" / "solver_configs.json"
+    solver_set.dump_configs_to_json(str(path))
+    restored = SolverSet.from_configs_json(str(path))
+    assert restored.solver_ids == solver_set.solver_ids
+    assert [ResultCache.config_hash(opts) for opts in restored] == [
+        ResultCache.config_hash(opts) for opts in solver_set
+    ]
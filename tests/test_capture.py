@@ -0,0 +1,78 @@
+"""Tests for capturing the QPs of a running solver."""
+
+import json
+import shutil
+from pathlib import Path
+
+from ocp_qp_benchmark.dataset.capture import QpCapture
+
+
+class FakeSolver:
+    """Solver whose QP only depends on the number of solves modulo 2."""
+
+    name = "pendulum"
+
+    def __init__(self):
+        self.nb_solves = 0
+
+    def solve(self):
+        self.nb_solves += 1
+        return 0
+
+    def dump_last_qp_to_json(self, filename, overwrite=False):
+        Path(filename).write_text(json.dumps({"N": 10, "q_0": [self.nb_solves % 2]}))
+
+    def get_stats(self, field):
+        return 1
+
+
+class FakeManager:
+    """Manager storing problems without meta data or reference solution."""
+
+    def __init__(self, collection_path):
+        self.collection_path = Path(collection_path)
+        self.meta_data = []
+
+    def add_problem(self, json_file, dataset_path, name, extra_meta_data=None, move=False):
+        folder = Path(dataset_path) / Path(json_file).stem
+        folder.mkdir()
+        shutil.move(json_file, folder / Path(json_file).name)
+        self.meta_data.append({"name": name, **extra_meta_data})
+        return folder
+
+
+def test_capture_deduplicates(tmp_path):
+    """Test identical QPs are stored once with their origin."""
+    solver = FakeSolver()
+    manager = FakeManager(tmp_path)
+    with QpCapture(solver, "captured", manager=manager) as capture:
+        for _ in range(4):
+            assert solver.solve() == 0
+    assert capture.nb_solves == 4
+    assert capture.nb_captured == 2
+    assert capture.nb_duplicates == 2
+    assert sorted(p.name for p in (tmp_path / "captured").iterdir()) == [
+        "qp_000000",
+        "qp_000001",
+    ]
+    assert manager.meta_data[0]["nlp_name"] == "pendulum"
+    assert manager.meta_data[1]["nlp_solve_index"] == 1
+    # The original solve method is restored
+    assert "solve" not in vars(solver)
+
+
+def test_capture_rate_limit(tmp_path):
+    """Test captures are limited in number and the family is extended."""
+    solver = FakeSolver()
+    manager = FakeManager(tmp_path)
+    with QpCapture(solver, "captured", manager=manager, max_problems=1) as capture:
+        for _ in range(3):
+            solver.solve()
+    assert capture.nb_skipped == 2
+    with QpCapture(solver, "captured", manager=manager) as capture:
+        for _ in range(3):
+            solver.solve()
+    # Both QPs of the second capture: one new, one already in the family
+    assert capture.nb_captured == 1
+    assert capture.nb_duplicates == 2
+    assert (tmp_path / "captured" / "qp_000001").is_dir()
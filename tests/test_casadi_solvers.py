@@ -0,0 +1,82 @@
+"""Tests for the CasADi NLP solver path."""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("casadi")
+
+from ocp_qp_benchmark.core import casadi_solvers  # noqa: E402
+from ocp_qp_benchmark.core.casadi_solvers import (  # noqa: E402
+    ACADOS_NAN_DETECTED,
+    CasadiSolverOptions,
+    _map_ipopt_status,
+    solve_casadi_problem,
+)
+from ocp_qp_benchmark.core.external_solvers import (  # noqa: E402
+    ACADOS_MAXITER,
+    ACADOS_QP_FAILURE,
+    ACADOS_SUCCESS,
+    ACADOS_UNKNOWN,
+)
+from ocp_qp_benchmark.dataset.converters import lti_to_qp_dict  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "stats, expected",
+    [
+        ({"success": True, "return_status": "Solve_Succeeded"}, ACADOS_SUCCESS),
+        ({"success": False, "return_status": "Maximum_Iterations_Exceeded"}, ACADOS_MAXITER),
+        ({"success": False, "return_status": "Invalid_Number_Detected"}, ACADOS_NAN_DETECTED),
+        ({"success": False, "return_status": "Infeasible_Problem_Detected"}, ACADOS_QP_FAILURE),
+        ({}, ACADOS_QP_FAILURE),
+    ],
+)
+def test_map_ipopt_status(stats, expected):
+    """Test IPOPT return statuses map onto acados status codes."""
+    assert _map_ipopt_status(stats) == expected
+
+
+def test_solve_context(tmp_path):
+    """Test a solve fills the result columns of the context."""
+    rng = np.random.default_rng(0)
+    nx, nu = 3, 2
+    qp_dict = lti_to_qp_dict(
+        rng.standard_normal((nx, nx)),
+        rng.standard_normal((nx, nu)),
+        np.eye(nx),
+        np.eye(nu),
+        5,
+        x0=np.ones(nx),
+        u_max=1.0,
+    )
+    qp_data_path = tmp_path / "qp_1.json"
+    qp_data_path.write_text(json.dumps(qp_dict))
+
+    ctx = solve_casadi_problem(str(qp_data_path), CasadiSolverOptions("IPOPT"))
+    assert ctx["status"] == ACADOS_SUCCESS
+    assert ctx["iterations"] > 0
+    assert ctx["runtime_external"] > 0
+    assert ctx["runtime_fair"] == ctx["runtime_internal"]
+    assert ctx["n_samples"] == 1
+    assert np.isfinite(ctx["cost"])
+    # No reference solution to measure the accuracy against
+    assert np.isnan(ctx["solution_error"])
+
+
+def test_solver_error_is_failure(monkeypatch):
+    """Test an exception of the solve is stored as failed job."""
+
+    def raising_solver(**kwargs):
+        raise RuntimeError("IPOPT crashed")
+
+    qp = SimpleNamespace(n=2, l=np.zeros(1), u=np.ones(1))
+    monkeypatch.setattr(
+        casadi_solvers, "_build_nlp_solver", lambda *args: (raising_solver, qp)
+    )
+    ctx = solve_casadi_problem("qp_1.json", CasadiSolverOptions("IPOPT"))
+    assert ctx["status"] == ACADOS_UNKNOWN
+    assert ctx["runtime_fair"] == -1
+    assert np.isnan(ctx["solution_error"])
@@ -0,0 +1,47 @@
+"""Startup time guard of the command-line interface."""
+
+import subprocess
+import sys
+from time import perf_counter
+
+from ocp_qp_benchmark.cli.main import build_parser
+
+HEAVY_MODULES = ("acados_template", "matplotlib", "pandas", "tqdm", "pyarrow")
+
+# Generous bound on `ocp-benchmark --help`, importing the heavy modules
+# takes seconds
+MAX_HELP_TIME = 1.5
+
+
+def test_cli_import_is_light():
+    """Test importing the CLI does not import heavy dependencies."""
+    code = (
+        "import sys, ocp_qp_benchmark.cli.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == ""
+
+
+def test_cli_help_startup_time():
+    """Test `ocp-benchmark --help` returns quickly."""
+    start_time = perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "ocp_qp_benchmark.cli.main", "--help"],
+        capture_output=True,
+        check=True,
+    )
+    assert perf_counter() - start_time < MAX_HELP_TIME
+
+
+def test_subcommand_parsing():
+    """Test subcommands are dispatched to their handlers."""
+    parser = build_parser()
+    args = parser.parse_args(["run", "-f", "problems", "-j", "4"])
+    assert args.handler.__name__ == "run_benchmark"
+    assert args.workers == 4
+    args = parser.parse_args(["compare", "a.csv", "b.csv", "-m", "iterations"])
+    assert args.handler.__name__ == "compare_results_files"
+    assert args.metric == "iterations"
@@ -0,0 +1,73 @@
+"""Tests for closed-loop latency statistics."""
+
+import json
+
+import numpy as np
+from acados_template import AcadosOcpQp
+
+from ocp_qp_benchmark.core import create_solver_options, latency_statistics
+from ocp_qp_benchmark.core.closed_loop import simulate_closed_loop
+from ocp_qp_benchmark.dataset.converters import lti_to_qp_dict
+
+
+def _double_integrator(dt=0.1):
+    A = np.array([[1.0, dt], [0.0, 1.0]])
+    B = np.array([[0.5 * dt**2], [dt]])
+    return A, B
+
+
+def test_latency_statistics_deadline_misses():
+    """Test deadline misses are counted against the sampling period."""
+    latencies = np.full(1000, 1e-4)
+    latencies[:5] = 2e-3
+    stats = latency_statistics(latencies, sampling_period=1e-3)
+    assert stats["nb_steps"] == 1000
+    assert stats["deadline_misses"] == 5
+    assert stats["deadline_miss_rate"] == 5 / 1000
+    assert stats["median"] == 1e-4
+    assert stats["max"] == 2e-3
+
+
+def test_latency_statistics_histogram():
+    """Test histogram covers all steps."""
+    latencies = np.random.default_rng(0).uniform(1e-5, 1e-3, 500)
+    stats = latency_statistics(latencies, sampling_period=1e-3, nb_bins=20)
+    assert len(stats["histogram_bin_edges"]) == 21
+    assert stats["histogram_counts"].sum() == 500
+    assert stats["p99"] <= stats["p99_9"] <= stats["max"]
+
+
+def test_lti_to_qp_dict_dimensions():
+    """Test stage dimensions, bounds and fixed initial state of an LTI QP."""
+    A, B = _double_integrator()
+    N, x0 = 4, np.array([1.0, -1.0])
+    qp_dict = lti_to_qp_dict(A, B, np.eye(2), np.eye(1), N, x0=x0, u_max=2.0)
+    assert qp_dict["N"] == N
+    for k in range(N):
+        assert np.shape(qp_dict[f"A_{k}"]) == (2, 2)
+        assert np.shape(qp_dict[f"B_{k}"]) == (2, 1)
+        assert np.shape(qp_dict[f"S_{k}"]) == (1, 2)
+        assert qp_dict[f"ubu_{k}"] == [2.0]
+    # Terminal stage has a state cost only
+    assert np.shape(qp_dict[f"Q_{N}"]) == (2, 2)
+    assert f"B_{N}" not in qp_dict and f"R_{N}" not in qp_dict
+    assert qp_dict["lbx_0"] == qp_dict["ubx_0"] == x0.tolist()
+
+
+def test_simulate_closed_loop_trajectory(tmp_path):
+    """Test the plant follows its dynamics and is stabilized by the MPC."""
+    A, B = _double_integrator()
+    x0 = np.array([1.0, 0.0])
+    qp_data_path = tmp_path / "lti.json"
+    qp_data_path.write_text(json.dumps(lti_to_qp_dict(A, B, np.eye(2), np.eye(1), 20, x0=x0)))
+    qp = AcadosOcpQp.from_json(str(qp_data_path))
+
+    trace = simulate_closed_loop(
+        qp, create_solver_options("PARTIAL_CONDENSING_HPIPM"), A, B, x0, nb_steps=50
+    )
+    x, u = trace["x"], trace["u"]
+    assert x.shape == (51, 2) and u.shape == (50, 1)
+    assert np.array_equal(x[0], x0)
+    assert np.allclose(x[1:], x[:-1] @ A.T + u @ B.T)
+    assert np.all(trace["status"] == 0)
+    assert np.linalg.norm(x[-1]) < 0.1 * np.linalg.norm(x0)
@@ -0,0 +1,56 @@
+"""Tests for cold and warm cache timing."""
+
+import pickle
+
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.cpu_cache import CacheTiming, last_level_cache_size
+from ocp_qp_benchmark.core.results import cache_sensitivity_summary
+
+
+def test_last_level_cache_size():
+    """Test the cache size is positive, with or without sysfs."""
+    assert last_level_cache_size() > 0
+
+
+def test_measure_alternates_cold_and_warm():
+    """Test each cold solve follows a flush and is followed by a warm one."""
+    timing = CacheTiming(nb_solves=3, buffer_size=1 << 16)
+    events = []
+    timing.flush = lambda: events.append("flush")
+
+    def timed_solve():
+        cold = events[-1] == "flush"
+        events.append("solve")
+        return 2.0 if cold else 1.0
+
+    warm, cold = timing.measure(timed_solve)
+    assert (warm, cold) == (1.0, 2.0)
+    assert events == ["flush", "solve", "solve"] * 3
+
+
+def test_buffer_not_pickled():
+    """Test workers allocate their own eviction buffer."""
+    timing = CacheTiming(buffer_size=1 << 16)
+    timing.flush()
+    copy = pickle.loads(pickle.dumps(timing))
+    assert copy._buffer is None
+    assert copy.buffer_size == 1 << 16
+
+
+def test_cache_sensitivity_summary():
+    """Test the ratio is the geometric mean of per-problem ratios."""
+    df = pandas.DataFrame(
+        {
+            "problem": ["p1", "p2", "p1", "p2"],
+            "solver": ["HPIPM", "HPIPM", "DAQP", "DAQP"],
+            "status": [0, 0, 0, 0],
+            "runtime_warm_fair": [1.0, 2.0, 1.0, 1.0],
+            "runtime_cold_fair": [2.0, 8.0, 1.1, 1.1],
+        }
+    )
+    summary = cache_sensitivity_summary(df)
+    assert list(summary.index) == ["HPIPM", "DAQP"]
+    assert summary.loc["HPIPM", "ratio"] == pytest.approx(8**0.5)
+    assert summary.loc["HPIPM", "max_ratio"] == pytest.approx(4.0)
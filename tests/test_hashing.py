@@ -0,0 +1,22 @@
+"""Tests for content hashes used by the result cache."""
+
+from ocp_qp_benchmark.utils.hashing import hash_config, hash_file
+
+
+def test_hash_config_is_canonical():
+    """Test config hash does not depend on key order."""
+    assert hash_config({"iter_max": 500, "tol_stat": 1e-8}) == hash_config(
+        {"tol_stat": 1e-8, "iter_max": 500}
+    )
+    assert hash_config({"iter_max": 500}) != hash_config({"iter_max": 501})
+
+
+def test_hash_file_depends_on_content(tmp_path):
+    """Test file hash changes with content, not with path."""
+    path_a = tmp_path / "a.json"
+    path_b = tmp_path / "b.json"
+    path_a.write_text('{"N": 10}')
+    path_b.write_text('{"N": 10}')
+    assert hash_file(path_a) == hash_file(path_b)
+    path_b.write_text('{"N": 11}')
+    assert hash_file(path_a) != hash_file(path_b)
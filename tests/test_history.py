@@ -0,0 +1,46 @@
+"""Tests for the run history store and change-point detection."""
+
+import numpy as np
+import pandas
+
+from ocp_qp_benchmark.core.history import HistoryStore, detect_change_points
+
+
+def test_detect_step():
+    """Test a step in noisy data is found at the right index."""
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.zeros(10), 0.2 * np.ones(10)])
+    values += 0.01 * rng.standard_normal(20)
+    assert detect_change_points(values) == [10]
+    assert detect_change_points(values[:10]) == []
+
+
+def test_detect_gradual_drift():
+    """Test a slow drift below the noise of single steps is detected."""
+    rng = np.random.default_rng(0)
+    values = np.linspace(0.0, 0.3, 30) + 0.01 * rng.standard_normal(30)
+    assert np.all(np.abs(np.diff(values)) < 0.1)
+    assert len(detect_change_points(values)) > 0
+
+
+def test_history_trend(tmp_path):
+    """Test runs are ingested and summarized per solver and family."""
+    history = HistoryStore(tmp_path / "history.sqlite")
+    for k, runtime in enumerate([1.0] * 4 + [2.0] * 4):
+        df = pandas.DataFrame(
+            {
+                "problem": ["p1", "p2"],
+                "solver": ["HPIPM", "HPIPM"],
+                "runtime_fair": [runtime, runtime],
+                "status": [0, 0],
+            }
+        )
+        history.ingest(df, families={"p1": "random_qp"}, label=f"v{k}", timestamp=k)
+    assert history.solvers() == ["HPIPM"]
+    assert len(history.runs()) == 8
+
+    trend = history.trend("HPIPM", family="random_qp")
+    assert trend["nb_problems"].tolist() == [1] * 8
+    assert trend["change_point"].tolist() == [False] * 4 + [True] + [False] * 3
+    assert trend.loc[4, "label"] == "v4"
+    history.close()
@@ -0,0 +1,28 @@
+"""Tests for isolated worker processes."""
+
+import os
+
+import pytest
+
+from ocp_qp_benchmark.core.builds import acados_build_env, parse_builds
+from ocp_qp_benchmark.core.isolation import IsolatedWorker
+
+
+def test_isolated_worker_environment():
+    """Test calls run in a process with the requested environment."""
+    with IsolatedWorker({"OMP_NUM_THREADS": "3"}, name="test") as worker:
+        assert worker.call(os.getenv, "OMP_NUM_THREADS") == "3"
+        assert worker.call(os.getpid) != os.getpid()
+        with pytest.raises(RuntimeError):
+            worker.call(int, "not a number")
+
+
+def test_parse_builds(tmp_path):
+    """Test parsing of NAME=PATH build lists."""
+    builds = parse_builds(f"GENERIC={tmp_path}, X64_AUTOMATIC=/opt/acados")
+    assert builds == {"GENERIC": str(tmp_path), "X64_AUTOMATIC": "/opt/acados"}
+    env = acados_build_env(builds["GENERIC"])
+    assert env["ACADOS_SOURCE_DIR"] == str(tmp_path)
+    assert env["LD_LIBRARY_PATH"].startswith(os.path.join(str(tmp_path), "lib"))
+    with pytest.raises(ValueError):
+        parse_builds("GENERIC")
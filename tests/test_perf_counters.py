@@ -0,0 +1,48 @@
+"""Tests for hardware performance counters."""
+
+import math
+
+import pytest
+
+from ocp_qp_benchmark.core.perf_counters import (
+    PERF_EVENTS,
+    PerfCounters,
+    derived_metrics,
+)
+
+
+def test_counts_or_nan():
+    """Test counts are returned for all events, with or without PMU access."""
+    counters = PerfCounters()
+    counters.start()
+    sum(range(100_000))
+    counts = counters.stop()
+    counters.close()
+    assert set(counts) == set(PERF_EVENTS)
+    if counters.available:
+        assert counts["perf_instructions"] > 0
+    else:
+        assert all(math.isnan(value) for value in counts.values())
+
+
+def test_unknown_event_is_nan():
+    """Test events the kernel rejects are reported as NaN."""
+    counters = PerfCounters({"perf_unknown": 1 << 40})
+    counters.start()
+    assert math.isnan(counters.stop()["perf_unknown"])
+    assert counters.error is not None
+
+
+def test_derived_metrics():
+    """Test IPC and misses per iteration."""
+    counts = {
+        "perf_cycles": 1000.0,
+        "perf_instructions": 2500.0,
+        "perf_cache_misses": 50.0,
+        "perf_branch_misses": float("nan"),
+    }
+    metrics = derived_metrics(counts, iterations=10)
+    assert metrics["ipc"] == pytest.approx(2.5)
+    assert metrics["cache_misses_per_iter"] == pytest.approx(5.0)
+    assert math.isnan(metrics["branch_misses_per_iter"])
+    assert math.isnan(derived_metrics(counts, iterations=0)["cache_misses_per_iter"])
@@ -0,0 +1,28 @@
+"""Tests for the phase profiler."""
+
+from ocp_qp_benchmark.core.profiler import PhaseProfiler, profile_phase
+
+
+def test_phase_profiler_breakdown():
+    """Test phases from workers are merged and the rest is reported as other."""
+    profiler = PhaseProfiler()
+    with profile_phase(profiler, "results_write"):
+        pass
+    worker = PhaseProfiler()
+    for _ in range(3):
+        with worker.phase("solve"):
+            pass
+    profiler.merge(worker.to_dict())
+    profiler.wall_time = 1.0
+
+    df = profiler.summary().set_index("phase")
+    assert df.loc["solve", "calls"] == 3
+    assert df.loc["results_write", "calls"] == 1
+    assert 0.99 < df.loc["other", "total"] <= 1.0
+    assert abs(df["share"].sum() - 1.0) < 1e-9
+
+
+def test_profile_phase_without_profiler():
+    """Test the no-op context is used without profiler."""
+    with profile_phase(None, "solve"):
+        pass
@@ -0,0 +1,58 @@
+"""Tests for the solver recommender."""
+
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.recommender import (
+    SolverRecommender,
+    cross_validate,
+    meta_features,
+)
+
+
+def make_collection():
+    """Small problems favor DAQP, large ones HPIPM, OSQP fails on large ones."""
+    features = {}
+    rows = []
+    for i in range(20):
+        large = i >= 10
+        name = f"p{i}"
+        features[name] = meta_features(
+            {"N": 10 + i, "nx": [4 + i] * 3, "n_variables": 10 ** (3 if large else 1)}
+        )
+        rows.append((name, "HPIPM", 1.0 if large else 2.0, 0))
+        rows.append((name, "DAQP", 4.0 if large else 1.0, 0))
+        rows.append((name, "OSQP", 0.5, 1 if large else 0))
+    df = pandas.DataFrame(rows, columns=["problem", "solver", "runtime_fair", "status"])
+    return pandas.DataFrame.from_dict(features, orient="index"), df
+
+
+def test_meta_features():
+    """Test per-stage lists are averaged and missing entries are NaN."""
+    features = meta_features({"N": 10, "nx": [2, 4], "has_slacks": True})
+    assert features["nx"] == 3.0
+    assert features["has_slacks"] == 1.0
+    assert pandas.isna(features["kkt_nnz"])
+
+
+def test_recommend_reliable_solver():
+    """Test unreliable solvers are not recommended despite being fast."""
+    features, df = make_collection()
+    recommender = SolverRecommender(k=3).fit(features, df)
+    small = recommender.recommend(features.loc["p2"].to_dict())
+    large = recommender.recommend(features.loc["p15"].to_dict())
+    assert small["solver"] == "OSQP"
+    assert large["solver"] == "HPIPM"
+    # HPIPM has the best runtime over all problems
+    assert recommender.baseline == "HPIPM"
+    assert small["speedup"] == pytest.approx(4.0)
+    assert large["speedup"] == pytest.approx(1.0)
+
+
+def test_cross_validate():
+    """Test cross-validated recommendations are the fastest reliable ones."""
+    features, df = make_collection()
+    scores = cross_validate(features, df, nb_folds=4, k=3)
+    assert scores["nb_problems"] == 20
+    assert scores["failure_rate"] == 0.0
+    assert scores["accuracy"] == pytest.approx(1.0)
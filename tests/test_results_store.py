@@ -0,0 +1,40 @@
+"""Tests for the partitioned results dataset."""
+
+import pandas
+
+from ocp_qp_benchmark.core.results_store import PartitionedResultsStore
+
+
+def _results(problems, solver, runtime):
+    return pandas.DataFrame(
+        {
+            "problem": problems,
+            "solver": solver,
+            "runtime_fair": runtime,
+            "status": 0,
+        }
+    )
+
+
+def test_store_latest_run_wins(tmp_path):
+    """Test a later run replaces results of the same (problem, solver)."""
+    store = PartitionedResultsStore(tmp_path / "results")
+    store.append(_results(["p1", "p2"], "HPIPM", 1.0), run_id="20260101T000000")
+    store.append(_results(["p1"], "HPIPM", 2.0), run_id="20260102T000000")
+    df = store.read().sort_values(by="problem")
+    assert list(df["problem"]) == ["p1", "p2"]
+    assert list(df["runtime_fair"]) == [2.0, 1.0]
+    assert store.list_runs() == ["20260101T000000", "20260102T000000"]
+
+
+def test_store_filters(tmp_path):
+    """Test solver and problem filters and categorical columns."""
+    store = PartitionedResultsStore(tmp_path / "results")
+    store.append(_results(["p1", "p2"], "HPIPM_iter_max=500", 1.0), run_id="r1")
+    store.append(_results(["p1", "p2"], "DAQP", 3.0), run_id="r1")
+    df = store.read(solvers=["DAQP"], problems=["p2"])
+    assert len(df) == 1
+    assert df["solver"].iloc[0] == "DAQP"
+    assert isinstance(df["problem"].dtype, pandas.CategoricalDtype)
+    df = store.read(solvers=["HPIPM_iter_max=500"])
+    assert len(df) == 2
@@ -0,0 +1,47 @@
+"""Tests for the parallel job execution of the runner."""
+
+import os
+
+import pytest
+
+pytest.importorskip("acados_template")
+
+from ocp_qp_benchmark.core.runner import _solve_in_pool  # noqa: E402
+
+
+def _solve(k, behavior):
+    """Job returning its index, raising or killing its worker process."""
+    if behavior == "raise":
+        raise RuntimeError(f"job {k} failed")
+    if behavior == "crash":
+        os._exit(1)
+    return {"status": 0, "job": k}, 0.1
+
+
+def _run(behaviors, nb_workers=2):
+    finished = {}
+    _solve_in_pool(
+        _solve,
+        [(k, behavior) for k, behavior in enumerate(behaviors)],
+        nb_workers,
+        on_dispatch=lambda k: None,
+        on_finish=lambda k, ctx, job_time: finished.__setitem__(k, ctx),
+        print_level=0,
+    )
+    return finished
+
+
+def test_raising_job_is_stored_as_failure():
+    """Test an exception in a worker only fails its own job."""
+    finished = _run(["ok", "raise", "ok", "ok"])
+    assert sorted(finished) == [0, 1, 2, 3]
+    assert finished[1]["status"] == -1
+    assert [finished[k]["job"] for k in (0, 2, 3)] == [0, 2, 3]
+
+
+def test_crashing_job_does_not_abort_the_run():
+    """Test a dying worker fails its job and the other jobs are solved."""
+    finished = _run(["ok", "ok", "crash", "ok", "ok", "ok"])
+    assert sorted(finished) == list(range(6))
+    assert finished[2]["status"] == -1
+    assert all(finished[k]["status"] == 0 for k in (0, 1, 3, 4, 5))
@@ -0,0 +1,33 @@
+"""Tests for adaptive sampling of solve times."""
+
+import numpy as np
+
+from ocp_qp_benchmark.core.sampling import (
+    SamplingOptions,
+    inlier_mask,
+    relative_ci_width,
+    sample_adaptively,
+)
+
+
+def test_inlier_mask_discards_slow_outliers():
+    """Test preemption-like slow samples are discarded, fast ones kept."""
+    samples = np.array([1.0, 1.01, 0.99, 1.02, 0.98, 5.0, 0.9])
+    mask = inlier_mask(samples)
+    assert not mask[5]
+    assert mask[6]
+
+
+def test_sampling_stops_at_target_precision():
+    """Test sampling stops once the confidence interval is narrow enough."""
+    rng = np.random.default_rng(0)
+
+    def measure():
+        return (1e-3 * (1 + 0.01 * rng.standard_normal()), 0.0)
+
+    options = SamplingOptions(target_rel_ci=0.01, time_budget=10.0, max_samples=10_000)
+    samples, mask, rel_ci = sample_adaptively(measure, options)
+    assert rel_ci <= 0.01
+    assert options.min_samples <= len(samples) < options.max_samples
+    assert samples.shape[1] == 2
+    assert np.isnan(relative_ci_width(samples[:1, 0]))
@@ -0,0 +1,66 @@
+"""Tests for cost-aware job scheduling."""
+
+import numpy as np
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.scheduler import (
+    longest_first,
+    predict_job_costs,
+    prediction_unit,
+    problem_size,
+    simulate_makespan,
+)
+
+
+def test_longest_first_reduces_makespan():
+    """Test LPT order avoids a long job scheduled last."""
+    costs = np.array([1.0, 1.0, 1.0, 1.0, 4.0])
+    assert simulate_makespan(costs, 2) == 6.0
+    assert simulate_makespan(costs[longest_first(costs)], 2) == 4.0
+
+
+def test_problem_size_prefers_kkt_nnz():
+    """Test problem size falls back from KKT nonzeros to horizon length."""
+    assert problem_size({"kkt_nnz": 500, "N": 20}) == 500
+    assert problem_size({"N": 20}) == 20
+    assert problem_size({}) == 1.0
+
+
+def test_predict_job_costs_from_history():
+    """Test known jobs use history and unknown ones a fitted power law."""
+    history = pandas.DataFrame(
+        {
+            "problem": ["p1", "p2"],
+            "solver": ["S", "S"],
+            "runtime_external": [1e-3, 4e-3],
+            "status": [0, 0],
+        }
+    )
+    jobs = [("p1", "S", 10.0), ("p2", "S", 20.0), ("p3", "S", 40.0)]
+    costs = predict_job_costs(jobs, history)
+    assert costs[0] == pytest.approx(1e-3)
+    assert costs[1] == pytest.approx(4e-3)
+    assert costs[2] == pytest.approx(16e-3)
+
+
+def test_predict_job_costs_without_history():
+    """Test problem size is used without history."""
+    jobs = [("p1", "S", 10.0), ("p2", "S", 20.0)]
+    assert list(predict_job_costs(jobs, None)) == [10.0, 20.0]
+
+
+def test_prediction_unit():
+    """Test costs are in seconds only with history of the jobs' problems."""
+    jobs = [("p1", "S", 10.0)]
+    history = pandas.DataFrame(
+        {
+            "problem": ["p2"],
+            "solver": ["S"],
+            "runtime_external": [1e-3],
+            "status": [0],
+        }
+    )
+    assert prediction_unit(jobs, None) == "relative"
+    assert prediction_unit(jobs, history) == "relative"
+    assert prediction_unit([("p2", "S", 10.0)], history) == "s"
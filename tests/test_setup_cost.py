@@ -0,0 +1,29 @@
+"""Tests for one-time vs per-solve cost analysis."""
+
+import numpy as np
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.results import break_even_solves, setup_cost_summary
+
+
+def test_break_even_solves():
+    """Test a solver with expensive setup and cheap solves catches up."""
+    df = pandas.DataFrame(
+        {
+            "problem": ["p1", "p1"],
+            "solver": ["SLOW_SETUP", "FAST_SETUP"],
+            "status": [0, 0],
+            "runtime_external": [1e-4, 1e-3],
+            "runtime_setup": [1e-1, 1e-2],
+            "runtime_first_solve": [1e-4, 1e-3],
+            "runtime_teardown": [0.0, np.nan],
+        }
+    )
+    summary = setup_cost_summary(df)
+    assert summary.loc["SLOW_SETUP", "one_time_cost"] == pytest.approx(1e-1)
+    assert summary.loc["FAST_SETUP", "per_solve_cost"] == pytest.approx(1e-3)
+
+    break_even = break_even_solves(summary)
+    assert break_even.loc["SLOW_SETUP", "FAST_SETUP"] == pytest.approx(100.0)
+    assert np.isnan(break_even.loc["FAST_SETUP", "SLOW_SETUP"])
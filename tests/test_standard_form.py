@@ -0,0 +1,54 @@
+"""Tests for the sparse standard form conversion."""
+
+import numpy as np
+
+from ocp_qp_benchmark.dataset.converters import lti_to_qp_dict
+from ocp_qp_benchmark.dataset.standard_form import qp_dict_to_standard_form
+
+
+def _lti_qp_dict(N=5, nx=3, nu=2):
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((nx, nx))
+    B = rng.standard_normal((nx, nu))
+    return lti_to_qp_dict(A, B, np.eye(nx), np.eye(nu), N, x0=np.ones(nx), u_max=1.0)
+
+
+def test_standard_form_dimensions():
+    """Test variables, dynamics and bound rows of an LTI problem."""
+    N, nx, nu = 5, 3, 2
+    qp = qp_dict_to_standard_form(_lti_qp_dict(N, nx, nu))
+    assert qp.n == (N + 1) * nx + N * nu
+    assert qp.n_eq == N * nx
+    # input bounds on all stages, initial state bounds on stage 0
+    assert qp.m == N * nx + N * nu + nx
+    assert qp.P.shape == (qp.n, qp.n)
+    assert (abs(qp.P - qp.P.T) > 0).nnz == 0
+
+
+def test_standard_form_dynamics_feasible():
+    """Test a simulated trajectory satisfies the equality constraints."""
+    N, nx, nu = 4, 3, 2
+    qp_dict = _lti_qp_dict(N, nx, nu)
+    qp = qp_dict_to_standard_form(qp_dict)
+    A, B = np.array(qp_dict["A_0"]), np.array(qp_dict["B_0"])
+    x = np.ones(nx)
+    z = []
+    for _ in range(N):
+        u = np.full(nu, 0.5)
+        z += [x, u]
+        x = A @ x + B @ u
+    z.append(x)
+    z = np.concatenate(z)
+    residual = qp.A[: qp.n_eq] @ z - qp.u[: qp.n_eq]
+    assert np.allclose(residual, 0.0)
+
+
+def test_standard_form_trajectories():
+    """Test z is split into the states and controls of each stage."""
+    N, nx, nu = 3, 2, 1
+    qp = qp_dict_to_standard_form(_lti_qp_dict(N, nx, nu))
+    x_traj, u_traj = qp.trajectories(np.arange(qp.n, dtype=float))
+    assert [len(x) for x in x_traj] == [nx] * (N + 1)
+    assert [len(u) for u in u_traj] == [nu] * N + [0]
+    assert np.array_equal(x_traj[1], [3.0, 4.0])
+    assert np.array_equal(u_traj[1], [5.0])
@@ -0,0 +1,24 @@
+"""Tests for structural statistics in problem meta data."""
+
+import numpy as np
+
+from ocp_qp_benchmark.dataset.converters import lti_to_qp_dict
+from ocp_qp_benchmark.dataset.statistics import compute_structural_statistics
+
+
+def test_structural_statistics_lti():
+    """Test dimensions and sizes of an LTI problem."""
+    N, nx, nu = 6, 4, 2
+    qp_dict = lti_to_qp_dict(
+        np.eye(nx), np.ones((nx, nu)), np.eye(nx), 2 * np.eye(nu), N, u_max=1.0
+    )
+    stats = compute_structural_statistics(qp_dict)
+    assert stats["nx"] == [nx] * (N + 1)
+    assert stats["nu"] == [nu] * N + [0]
+    assert stats["nbu"] == [nu] * N + [0]
+    assert stats["nbx"] == [nx] + [0] * N
+    assert stats["n_variables"] == (N + 1) * nx + N * nu
+    assert stats["n_equalities"] == N * nx
+    assert stats["n_inequalities"] == N * nu + nx
+    assert stats["hessian_diag_ratio"] == 2.0
+    assert stats["hessian_gershgorin_min"] == 1.0
@@ -0,0 +1,66 @@
+"""Tests for representative subset selection."""
+
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.subset import (
+    ranking_agreement,
+    select_representative,
+    split_latest_run,
+)
+
+
+def make_problems():
+    """Two families of problems of increasing size."""
+    return pandas.DataFrame(
+        {
+            "problem": [f"a{i}" for i in range(6)] + [f"b{i}" for i in range(4)],
+            "family": ["a"] * 6 + ["b"] * 4,
+            "size": list(range(6)) + list(range(4)),
+        }
+    )
+
+
+def test_stratified_selection():
+    """Test every family is covered, spanning its sizes."""
+    selected = select_representative(make_problems(), k=4)
+    assert len(selected) == 4
+    assert {"a0", "a5", "b0", "b3"} == set(selected)
+
+
+def test_selection_reproduces_ranking():
+    """Test history-based selection avoids problems with inverted rankings."""
+    problems = make_problems()
+    rows = []
+    for problem in problems["problem"]:
+        # HPIPM is faster except on a few outliers
+        inverted = problem in ("a0", "a5", "b0", "b3")
+        rows.append((problem, "HPIPM", 2.0 if inverted else 1.0))
+        rows.append((problem, "OSQP", 1.0 if inverted else 3.0))
+        rows.append((problem, "DAQP", 4.0 if inverted else 2.0))
+    history = pandas.DataFrame(rows, columns=["problem", "solver", "runtime_fair"])
+    history["status"] = 0
+
+    selected = select_representative(problems, k=4, history=history)
+    assert len(selected) == 4
+    agreement = ranking_agreement(history, selected)
+    assert agreement["kendall_tau"] == pytest.approx(1.0)
+    assert agreement["same_best"]
+
+
+def test_split_latest_run():
+    """Test earlier runs keep their latest result per problem and solver."""
+    df = pandas.DataFrame(
+        {
+            "problem": ["a0", "a0", "a1", "a0", "a1"],
+            "solver": ["HPIPM"] * 5,
+            "run": ["r1", "r2", "r1", "r3", "r3"],
+            "runtime_fair": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    earlier, latest = split_latest_run(df)
+    assert sorted(earlier["runtime_fair"]) == [2.0, 3.0]
+    assert list(latest["runtime_fair"]) == [4.0, 5.0]
+    earlier, latest = split_latest_run(df.drop(columns="run"))
+    assert len(earlier) == 5
+    assert latest is None
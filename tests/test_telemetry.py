@@ -0,0 +1,45 @@
+"""Tests for live run telemetry."""
+
+import json
+import urllib.request
+
+import pytest
+
+from ocp_qp_benchmark.core.telemetry import RunTelemetry
+
+
+def _ctx(status=0, runtime=1e-3):
+    return {"status": status, "iterations": 5, "runtime_external": runtime}
+
+
+def test_telemetry_status_and_eta(tmp_path):
+    """Test counts, running jobs and a size-weighted ETA."""
+    telemetry = RunTelemetry(tmp_path / "telemetry.jsonl")
+    telemetry.start([("p1", "A", 1.0), ("p2", "A", 3.0), ("p3", "B", 2.0)], nb_workers=2)
+    for k in range(3):
+        telemetry.job_dispatched(k)
+    telemetry.job_finished(0, _ctx(status=2), job_time=0.1)
+
+    status = telemetry.status()
+    assert status["jobs_done"] == 1
+    assert status["failures"] == 1
+    assert [job["problem"] for job in status["running"]] == ["p2", "p3"]
+    assert status["solvers"]["A"]["median_runtime"] == pytest.approx(1e-3)
+    # Remaining work is 3 + 2 units at 0.1s per unit, 5 times the work done
+    assert status["eta"] == pytest.approx(5 * status["elapsed"], rel=0.1)
+
+    telemetry.close()
+    events = [json.loads(line) for line in open(tmp_path / "telemetry.jsonl")]
+    assert [event["event"] for event in events] == ["start", "job", "end"]
+
+
+def test_telemetry_status_endpoint():
+    """Test the status is served as JSON."""
+    telemetry = RunTelemetry(port=0)
+    telemetry.start([("p1", "A", 1.0)])
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{telemetry.port}/") as response:
+            status = json.loads(response.read())
+    finally:
+        telemetry.close()
+    assert status["jobs_total"] == 1
@@ -0,0 +1,32 @@
+"""Tests for thread-count scaling analysis."""
+
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.threads import thread_env, thread_scaling_summary
+
+
+def test_thread_env():
+    """Test all threading variables are limited."""
+    env = thread_env(4)
+    assert env["OMP_NUM_THREADS"] == "4"
+    assert env["OPENBLAS_NUM_THREADS"] == "4"
+
+
+def test_thread_scaling_summary():
+    """Test speedup and efficiency relative to the smallest thread count."""
+    df = pandas.DataFrame(
+        {
+            "problem": ["p1", "p1", "p2", "p2", "p3", "p3"],
+            "solver": ["HPIPM@threads=1", "HPIPM@threads=2"] * 3,
+            "threads": [1, 2] * 3,
+            "runtime_external": [2.0, 1.0, 4.0, 2.0, 1.0, 1.0],
+            "status": [0, 0, 0, 0, 0, 2],
+        }
+    )
+    summary = thread_scaling_summary(df).set_index("threads")
+    # p3 is not solved with 2 threads and is excluded
+    assert summary.loc[2, "nb_problems"] == 2
+    assert summary.loc[2, "speedup"] == pytest.approx(2.0)
+    assert summary.loc[2, "efficiency"] == pytest.approx(1.0)
+    assert summary.loc[1, "solver"] == "HPIPM"
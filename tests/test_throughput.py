@@ -0,0 +1,87 @@
+"""Tests for the concurrent throughput benchmark."""
+
+import numpy as np
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core import throughput
+from ocp_qp_benchmark.core.throughput import (
+    add_scaling,
+    default_worker_counts,
+    measure_throughput,
+    summarize_workers,
+)
+
+
+def _stub_worker(worker_index, qp_data_paths, opts, duration, barrier, result_queue):
+    """Worker solving 10 problems of 10 ms each, slower with its index."""
+    barrier.wait()
+    result_queue.put(
+        {
+            "worker": worker_index,
+            "latencies": np.full(10, 0.01),
+            "elapsed": 0.1 * (worker_index + 1),
+            "nb_failed": worker_index,
+        }
+    )
+
+
+def _crashing_worker(worker_index, qp_data_paths, opts, duration, barrier, result_queue):
+    """Worker 1 dies before the barrier without sending a record."""
+    if worker_index == 1:
+        raise RuntimeError("solver crashed")
+    _stub_worker(worker_index, qp_data_paths, opts, duration, barrier, result_queue)
+
+
+@pytest.mark.parametrize(
+    "nb_cores, expected", [(1, [1]), (6, [1, 2, 4, 6]), (8, [1, 2, 4, 8])]
+)
+def test_default_worker_counts(monkeypatch, nb_cores, expected):
+    """Test powers of two up to the number of cores."""
+    monkeypatch.setattr(throughput.os, "cpu_count", lambda: nb_cores)
+    assert default_worker_counts() == expected
+
+
+def test_measure_and_summarize_workers():
+    """Test solves/sec are summed over workers and latencies pooled."""
+    worker_results = measure_throughput(
+        [], None, nb_workers=2, backend="thread", worker=_stub_worker
+    )
+    assert [r["worker"] for r in worker_results] == [0, 1]
+    summary = summarize_workers(worker_results)
+    assert summary["solves"] == 20
+    assert summary["solves_per_sec"] == pytest.approx(100.0 + 50.0)
+    assert summary["worker_solves_per_sec_min"] == pytest.approx(50.0)
+    assert summary["latency_median"] == pytest.approx(0.01)
+    assert summary["nb_failed"] == 1
+
+
+def test_add_scaling():
+    """Test speedup and efficiency are relative to one worker per solver."""
+    df = pandas.DataFrame(
+        {
+            "solver": ["HPIPM", "HPIPM", "DAQP", "DAQP"],
+            "workers": [1, 4, 1, 4],
+            "solves_per_sec": [100.0, 300.0, 50.0, 200.0],
+        }
+    )
+    df = add_scaling(df).set_index(["solver", "workers"])
+    assert df.loc[("HPIPM", 4), "speedup"] == pytest.approx(3.0)
+    assert df.loc[("HPIPM", 4), "efficiency"] == pytest.approx(0.75)
+    assert df.loc[("DAQP", 4), "efficiency"] == pytest.approx(1.0)
+
+
+def test_dead_worker_raises():
+    """Test a worker dying before the barrier does not block the others."""
+    with pytest.raises(RuntimeError, match="worker 1"):
+        measure_throughput(
+            [], None, nb_workers=3, backend="thread", timeout=0.1, worker=_crashing_worker
+        )
+
+
+def test_setup_failure_raises(tmp_path):
+    """Test a worker failing to create its solvers reports the error."""
+    with pytest.raises(RuntimeError, match="worker 0"):
+        measure_throughput(
+            [str(tmp_path / "missing.json")], None, nb_workers=2, backend="thread"
+        )
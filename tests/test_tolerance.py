@@ -0,0 +1,88 @@
+"""Tests for solution accuracy and tolerance sweeps."""
+
+import json
+
+import numpy as np
+import pandas
+import pytest
+
+from ocp_qp_benchmark.core.accuracy import load_reference_solution, solution_error
+from ocp_qp_benchmark.core.tolerance import (
+    fastest_at_accuracy,
+    tolerance_options,
+    tolerance_sweep_summary,
+)
+
+
+def test_solution_error(tmp_path):
+    """Test the error is relative to the reference and NaN without one."""
+    qp_data_path = tmp_path / "qp_1.json"
+    reference = {"x_traj": [[1.0, -4.0], [0.0, 2.0]], "u_traj": [[0.5], []]}
+    (tmp_path / "qp_1_ref_sol.json").write_text(json.dumps(reference))
+    reference = load_reference_solution(str(qp_data_path))
+
+    x_traj = [np.array([1.0, -4.0]), np.array([0.0, 2.2])]
+    u_traj = [np.array([0.5]), np.zeros(0)]
+    assert solution_error(x_traj, u_traj, reference) == pytest.approx(0.05)
+    assert np.isnan(solution_error(x_traj, u_traj[:1], reference))
+    assert load_reference_solution(str(tmp_path / "qp_2.json")) is None
+    assert np.isnan(solution_error(x_traj, u_traj, None))
+
+
+def test_tolerance_options():
+    """Test all tolerances of a solver are set, unknown solvers raise."""
+    assert tolerance_options("EXTERNAL_OSQP", 1e-6) == {"eps_abs": 1e-6, "eps_rel": 1e-6}
+    with pytest.raises(ValueError):
+        tolerance_options("EXTERNAL_QPOASES", 1e-6)
+
+
+def make_sweep():
+    """HPIPM is accurate, OSQP fast but inaccurate and failing when tight."""
+    rungs = {
+        # solver ID: (solver, tolerance, runtime, error, status)
+        "HPIPM_1e-2": ("HPIPM", 1e-2, 2.0, 1e-3, 0),
+        "HPIPM_1e-6": ("HPIPM", 1e-6, 3.0, 1e-7, 0),
+        "HPIPM_1e-8": ("HPIPM", 1e-8, 3.0, 1e-7, 0),
+        "OSQP_1e-2": ("OSQP", 1e-2, 1.0, 1e-2, 0),
+        "OSQP_1e-6": ("OSQP", 1e-6, 4.0, 1e-5, 0),
+        "OSQP_1e-8": ("OSQP", 1e-8, 8.0, 1e-6, 2),
+    }
+    ladder = pandas.DataFrame(
+        [(solver_id, rung[0], rung[1]) for solver_id, rung in rungs.items()],
+        columns=["solver_id", "solver", "tolerance"],
+    )
+    df = pandas.DataFrame(
+        [
+            (f"p{i}", solver_id, rung[2], rung[3], rung[4])
+            for solver_id, rung in rungs.items()
+            for i in range(3)
+        ],
+        columns=["problem", "solver", "runtime_fair", "solution_error", "status"],
+    )
+    return df, ladder
+
+
+def test_tolerance_sweep_summary():
+    """Test accuracy quantiles, failures and the Pareto frontier."""
+    summary = tolerance_sweep_summary(*make_sweep()).set_index("solver_id")
+    assert summary.loc["HPIPM_1e-6", "error"] == pytest.approx(1e-7)
+    assert summary.loc["OSQP_1e-8", "error"] == np.inf
+    assert summary.loc["OSQP_1e-8", "success_rate"] == 0.0
+    # Same accuracy at the same runtime as 1e-6 is dominated
+    assert list(summary.index[summary["pareto"]]) == [
+        "HPIPM_1e-2",
+        "HPIPM_1e-6",
+        "OSQP_1e-2",
+        "OSQP_1e-6",
+    ]
+
+
+def test_fastest_at_accuracy():
+    """Test the fastest solver reaching each target is reported."""
+    summary = tolerance_sweep_summary(*make_sweep())
+    fastest = fastest_at_accuracy(summary, [1e-2, 1e-4, 1e-6, 1e-8])
+    assert list(fastest["fastest"]) == ["OSQP", "HPIPM", "HPIPM", None]
+    assert list(fastest["resolved"]) == [True, True, True, False]
+    assert fastest.loc[1e-2, "tolerance"] == 1e-2
+    assert fastest.loc[1e-4, "OSQP"] == pytest.approx(4.0, rel=1e-4)
+    assert np.isnan(fastest.loc[1e-6, "OSQP"])
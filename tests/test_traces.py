@@ -0,0 +1,53 @@
+"""Tests for the convergence trace sidecar file."""
+
+import numpy as np
+import pytest
+
+from ocp_qp_benchmark.core.traces import TraceStore, trace_path_for_results
+
+
+def test_trace_store_roundtrip(tmp_path):
+    """Test ragged traces are restored per job after writing."""
+    path = trace_path_for_results(tmp_path / "results.csv")
+    assert path.name == "results_traces.npz"
+
+    store = TraceStore(path)
+    store.add("p1", "HPIPM", np.ones((3, 4)), runtime=1e-3)
+    store.add("p1", "DAQP", np.zeros((7, 4)), runtime=2e-3)
+    store.add("p2", "HPIPM", np.full((1, 4), 0.5), runtime=3e-3)
+    store.write()
+
+    loaded = TraceStore(path)
+    assert len(loaded) == 3
+    assert loaded.get("p1", "DAQP").shape == (7, 4)
+    assert np.all(loaded.get("p2", "HPIPM") == 0.5)
+    assert loaded.get_runtime("p1", "HPIPM") == 1e-3
+    assert loaded.solvers("p1") == ["DAQP", "HPIPM"]
+    assert loaded.get("p3", "HPIPM") is None
+
+
+class _FakeQpSolver:
+    """Solver returning statistics in the acados layout, fields by iterations."""
+
+    def __init__(self, statistics):
+        self.statistics = statistics
+
+    def get_stats(self, field):
+        return self.statistics
+
+
+def test_convergence_trace_from_acados_statistics():
+    """Test residuals are read from the rows of the acados statistics."""
+    pytest.importorskip("acados_template")
+    from ocp_qp_benchmark.core.runner import get_convergence_trace
+
+    nb_iterations = 3
+    residuals = np.arange(4 * nb_iterations, dtype=float).reshape(4, nb_iterations)
+    # iteration index, 4 residuals and further HPIPM fields
+    statistics = np.vstack(
+        [np.arange(nb_iterations), residuals, np.full((2, nb_iterations), -1.0)]
+    )
+    trace = get_convergence_trace(_FakeQpSolver(statistics))
+    assert trace.shape == (nb_iterations, 4)
+    assert np.array_equal(trace, residuals.T)
+    assert get_convergence_trace(_FakeQpSolver(statistics[:3])) is None
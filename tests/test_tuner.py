@@ -0,0 +1,53 @@
+"""Tests for solver-option tuning helpers."""
+
+import pytest
+
+from ocp_qp_benchmark.core import tuner
+from ocp_qp_benchmark.core.tuner import (
+    expand_search_space,
+    shifted_geometric_mean,
+    successive_halving,
+)
+
+
+def test_expand_search_space():
+    """Test all combinations are generated."""
+    configs = expand_search_space(
+        {"cond_N": [2, 5, 10], "hpipm_mode": ["SPEED", "ROBUST"]}
+    )
+    assert len(configs) == 6
+    assert {"cond_N": 5, "hpipm_mode": "ROBUST"} in configs
+
+
+def test_shifted_geometric_mean():
+    """Test shifted geometric mean of equal values is that value."""
+    assert shifted_geometric_mean([1e-3, 1e-3, 1e-3]) == pytest.approx(1e-3)
+    assert shifted_geometric_mean([1e-4, 1e-2]) < 0.5 * (1e-4 + 1e-2)
+
+
+def test_failing_default_penalized_like_candidates(monkeypatch):
+    """Test a failure of the default is penalized by the observed runtimes."""
+    runtimes = {1000: 1e-4, 500: 2e-4, 200: 3e-4}
+
+    def fake_solve_problem(qp, opts, print_level=0):
+        # The default configuration (iter_max 1000) fails on problem p0
+        if qp == "p0" and opts.iter_max == 1000:
+            return {"status": 2, "runtime_fair": 5e-5}
+        return {"status": 0, "runtime_fair": runtimes[opts.iter_max]}
+
+    monkeypatch.setattr(tuner, "solve_problem", fake_solve_problem)
+    monkeypatch.setattr(tuner._Evaluator, "_get_qp", lambda self, path: path)
+    result = successive_halving(
+        "PARTIAL_CONDENSING_HPIPM",
+        [{"iter_max": 500}, {"iter_max": 200}],
+        ["p0", "p1", "p2", "p3"],
+        min_problems=4,
+        seed=0,
+        print_level=0,
+    )
+    assert result["best_config"] == {"iter_max": 500}
+    # Failure counts as 10 times the slowest successful solve on p0
+    assert result["baseline_score"] == pytest.approx(
+        shifted_geometric_mean([3e-3, 1e-4, 1e-4, 1e-4])
+    )
+    assert result["speedup"] == pytest.approx(result["baseline_score"] / 2e-4)